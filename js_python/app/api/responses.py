@@ -0,0 +1,47 @@
+"""JSON responses rendered by pydantic-core in one pass.
+
+For a handler's return value FastAPI validates it against ``response_model``,
+dumps the validated models back to Python primitives and encodes those with
+``json.dumps``. With a few thousand ORM rows that double conversion dominates
+the request. Handlers of large lists return a ``ModelResponse`` instead: it
+validates the ORM objects through a cached ``TypeAdapter`` of the schema and
+writes the JSON bytes with ``dump_json``. The route's ``response_model`` still
+documents the schema.
+"""
+
+from functools import lru_cache
+from typing import Any, Mapping, Optional
+
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def type_adapter(schema: Any) -> TypeAdapter:
+    """One adapter per response schema; building its core schema is the expensive part."""
+    return TypeAdapter(schema)
+
+
+def render_json(schema: Any, content: Any) -> bytes:
+    """Validate ``content`` (ORM objects or dicts) against ``schema`` and encode it as JSON."""
+    adapter = type_adapter(schema)
+    return adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+
+
+class ModelResponse(Response):
+    """``application/json`` response whose body is ``content`` rendered through ``schema``."""
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: Any,
+        schema: Any,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+    ):
+        self.schema = schema
+        super().__init__(content, status_code=status_code, headers=headers)
+
+    def render(self, content: Any) -> bytes:
+        return render_json(self.schema, content)
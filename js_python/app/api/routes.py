@@ -1,20 +1,47 @@
 """API routes for the DSBP backend."""
 
+import json
 import re
-from collections import defaultdict
 from datetime import date, datetime, timedelta
-from typing import Dict, Iterable, List, Optional, Set
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple, Union
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import FileResponse
-from sqlalchemy import func, or_
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, contains_eager, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 import app.models as models
 import app.schemas as schemas
-from app.core.config import FRONTEND_PUBLIC_DIR
-from app.core.database import get_db
-from app.services import auth
+from app.api.responses import ModelResponse
+from app.core.compression import negotiated_file_response
+from app.core.config import (
+    DEFAULT_PAGE_SIZE,
+    FRONTEND_PUBLIC_DIR,
+    MAX_PAGE_SIZE,
+    NOTIFICATION_STREAM_KEEPALIVE_SECONDS,
+    PROJECT_TRANSFER_CHUNK_SIZE,
+)
+from app.core.database import SessionLocal, get_async_db, get_db
+from app.services import activity_history, auth, comment_threads, dependency_graph, project_transfer, versions
+from app.services import search as full_text_search
+from app.services import status_counts as task_status_counts
+from app.services.dependency_map import dependency_map_cache, task_summary
+from app.services.notifications import notify_mentions
+from app.services.project_access import access_scopes, project_access_cache
+from app.services.pagination import (
+    at_or_before_cursor,
+    decode_offset_cursor,
+    decode_position_cursor,
+    encode_offset_cursor,
+    encode_position_cursor,
+    paginate,
+    paginate_async,
+)
+from app.services.realtime import notification_hub
 
 router = APIRouter()
 
@@ -30,15 +57,16 @@ def parse_mentions(content: str, db: Session) -> List[models.User]:
     return db.query(models.User).filter(models.User.username.in_(usernames)).all()
 
 
-def user_can_access_project(project: models.Project, user: models.User) -> bool:
+def accessible_project_ids(
+    db: Session, user: models.User, access_versions: Optional[Tuple[int, int]] = None
+) -> FrozenSet[int]:
+    """Ids of all projects accessible to a user, from ``project_access_cache``."""
+    return project_access_cache.visible_project_ids(db, user.id, access_versions)
+
+
+def user_can_access_project(db: Session, project_id: int, user: models.User) -> bool:
     """Return True if the provided user may view the given project."""
-    if project.owner_id == user.id:
-        return True
-    if project.visibility == "all":
-        return True
-    if project.visibility == "selected":
-        return any(shared_user.id == user.id for shared_user in project.shared_users)
-    return False
+    return project_id in accessible_project_ids(db, user)
 
 
 def ensure_project_access(project_id: int, db: Session, user: models.User) -> models.Project:
@@ -46,18 +74,14 @@ def ensure_project_access(project_id: int, db: Session, user: models.User) -> mo
     project = db.query(models.Project).filter(models.Project.id == project_id).first()
     if not project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
-    if not user_can_access_project(project, user):
+    if not user_can_access_project(db, project.id, user):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed to access this project")
     return project
 
 
-def accessible_projects_filter(user: models.User):
-    """SQLAlchemy filter expression for all projects accessible to a user."""
-    return or_(
-        models.Project.owner_id == user.id,
-        models.Project.visibility == "all",
-        models.Project.shared_users.any(models.User.id == user.id),
-    )
+async def ensure_project_access_async(project_id: int, db: AsyncSession, user: models.User) -> models.Project:
+    """``ensure_project_access`` for handlers running on the asyncio session."""
+    return await db.run_sync(lambda session: ensure_project_access(project_id, session, user))
 
 
 def ensure_task_access(task_id: int, db: Session, user: models.User) -> models.Task:
@@ -65,7 +89,7 @@ def ensure_task_access(task_id: int, db: Session, user: models.User) -> models.T
     task = db.query(models.Task).filter(models.Task.id == task_id).first()
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
-    if not user_can_access_project(task.project, user):
+    if not user_can_access_project(db, task.project_id, user):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed to access this task")
     return task
 
@@ -123,19 +147,73 @@ def log_task_activity(
     db.add(activity)
 
 
+# --- Conditional requests -----------------------------------------------------
+
+# Read endpoints derive an ETag from the scope versions their response is built
+# from (see ``app.services.versions``) and answer a matching ``If-None-Match``
+# with 304 before running their main query.
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's ``If-None-Match`` header already names ``etag``."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def validator_headers(etag: str) -> Dict[str, str]:
+    """Headers that let the client cache a response but revalidate it on every use."""
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """Return a 304 if the client already holds ``etag``, else attach it to ``response``."""
+    headers = validator_headers(etag)
+    if _etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+def scope_versions(db: Session, *scopes: str) -> List[int]:
+    """Current versions of ``scopes``, in the order given."""
+    current = versions.current(db, scopes)
+    return [current[scope] for scope in scopes]
+
+
+async def scope_versions_async(db: AsyncSession, *scopes: str) -> List[int]:
+    """``scope_versions`` for handlers running on the asyncio session."""
+    return await db.run_sync(lambda session: scope_versions(session, *scopes))
+
+
+def accessible_project_versions(
+    db: Session, user: models.User, scope: Callable[[int], str] = versions.project_scope
+) -> Dict[int, int]:
+    """Version of a per-project scope (``project:<id>`` by default) for every project the user can access."""
+    scopes = {project_id: scope(project_id) for project_id in accessible_project_ids(db, user)}
+    current = versions.current(db, scopes.values())
+    return {project_id: current[project_scope] for project_id, project_scope in scopes.items()}
+
+
 # --- Authentication endpoints -------------------------------------------------
 
-@router.post("/auth/register", response_model=schemas.UserOut, status_code=status.HTTP_201_CREATED)
-def register(user_in: schemas.UserCreate, db: Session = Depends(get_db)):
-    """Create a new user after confirming username and email uniqueness."""
-    if db.query(models.User).filter(models.User.username == user_in.username).first():
+def _get_user_by_username(db: Session, username: str) -> Optional[models.User]:
+    return db.query(models.User).filter(models.User.username == username).first()
+
+
+def _ensure_registration_available(db: Session, user_in: schemas.UserCreate) -> None:
+    if _get_user_by_username(db, user_in.username):
         raise HTTPException(status_code=400, detail="Username already registered")
     if db.query(models.User).filter(models.User.email == user_in.email).first():
         raise HTTPException(status_code=400, detail="Email already registered")
+
+
+def _save_new_user(db: Session, user_in: schemas.UserCreate, hashed_password: str) -> models.User:
     user = models.User(
         username=user_in.username,
         email=user_in.email,
-        hashed_password=auth.get_password_hash(user_in.password),
+        hashed_password=hashed_password,
     )
     db.add(user)
     db.commit()
@@ -143,67 +221,114 @@ def register(user_in: schemas.UserCreate, db: Session = Depends(get_db)):
     return user
 
 
+# Hashing runs on the dedicated password pool, so these handlers are async and
+# push only their short database work onto the shared threadpool.
+
+@router.post("/auth/register", response_model=schemas.UserOut, status_code=status.HTTP_201_CREATED)
+async def register(
+    user_in: schemas.UserCreate,
+    db: Session = Depends(get_db),
+    password_hash_pool: auth.PasswordHashPool = Depends(auth.get_password_hash_pool),
+):
+    """Create a new user after confirming username and email uniqueness."""
+    await run_in_threadpool(_ensure_registration_available, db, user_in)
+    hashed_password = await password_hash_pool.hash(user_in.password)
+    return await run_in_threadpool(_save_new_user, db, user_in, hashed_password)
+
+
 @router.post("/auth/login", response_model=schemas.Token)
-def login(credentials: schemas.UserLogin, db: Session = Depends(get_db)):
+async def login(
+    credentials: schemas.UserLogin,
+    db: Session = Depends(get_db),
+    password_hash_pool: auth.PasswordHashPool = Depends(auth.get_password_hash_pool),
+):
     """Authenticate a user and return a freshly minted access token."""
-    user = db.query(models.User).filter(models.User.username == credentials.username).first()
-    if not user or not auth.verify_password(credentials.password, user.hashed_password):
+    user = await run_in_threadpool(_get_user_by_username, db, credentials.username)
+    if not user or not await password_hash_pool.verify(credentials.password, user.hashed_password):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
     access_token = auth.create_access_token(data={"sub": user.username}, expires_delta=timedelta(minutes=auth.ACCESS_TOKEN_EXPIRE_MINUTES))
+    if auth.password_needs_rehash(user.hashed_password):
+        user.hashed_password = await password_hash_pool.hash(credentials.password)
+        await run_in_threadpool(db.commit)
     return schemas.Token(access_token=access_token)
 
 
 # --- User endpoints -----------------------------------------------------------
 
+# Read-only list endpoints run as async handlers on the asyncio session, so
+# slow queries wait on the event loop instead of pinning threadpool workers.
+# Their response schemas must be fully eager-loaded: lazy loads are not
+# available on the asyncio session. The large lists render their own body with
+# ``ModelResponse``, skipping FastAPI's validate/dump/re-encode round trip.
+
 @router.get("/users/me", response_model=schemas.UserOut)
-def read_current_user(current_user: models.User = Depends(auth.get_current_user)):
+async def read_current_user(current_user: models.User = Depends(auth.get_current_user_async)):
     """Return the profile for the currently authenticated user."""
     return current_user
 
 
 @router.get("/users", response_model=List[schemas.UserOut])
-def list_users(db: Session = Depends(get_db), current_user: models.User = Depends(auth.get_current_user)):
+async def list_users(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(auth.get_current_user_async),
+):
     """List all registered users, ordered alphabetically."""
-    return (
-        db.query(models.User)
-        .order_by(models.User.username.asc())
-        .all()
-    )
+    (version,) = await scope_versions_async(db, versions.USERS_SCOPE)
+    cached = not_modified(request, response, versions.etag("users", version))
+    if cached is not None:
+        return cached
+    users = await db.scalars(select(models.User).order_by(models.User.username.asc()))
+    return users.all()
 
 
 # --- Project endpoints --------------------------------------------------------
 
 @router.get("/projects", response_model=List[schemas.ProjectOut])
-def list_projects(db: Session = Depends(get_db), current_user: models.User = Depends(auth.get_current_user)):
+async def list_projects(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(auth.get_current_user_async),
+):
     """Return the projects visible to the current user."""
-    projects = (
-        db.query(models.Project)
-        .filter(accessible_projects_filter(current_user))
-        .distinct()
+    version, *access_versions = await scope_versions_async(
+        db, versions.PROJECTS_SCOPE, *access_scopes(current_user.id)
+    )
+    cached = not_modified(request, response, versions.etag("projects", current_user.id, version))
+    if cached is not None:
+        return cached
+    project_ids = await db.run_sync(
+        lambda session: accessible_project_ids(session, current_user, tuple(access_versions))
+    )
+    projects = await db.scalars(
+        select(models.Project)
+        .options(selectinload(models.Project.shared_users))
+        .filter(models.Project.id.in_(project_ids))
         .order_by(models.Project.created_at.desc())
-        .all()
     )
-    return projects
+    return ModelResponse(projects.all(), List[schemas.ProjectOut], headers=response.headers)
 
 
 @router.get("/projects/{project_id}/dashboard", response_model=schemas.ProjectDashboardOut)
 def project_dashboard_summary(
     project_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_user),
 ):
-    """Provide aggregate task counts for the dashboard donut chart."""
-    project = ensure_project_access(project_id, db, current_user)
+    """Provide aggregate task counts for the dashboard donut chart.
 
-    status_counts: Dict[str, int] = {}
-    results = (
-        db.query(models.Task.status, func.count(models.Task.id))
-        .filter(models.Task.project_id == project.id)
-        .group_by(models.Task.status)
-        .all()
-    )
-    for status, count in results:
-        status_counts[status or "unknown"] = count
+    Counts are read from ``project_status_counts``, which task writes keep current.
+    """
+    project = ensure_project_access(project_id, db, current_user)
+    (version,) = scope_versions(db, versions.project_scope(project.id))
+    cached = not_modified(request, response, versions.etag("dashboard", project.id, version))
+    if cached is not None:
+        return cached
+    status_counts = task_status_counts.project_counts(db, project.id)
 
     total_tasks = sum(status_counts.values())
     return schemas.ProjectDashboardOut(
@@ -275,31 +400,107 @@ def delete_project(project_id: int, db: Session = Depends(get_db), current_user:
     db.commit()
 
 
-# --- Task endpoints -----------------------------------------------------------
-
-@router.get("/projects/{project_id}/tasks", response_model=List[schemas.TaskOut])
-def list_tasks(
+@router.get("/projects/{project_id}/export", response_class=StreamingResponse)
+def export_project(
     project_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_user),
 ):
-    """List all tasks for a project, enforcing project access control."""
+    """Stream a project with its tasks, comments and history as NDJSON."""
     project = ensure_project_access(project_id, db, current_user)
-    return db.query(models.Task).filter(models.Task.project_id == project.id).all()
+    project_version, comments_version = scope_versions(
+        db, versions.project_scope(project.id), versions.comments_scope(project.id)
+    )
+    etag = versions.etag("export", project.id, project_version, comments_version)
+    cached = not_modified(request, response, etag)
+    if cached is not None:
+        return cached
+    return StreamingResponse(
+        project_transfer.export_lines(SessionLocal, project.id),
+        media_type=project_transfer.MEDIA_TYPE,
+        headers={
+            "Content-Disposition": f'attachment; filename="project-{project.id}.ndjson"',
+            **validator_headers(etag),
+        },
+    )
 
 
-@router.get("/projects/{project_id}/task-history", response_model=schemas.TaskHistoryResponse)
-def task_history(
-    project_id: int,
-    date_filter: Optional[date] = None,
-    start_date: Optional[date] = None,
-    end_date: Optional[date] = None,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+@router.post("/projects/import", response_model=schemas.ProjectImportResult, status_code=status.HTTP_201_CREATED)
+async def import_project(
+    request: Request,
+    name: Optional[str] = Query(None, max_length=100),
+    current_user: models.User = Depends(auth.get_current_user_async),
 ):
-    """Return task creation/deletion history for the authenticated user."""
-    project = ensure_project_access(project_id, db, current_user)
+    """Create a project owned by the caller from an NDJSON export.
+
+    The body is parsed as it arrives and inserted in chunks; everything
+    commits in one transaction or, on the first malformed line, not at all.
+    ``name`` overrides the exported project name.
+    """
+    db = SessionLocal()
+    importer = project_transfer.ProjectImporter(db, current_user, name=name)
+    try:
+        lines: List[bytes] = []
+        remainder = b""
+        async for chunk in request.stream():
+            *complete, remainder = (remainder + chunk).split(b"\n")
+            lines.extend(complete)
+            if len(lines) >= PROJECT_TRANSFER_CHUNK_SIZE:
+                await run_in_threadpool(importer.feed_lines, lines)
+                lines = []
+        lines.append(remainder)
+        await run_in_threadpool(importer.feed_lines, lines)
+        counts = await run_in_threadpool(importer.finish)
+        await run_in_threadpool(db.commit)
+    except (ValueError, IntegrityError) as exc:
+        await run_in_threadpool(db.rollback)
+        detail = str(exc) if isinstance(exc, ValueError) else "The export contains duplicate rows"
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+    finally:
+        await run_in_threadpool(db.close)
+    return schemas.ProjectImportResult(project_id=importer.project_id, counts=counts)
+
+
+# --- Task endpoints -----------------------------------------------------------
 
+@router.get("/projects/{project_id}/tasks", response_model=Union[List[schemas.TaskOut], schemas.TaskPage])
+async def list_tasks(
+    project_id: int,
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(auth.get_current_user_async),
+):
+    """List all tasks for a project, enforcing project access control.
+
+    Passing ``limit`` or ``cursor`` switches to a newest-first page envelope.
+    """
+    project = await ensure_project_access_async(project_id, db, current_user)
+    (version,) = await scope_versions_async(db, versions.project_scope(project.id))
+    cached = not_modified(request, response, versions.etag("tasks", project.id, version))
+    if cached is not None:
+        return cached
+    stmt = (
+        select(models.Task)
+        .options(selectinload(models.Task.assignees))
+        .filter(models.Task.project_id == project.id)
+    )
+    if limit is None and cursor is None:
+        return ModelResponse((await db.scalars(stmt)).all(), List[schemas.TaskOut], headers=response.headers)
+    tasks, next_cursor = await paginate_async(db, stmt, models.Task, limit or DEFAULT_PAGE_SIZE, cursor)
+    return ModelResponse({"items": tasks, "next_cursor": next_cursor}, schemas.TaskPage, headers=response.headers)
+
+
+def _history_range(
+    date_filter: Optional[date],
+    start_date: Optional[date],
+    end_date: Optional[date],
+) -> Tuple[date, date]:
+    """Resolve the requested days; defaults to the current month up to today."""
     if date_filter:
         start_date = date_filter
         end_date = date_filter
@@ -312,48 +513,106 @@ def task_history(
 
     if start_date > end_date:
         start_date, end_date = end_date, start_date
+    return start_date, end_date
 
-    start_dt = datetime.combine(start_date, datetime.min.time())
-    end_dt = datetime.combine(end_date, datetime.max.time())
 
-    activities = (
-        db.query(models.TaskActivity)
-        .filter(
-            models.TaskActivity.project_id == project.id,
-            models.TaskActivity.user_id == current_user.id,
-            models.TaskActivity.created_at >= start_dt,
-            models.TaskActivity.created_at <= end_dt,
-        )
-        .order_by(models.TaskActivity.created_at.desc())
-        .all()
-    )
+@router.get("/projects/{project_id}/task-history", response_model=schemas.TaskHistoryResponse)
+def task_history(
+    project_id: int,
+    request: Request,
+    response: Response,
+    date_filter: Optional[date] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=0, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_user),
+):
+    """Return task creation/deletion history for the authenticated user.
 
-    daily_counts: Dict[str, int] = defaultdict(int)
-    for activity in activities:
-        key = activity.created_at.strftime("%Y-%m-%d")
-        daily_counts[key] += 1
+    ``daily_counts`` covers the whole range, including days whose entries
+    were rolled up by ``manage.py compact-activities``. ``activities`` holds
+    only the newest ``limit`` raw entries (none for ``limit=0``); page on
+    with ``next_cursor`` here or on ``/task-history/activities``.
+    """
+    project = ensure_project_access(project_id, db, current_user)
+    start_date, end_date = _history_range(date_filter, start_date, end_date)
+    (version,) = scope_versions(db, versions.project_scope(project.id))
+    # The default range ends today, so the resolved dates are part of the tag.
+    etag = versions.etag("task-history", project.id, current_user.id, version, start_date, end_date)
+    cached = not_modified(request, response, etag)
+    if cached is not None:
+        return cached
+    daily_counts = activity_history.daily_counts(db, project.id, current_user.id, start_date, end_date)
+
+    activities, next_cursor = [], None
+    if limit:
+        range_filter = activity_history.range_filter(project.id, current_user.id, start_date, end_date)
+        query = db.query(models.TaskActivity).filter(*range_filter)
+        activities, next_cursor = paginate(query, models.TaskActivity, limit, cursor)
 
     return schemas.TaskHistoryResponse(
         activities=activities,
-        daily_counts=dict(daily_counts),
+        daily_counts=daily_counts,
+        next_cursor=next_cursor,
     )
 
 
-@router.get("/tasks", response_model=List[schemas.TaskOut])
-def list_all_accessible_tasks(
+@router.get("/projects/{project_id}/task-history/activities", response_model=schemas.TaskActivityPage)
+def list_task_activities(
+    project_id: int,
+    request: Request,
+    response: Response,
+    date_filter: Optional[date] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_user),
 ):
-    """Return every task across projects the user is allowed to see."""
-    tasks = (
-        db.query(models.Task)
-        .join(models.Project)
-        .filter(accessible_projects_filter(current_user))
-        .distinct()
-        .order_by(models.Task.created_at.desc())
-        .all()
+    """Page through the user's activities in a project, newest first."""
+    project = ensure_project_access(project_id, db, current_user)
+    start_date, end_date = _history_range(date_filter, start_date, end_date)
+    (version,) = scope_versions(db, versions.project_scope(project.id))
+    etag = versions.etag("task-activities", project.id, current_user.id, version, start_date, end_date)
+    cached = not_modified(request, response, etag)
+    if cached is not None:
+        return cached
+    range_filter = activity_history.range_filter(project.id, current_user.id, start_date, end_date)
+    query = db.query(models.TaskActivity).filter(*range_filter)
+    items, next_cursor = paginate(query, models.TaskActivity, limit, cursor)
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.get("/tasks", response_model=Union[List[schemas.TaskOut], schemas.TaskPage])
+async def list_all_accessible_tasks(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(auth.get_current_user_async),
+):
+    """Return every task across projects the user is allowed to see.
+
+    Passing ``limit`` or ``cursor`` switches to a newest-first page envelope.
+    """
+    project_versions = await db.run_sync(lambda session: accessible_project_versions(session, current_user))
+    cached = not_modified(request, response, versions.etag("all-tasks", *sorted(project_versions.items())))
+    if cached is not None:
+        return cached
+    stmt = (
+        select(models.Task)
+        .options(selectinload(models.Task.assignees))
+        .filter(models.Task.project_id.in_(project_versions))
     )
-    return tasks
+    if limit is None and cursor is None:
+        tasks = (await db.scalars(stmt.order_by(models.Task.created_at.desc()))).all()
+        return ModelResponse(tasks, List[schemas.TaskOut], headers=response.headers)
+    tasks, next_cursor = await paginate_async(db, stmt, models.Task, limit or DEFAULT_PAGE_SIZE, cursor)
+    return ModelResponse({"items": tasks, "next_cursor": next_cursor}, schemas.TaskPage, headers=response.headers)
 
 
 @router.post("/tasks", response_model=schemas.TaskOut, status_code=status.HTTP_201_CREATED)
@@ -449,133 +708,135 @@ def delete_task(
     db.commit()
 
 
-def _dependency_summary(task: models.Task) -> schemas.TaskSummary:
-    """Build a display-friendly summary object for the provided task."""
-    project_name = task.project.name if task.project else "Unknown"
-    return schemas.TaskSummary(
-        id=task.id,
-        title=task.title,
-        project_id=task.project_id,
-        project_name=project_name,
-    )
-
-
-def _build_dependency_map(tasks: List[models.Task], dependencies: List[models.TaskDependency]):
-    """Assemble nodes, edges, linear chains, and convergences for the graph view."""
-    summaries: Dict[int, schemas.TaskSummary] = {task.id: _dependency_summary(task) for task in tasks}
-    indegree: Dict[int, int] = {task.id: 0 for task in tasks}
-    outdegree: Dict[int, int] = {task.id: 0 for task in tasks}
-    adjacency: Dict[int, List[int]] = {task.id: [] for task in tasks}
-    reverse_adj: Dict[int, List[int]] = {task.id: [] for task in tasks}
-    edges: List[schemas.DependencyEdgeOut] = []
-
-    for dep in dependencies:
-        if dep.depends_on_task_id not in summaries or dep.dependent_task_id not in summaries:
-            continue
-        # Prevent adding duplicate edges if data is dirty, though DB constraint should handle this
-        if dep.dependent_task_id not in adjacency[dep.depends_on_task_id]:
-            adjacency[dep.depends_on_task_id].append(dep.dependent_task_id)
-            reverse_adj[dep.dependent_task_id].append(dep.depends_on_task_id)
-            outdegree[dep.depends_on_task_id] += 1
-            indegree[dep.dependent_task_id] += 1
-            
-        edges.append(
-            schemas.DependencyEdgeOut(
-                id=dep.id,
-                depends_on=summaries[dep.depends_on_task_id],
-                dependent=summaries[dep.dependent_task_id],
+@router.post("/tasks/batch", response_model=schemas.TaskBatchResponse)
+def batch_tasks(
+    batch: schemas.TaskBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_user),
+):
+    """Apply several task creates, updates and deletes in one transaction.
+
+    Tasks, projects and assignees are loaded up front and access is checked
+    once per project. An operation that fails its checks is reported in its
+    result and skipped; the others commit together, with their history rows
+    written by one bulk insert.
+    """
+    operations = batch.operations
+    task_ids = {operation.task_id for operation in operations if operation.task_id is not None}
+    tasks: Dict[int, models.Task] = {}
+    if task_ids:
+        tasks = {
+            task.id: task
+            for task in db.query(models.Task)
+            .options(selectinload(models.Task.assignees))
+            .filter(models.Task.id.in_(task_ids))
+        }
+
+    project_ids = {task.project_id for task in tasks.values()}
+    project_ids.update(operation.task.project_id for operation in operations if operation.op == "create")
+    projects: Dict[int, models.Project] = {}
+    if project_ids:
+        projects = {
+            project.id: project for project in db.query(models.Project).filter(models.Project.id.in_(project_ids))
+        }
+    allowed = projects.keys() & accessible_project_ids(db, current_user)
+
+    assignee_ids: Set[int] = set()
+    for operation in operations:
+        if operation.op == "create":
+            assignee_ids.update(operation.task.assignee_ids)
+        elif operation.op == "update" and operation.changes.assignee_ids:
+            assignee_ids.update(operation.changes.assignee_ids)
+    users: Dict[int, models.User] = {}
+    if assignee_ids:
+        users = {user.id: user for user in db.query(models.User).filter(models.User.id.in_(assignee_ids))}
+
+    # (op, status, task or None, task id or None, error detail or None)
+    outcomes = []
+    # (task, action, status, task title); ids of created tasks are known after the flush
+    logged = []
+    deleted: Set[int] = set()
+    for operation in operations:
+        if operation.op == "create":
+            task_in = operation.task
+            if task_in.project_id not in projects:
+                outcomes.append((operation.op, status.HTTP_404_NOT_FOUND, None, None, "Project not found"))
+                continue
+            if task_in.project_id not in allowed:
+                outcomes.append(
+                    (operation.op, status.HTTP_403_FORBIDDEN, None, None, "Not allowed to access this project")
+                )
+                continue
+            task = models.Task(
+                title=task_in.title,
+                description=task_in.description,
+                status=task_in.status,
+                project_id=task_in.project_id,
+                due_date=task_in.due_date,
             )
-        )
+            task.assignees = [users[user_id] for user_id in task_in.assignee_ids if user_id in users]
+            db.add(task)
+            logged.append((task, "created", task.status, task.title))
+            outcomes.append((operation.op, status.HTTP_201_CREATED, task, None, None))
+            continue
 
-    # --- START: FIXED CHAIN-FINDING LOGIC ---
-    
-    chains: List[schemas.DependencyChainOut] = []
-    visited_nodes: Set[int] = set()  # Tracks nodes *already part of a chain*
-
-    for task in tasks:
-        task_id = task.id
-        if task_id in visited_nodes:
-            continue  # This node is already part of a chain we found
-
-        # A "chain head" is a node that is NOT a "middle" link.
-        # A "middle" link is: indegree == 1 AND its predecessor also has outdegree == 1
-        is_middle_link = False
-        if indegree.get(task_id, 0) == 1:
-            predecessor_id = reverse_adj[task_id][0]
-            if outdegree.get(predecessor_id, 0) == 1:
-                is_middle_link = True
-
-        # We only start tracing from a "true" head, not a middle link.
-        # We also must have an outdegree of 1 to start a chain.
-        if not is_middle_link and outdegree.get(task_id, 0) == 1:
-            chain_ids = [task_id]
-            visited_nodes.add(task_id)
-            current = task_id
-
-            # Start tracing the chain
-            while outdegree.get(current, 0) == 1:
-                nxt = adjacency[current][0]
-                
-                # The chain continues *only if* the next node is also a linear link
-                if indegree.get(nxt, 0) == 1:
-                    if nxt in chain_ids:
-                         break # Cycle detected, though your create endpoint should prevent this
-                    chain_ids.append(nxt)
-                    visited_nodes.add(nxt)
-                    current = nxt
-                else:
-                    # Next node is a convergence (indegree > 1) or end (indegree = 0, impossible)
-                    # so the linear chain ends here.
-                    break 
-
-            if len(chain_ids) > 1:
-                chains.append(
-                    schemas.DependencyChainOut(tasks=[summaries[node_id] for node_id in chain_ids])
-                )
-    
-    # --- END: FIXED CHAIN-FINDING LOGIC ---
-
-    # Your convergence logic was already correct and requires no changes.
-    convergences: List[schemas.DependencyConvergenceOut] = []
-    for task in tasks:
-        task_id = task.id
-        sources = reverse_adj.get(task_id, [])
-        if len(sources) > 1:
-            convergences.append(
-                schemas.DependencyConvergenceOut(
-                    target=summaries[task_id],
-                    sources=[summaries[source_id] for source_id in sources],
-                )
+        task = tasks.get(operation.task_id)
+        if task is None or task.id in deleted:
+            outcomes.append((operation.op, status.HTTP_404_NOT_FOUND, None, operation.task_id, "Task not found"))
+            continue
+        if task.project_id not in allowed:
+            outcomes.append(
+                (operation.op, status.HTTP_403_FORBIDDEN, None, task.id, "Not allowed to access this task")
             )
+            continue
 
-    return schemas.DependencyMapOut(
-        tasks=list(summaries.values()),
-        edges=edges,
-        chains=chains,
-        convergences=convergences,
-    )
+        if operation.op == "delete":
+            logged.append((task, "deleted", task.status, task.title))
+            db.delete(task)
+            deleted.add(task.id)
+            outcomes.append((operation.op, status.HTTP_204_NO_CONTENT, None, task.id, None))
+            continue
 
+        original_status = task.status
+        update_data = operation.changes.dict(exclude_unset=True)
+        changed_assignees = update_data.pop("assignee_ids", None)
+        for field, value in update_data.items():
+            setattr(task, field, value)
+        if changed_assignees is not None:
+            task.assignees = [users[user_id] for user_id in changed_assignees if user_id in users]
+        if "status" in update_data and task.status != original_status:
+            logged.append((task, "status_changed", task.status, task.title))
+        outcomes.append((operation.op, status.HTTP_200_OK, task, task.id, None))
 
-def _creates_dependency_cycle(
-    db: Session, depends_on_task_id: int, dependent_task_id: int
-) -> bool:
-    """Depth-first search to ensure new dependency edges do not form a cycle."""
-    stack = [dependent_task_id]
-    visited: Set[int] = set()
-    while stack:
-        current = stack.pop()
-        if current == depends_on_task_id:
-            return True
-        if current in visited:
-            continue
-        visited.add(current)
-        next_tasks = (
-            db.query(models.TaskDependency.dependent_task_id)
-            .filter(models.TaskDependency.depends_on_task_id == current)
-            .all()
+    db.flush()
+    if logged:
+        db.execute(
+            insert(models.TaskActivity),
+            [
+                {
+                    "user_id": current_user.id,
+                    "project_id": task.project_id,
+                    "task_id": task.id,
+                    "task_title": title,
+                    "status": activity_status,
+                    "action": action,
+                }
+                for task, action, activity_status, title in logged
+            ],
+        )
+    # Serialize before the commit expires the tasks, so no refresh is needed.
+    results = [
+        schemas.TaskBatchResult(
+            op=op,
+            status=result_status,
+            task_id=task.id if task is not None else task_id,
+            task=schemas.TaskOut.model_validate(task) if task is not None else None,
+            detail=detail,
         )
-        stack.extend(dep_id for (dep_id,) in next_tasks)
-    return False
+        for op, result_status, task, task_id, detail in outcomes
+    ]
+    db.commit()
+    return schemas.TaskBatchResponse(results=results)
 
 
 # --- Dependency graph endpoints ----------------------------------------------
@@ -604,7 +865,7 @@ def create_task_dependency(
     if existing:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Dependency already exists")
 
-    if _creates_dependency_cycle(db, depends_on_task.id, dependent_task.id):
+    if dependency_graph.would_create_cycle(db, depends_on_task.id, dependent_task.id):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Dependency would create a cycle")
 
     dependency = models.TaskDependency(
@@ -612,7 +873,12 @@ def create_task_dependency(
         depends_on_task_id=depends_on_task.id,
     )
     db.add(dependency)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent request added the same edge first.
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Dependency already exists")
     db.refresh(dependency)
     return dependency
 
@@ -635,52 +901,160 @@ def delete_task_dependency(
     db.commit()
 
 
-@router.get("/dependency-map", response_model=schemas.DependencyMapOut)
-def dependency_map(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.get_current_user),
-):
-    """Return the dependency graph focused on tasks accessible to the user."""
+def _related_task_summaries(
+    db: Session, task_ids: Set[int], user: models.User
+) -> List[schemas.TaskSummary]:
+    """Summaries of the given tasks that live in projects the user can access."""
+    if not task_ids:
+        return []
     tasks = (
         db.query(models.Task)
         .join(models.Project)
-        .filter(accessible_projects_filter(current_user))
-        .distinct()
+        .options(contains_eager(models.Task.project))
+        .filter(models.Task.id.in_(task_ids), models.Task.project_id.in_(accessible_project_ids(db, user)))
+        .order_by(models.Task.id)
         .all()
     )
-    if not tasks:
-        return schemas.DependencyMapOut(tasks=[], edges=[], chains=[], convergences=[])
+    return [task_summary(task) for task in tasks]
 
-    dependencies = (
-        db.query(models.TaskDependency)
-        .join(models.Task, models.TaskDependency.dependent_task)
-        .join(models.Project)
-        .filter(accessible_projects_filter(current_user))
-        .all()
+
+@router.get("/tasks/{task_id}/upstream", response_model=List[schemas.TaskSummary])
+def list_upstream_tasks(
+    task_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_user),
+):
+    """Return every task the given task transitively depends on."""
+    task = ensure_task_access(task_id, db, current_user)
+    # Dependencies cross projects, so every accessible project's version counts.
+    project_versions = accessible_project_versions(db, current_user)
+    cached = not_modified(request, response, versions.etag("upstream", task.id, *sorted(project_versions.items())))
+    if cached is not None:
+        return cached
+    return _related_task_summaries(db, dependency_graph.upstream_task_ids(db, task.id), current_user)
+
+
+@router.get("/tasks/{task_id}/downstream", response_model=List[schemas.TaskSummary])
+def list_downstream_tasks(
+    task_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_user),
+):
+    """Return every task that transitively depends on the given task."""
+    task = ensure_task_access(task_id, db, current_user)
+    # Dependencies cross projects, so every accessible project's version counts.
+    project_versions = accessible_project_versions(db, current_user)
+    cached = not_modified(request, response, versions.etag("downstream", task.id, *sorted(project_versions.items())))
+    if cached is not None:
+        return cached
+    return _related_task_summaries(db, dependency_graph.downstream_task_ids(db, task.id), current_user)
+
+
+@router.get("/dependency-map", response_model=schemas.DependencyMapOut)
+def dependency_map(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_user),
+):
+    """Return the dependency graph focused on tasks accessible to the user.
+
+    The map is served from ``dependency_map_cache``; only projects whose
+    version changed since they were cached are reloaded. Clients revalidate
+    with ``If-None-Match`` and get ``304`` while nothing they can see changed.
+    """
+    project_versions = accessible_project_versions(db, current_user)
+    etag, graph = dependency_map_cache.get_map(db, project_versions)
+    cached = not_modified(request, response, etag)
+    if cached is not None:
+        return cached
+    return graph
+
+
+@router.get("/projects/{project_id}/dependency-map", response_model=schemas.ProjectDependencyMapOut)
+def project_dependency_map(
+    project_id: int,
+    request: Request,
+    response: Response,
+    root_task_id: Optional[int] = None,
+    depth: Optional[int] = Query(None, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_user),
+):
+    """Page through one project's dependency graph with server-side layered coordinates.
+
+    Only the project's own tasks and the edges between them are included;
+    ``root_task_id``/``depth`` narrow it to a task's neighbourhood. Nodes are
+    returned in (level, position) order and each page carries the edges into
+    its nodes, so clients can render pages as they arrive.
+    """
+    project = ensure_project_access(project_id, db, current_user)
+    (version,) = scope_versions(db, versions.project_scope(project.id))
+    cached = not_modified(request, response, versions.etag("project-depmap", project.id, version))
+    if cached is not None:
+        return cached
+    layout = dependency_map_cache.project_layout(db, project.id, version, root_task_id, depth)
+    if layout is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found in this project")
+
+    after = decode_position_cursor(cursor) if cursor else None
+    nodes, edges, has_more = layout.page(after, limit)
+    next_cursor = encode_position_cursor(nodes[-1].level, nodes[-1].position) if has_more else None
+    return schemas.ProjectDependencyMapOut(
+        nodes=nodes,
+        edges=edges,
+        levels=layout.levels,
+        total_nodes=len(layout.nodes),
+        next_cursor=next_cursor,
     )
-    return _build_dependency_map(tasks, dependencies)
 
 
 # --- Comment and notification endpoints --------------------------------------
 
-@router.get("/tasks/{task_id}/comments", response_model=List[schemas.CommentOut])
+@router.get("/tasks/{task_id}/comments", response_model=Union[List[schemas.CommentOut], schemas.CommentPage])
 def list_comments(
     task_id: int,
+    request: Request,
+    response: Response,
+    depth: Optional[int] = Query(None, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_user),
 ):
-    """Return the top-level comments for a task the user can access."""
+    """Return the top-level comments of a task with their reply threads.
+
+    ``depth`` limits how many levels of replies are included. Passing ``limit``
+    or ``cursor`` pages the top-level comments newest-first in an envelope.
+    """
     task = db.query(models.Task).filter(models.Task.id == task_id).first()
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
-    if not user_can_access_project(task.project, current_user):
+    if not user_can_access_project(db, task.project_id, current_user):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed to access comments for this task")
-    comments = (
+    (version,) = scope_versions(db, versions.comments_scope(task.project_id))
+    cached = not_modified(request, response, versions.etag("comments", task.id, version))
+    if cached is not None:
+        return cached
+    query = (
         db.query(models.Comment)
+        .join(models.Comment.author)
+        .options(contains_eager(models.Comment.author))
         .filter(models.Comment.task_id == task_id, models.Comment.parent_id.is_(None))
-        .all()
     )
-    return comments
+    if limit is None and cursor is None:
+        comments = query.order_by(models.Comment.created_at, models.Comment.id).all()
+        comment_threads.attach_replies(db, comments, depth)
+        return comments
+    comments, next_cursor = paginate(query, models.Comment, limit or DEFAULT_PAGE_SIZE, cursor)
+    comment_threads.attach_replies(db, comments, depth)
+    return {"items": comments, "next_cursor": next_cursor}
 
 
 @router.post("/comments", response_model=schemas.CommentOut, status_code=status.HTTP_201_CREATED)
@@ -693,7 +1067,7 @@ def create_comment(
     task = db.query(models.Task).filter(models.Task.id == comment_in.task_id).first()
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
-    if not user_can_access_project(task.project, current_user):
+    if not user_can_access_project(db, task.project_id, current_user):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed to comment on this task")
     parent = None
     if comment_in.parent_id:
@@ -707,30 +1081,21 @@ def create_comment(
         parent_id=parent.id if parent else None,
     )
     db.add(comment)
-    db.commit()
-    db.refresh(comment)
+    db.flush()
 
-    mentioned_users = parse_mentions(comment.content, db)
-    task = comment.task
-    project = task.project if task else None
-    for user in mentioned_users:
-        if user.id == current_user.id:
-            continue
-        location_bits = []
-        if project:
-            location_bits.append(f"project '{project.name}'")
-        if task:
-            location_bits.append(f"task '{task.title}'")
-        location = " in " + ", ".join(location_bits) if location_bits else ""
-        notification = models.Notification(
-            recipient_id=user.id,
-            comment_id=comment.id,
-            message=f"{current_user.username} mentioned you{location}",
-        )
-        db.add(notification)
+    notifications = notify_mentions(
+        db, comment, current_user, parse_mentions(comment.content, db), task, task.project
+    )
+    # Serialize before the commit expires the instances; a new comment has no replies.
+    set_committed_value(comment, "replies", [])
+    result = schemas.CommentOut.model_validate(comment)
+    events = [
+        (n.recipient_id, schemas.NotificationOut.model_validate(n).model_dump(mode="json")) for n in notifications
+    ]
     db.commit()
-    db.refresh(comment)
-    return comment
+    for recipient_id, payload in events:
+        notification_hub.publish(recipient_id, "notification", payload)
+    return result
 
 
 @router.post("/comments/{comment_id}/solve", response_model=schemas.CommentOut)
@@ -747,7 +1112,7 @@ def solve_comment(comment_id: int, db: Session = Depends(get_db), current_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Comment not found")
 
     project: models.Project = comment.task.project
-    if not user_can_access_project(project, current_user):
+    if not user_can_access_project(db, project.id, current_user):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed to update this comment")
     is_owner = project.owner_id == current_user.id
     is_author = comment.author_id == current_user.id
@@ -765,16 +1130,101 @@ def solve_comment(comment_id: int, db: Session = Depends(get_db), current_user:
     return comment
 
 
-@router.get("/notifications", response_model=List[schemas.NotificationOut])
-def list_notifications(db: Session = Depends(get_db), current_user: models.User = Depends(auth.get_current_user)):
-    """List notifications for the current user in reverse chronological order."""
-    notifications = (
-        db.query(models.Notification)
-        .filter(models.Notification.recipient_id == current_user.id)
-        .order_by(models.Notification.created_at.desc())
-        .all()
+@router.get("/notifications", response_model=Union[List[schemas.NotificationOut], schemas.NotificationPage])
+async def list_notifications(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(auth.get_current_user_async),
+):
+    """List notifications for the current user in reverse chronological order.
+
+    Passing ``limit`` or ``cursor`` switches to a page envelope.
+    """
+    (version,) = await scope_versions_async(db, versions.user_scope(current_user.id))
+    cached = not_modified(request, response, versions.etag("notifications", current_user.id, version))
+    if cached is not None:
+        return cached
+    stmt = select(models.Notification).filter(models.Notification.recipient_id == current_user.id)
+    if limit is None and cursor is None:
+        notifications = (await db.scalars(stmt.order_by(models.Notification.created_at.desc()))).all()
+        return ModelResponse(notifications, List[schemas.NotificationOut], headers=response.headers)
+    notifications, next_cursor = await paginate_async(
+        db, stmt, models.Notification, limit or DEFAULT_PAGE_SIZE, cursor
+    )
+    page = {"items": notifications, "next_cursor": next_cursor}
+    return ModelResponse(page, schemas.NotificationPage, headers=response.headers)
+
+
+@router.get("/notifications/unread-count", response_model=schemas.NotificationUnreadCount)
+async def count_unread_notifications(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(auth.get_current_user_async),
+):
+    """Return how many notifications the current user has not read yet."""
+    (version,) = await scope_versions_async(db, versions.user_scope(current_user.id))
+    cached = not_modified(request, response, versions.etag("unread", current_user.id, version))
+    if cached is not None:
+        return cached
+    unread = await db.scalar(
+        select(func.count(models.Notification.id)).where(
+            models.Notification.recipient_id == current_user.id,
+            models.Notification.read.is_(False),
+        )
+    )
+    return schemas.NotificationUnreadCount(unread=unread or 0)
+
+
+@router.post("/notifications/read", response_model=schemas.NotificationBulkReadResult)
+def mark_notifications_read(
+    selection: schemas.NotificationBulkRead,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_user),
+):
+    """Mark many notifications as read with a single UPDATE statement."""
+    query = db.query(models.Notification).filter(
+        models.Notification.recipient_id == current_user.id,
+        models.Notification.read.is_(False),
+    )
+    if selection.ids is not None:
+        query = query.filter(models.Notification.id.in_(selection.ids))
+    elif selection.cursor is not None:
+        query = query.filter(at_or_before_cursor(models.Notification, selection.cursor))
+    updated = query.update({models.Notification.read: True}, synchronize_session=False)
+    if updated:
+        # The bulk UPDATE skips the mapper events that normally bump this.
+        versions.bump(db.connection(), [versions.user_scope(current_user.id)])
+    db.commit()
+    return schemas.NotificationBulkReadResult(updated=updated)
+
+
+@router.get("/notifications/stream", include_in_schema=False)
+async def stream_notifications(request: Request, current_user: models.User = Depends(auth.get_streaming_user)):
+    """Push new notifications to the client as Server-Sent Events."""
+    user_id = current_user.id
+
+    async def event_stream():
+        subscription = notification_hub.subscribe(user_id)
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                message = await subscription.get(timeout=NOTIFICATION_STREAM_KEEPALIVE_SECONDS)
+                if message is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {message['event']}\ndata: {json.dumps(message['data'])}\n\n"
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-    return notifications
 
 
 @router.post("/notifications/{notification_id}/read", response_model=schemas.NotificationOut)
@@ -793,22 +1243,63 @@ def mark_notification_read(notification_id: int, db: Session = Depends(get_db),
     return notification
 
 
+# --- Search endpoints ---------------------------------------------------------
+
+@router.get("/search", response_model=schemas.SearchPage)
+async def search(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(auth.get_current_user_async),
+):
+    """Search task titles, descriptions and comments in accessible projects.
+
+    All words must match; ``word*`` matches a prefix. Results are ranked with
+    bm25 and paged with an opaque cursor. ``snippet`` is HTML: the matched
+    text escaped, with the matching words wrapped in ``<mark>``.
+    """
+    if db.get_bind().dialect.name != "sqlite":
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail="Search requires SQLite FTS5")
+    match = full_text_search.match_expression(q)
+    if match is None:
+        return {"items": [], "next_cursor": None}
+    project_versions, comment_versions = await db.run_sync(
+        lambda session: (
+            accessible_project_versions(session, current_user),
+            accessible_project_versions(session, current_user, versions.comments_scope),
+        )
+    )
+    etag = versions.etag("search", *sorted(project_versions.items()), *sorted(comment_versions.items()))
+    cached = not_modified(request, response, etag)
+    if cached is not None:
+        return cached
+    offset = decode_offset_cursor(cursor) if cursor else 0
+    stmt = full_text_search.statement(match, models.Project.id.in_(project_versions))
+    rows = (await db.execute(stmt.offset(offset).limit(limit + 1))).all()
+    next_cursor = encode_offset_cursor(offset + limit) if len(rows) > limit else None
+    items = [{**row._mapping, "snippet": full_text_search.highlight(row.snippet)} for row in rows[:limit]]
+    return {"items": items, "next_cursor": next_cursor}
+
+
 # --- Frontend routes ---------------------------------------------------------
 
 @router.get("/", include_in_schema=False)
-def serve_frontend():
+def serve_frontend(request: Request):
     """Serve the compiled SPA index page."""
     index_path = FRONTEND_PUBLIC_DIR / "index.html"
-    return FileResponse(index_path)
+    return negotiated_file_response(index_path, request.headers.get("Accept-Encoding", ""))
 
 
 @router.get("/login", include_in_schema=False)
-def serve_login():
+def serve_login(request: Request):
     """Serve the standalone login HTML page."""
-    return FileResponse(FRONTEND_PUBLIC_DIR / "login.html")
+    return negotiated_file_response(FRONTEND_PUBLIC_DIR / "login.html", request.headers.get("Accept-Encoding", ""))
 
 
 @router.get("/register", include_in_schema=False)
-def serve_register():
+def serve_register(request: Request):
     """Serve the standalone registration HTML page."""
-    return FileResponse(FRONTEND_PUBLIC_DIR / "register.html")
\ No newline at end of file
+    return negotiated_file_response(FRONTEND_PUBLIC_DIR / "register.html", request.headers.get("Accept-Encoding", ""))
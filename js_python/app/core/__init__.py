@@ -1,6 +1,6 @@
 """Core utilities for the FastAPI application."""
 
-from . import app, config, database  # noqa: F401
+from . import app, compression, config, database, migrations  # noqa: F401
 
-__all__ = ["app", "config", "database"]
+__all__ = ["app", "compression", "config", "database", "migrations"]
 
@@ -2,16 +2,16 @@
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
 from app.api.routes import router
-from app.core import config
-from app.core.database import Base, engine
+from app.core import compression, config, migrations
+from app.core.database import engine
+from app.services import auth
 
 
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application instance."""
-    Base.metadata.create_all(bind=engine)
+    migrations.upgrade(engine)
 
     app = FastAPI(title=config.APP_TITLE)
 
@@ -22,14 +22,30 @@ def create_app() -> FastAPI:
         allow_methods=config.CORS_ALLOW_METHODS,
         allow_headers=config.CORS_ALLOW_HEADERS,
     )
+    app.add_middleware(
+        compression.CompressionMiddleware,
+        minimum_size=config.COMPRESSION_MINIMUM_SIZE,
+        compresslevel=config.COMPRESSION_LEVEL,
+        excluded_paths=config.COMPRESSION_EXCLUDED_PATHS,
+    )
 
     if config.STATIC_FILES_DIR.exists():
+        if config.PRECOMPRESS_STATIC_FILES:
+            compression.precompress(config.STATIC_FILES_DIR, config.COMPRESSION_MINIMUM_SIZE)
         app.mount(
             config.STATIC_MOUNT_PATH,
-            StaticFiles(directory=str(config.STATIC_FILES_DIR)),
+            compression.PrecompressedStaticFiles(directory=str(config.STATIC_FILES_DIR)),
             name="static",
         )
 
     app.include_router(router)
+
+    # Each app owns its hashing pool, so shutting one down never leaves
+    # another instance in the same process without one.
+    app.state.password_hash_pool = auth.PasswordHashPool(
+        workers=config.PASSWORD_HASH_WORKERS,
+        queue_limit=config.PASSWORD_HASH_QUEUE_LIMIT,
+    )
+    app.add_event_handler("shutdown", app.state.password_hash_pool.shutdown)
     return app
 
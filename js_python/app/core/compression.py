@@ -0,0 +1,155 @@
+"""Response compression and precompressed frontend assets.
+
+API responses are gzip-compressed on the fly once they reach
+``COMPRESSION_MINIMUM_SIZE`` bytes; smaller bodies are sent as they are, since
+the gzip framing and CPU time are not worth it. The notification event stream
+is never compressed because the compressor would hold events back; it is
+recognised from the request, before Starlette's gzip responder is involved.
+
+Frontend files do not change between deploys, so they are compressed once at
+maximum level instead of on every request: ``precompress`` writes a ``.gz``
+sibling (and ``.br`` when the optional ``brotli`` package is installed) next
+to each text asset, and ``PrecompressedStaticFiles`` serves the best sibling
+the client accepts. A sibling older than its source is ignored, so an edited
+file is never served stale. Responses that already carry ``Content-Encoding``
+pass through the middleware untouched.
+"""
+
+import gzip
+import os
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional: without it only .gz siblings are written
+    brotli = None
+
+COMPRESSIBLE_SUFFIXES = frozenset({".html", ".css", ".js", ".mjs", ".json", ".map", ".svg", ".txt", ".xml"})
+UNCOMPRESSED_MEDIA_TYPES = ("text/event-stream",)
+# Preferred first; each entry is (Content-Encoding, file suffix)
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """``GZipMiddleware`` that leaves event streams uncompressed.
+
+    A request is passed straight to the app, without a gzip responder, when
+    its path is in ``excluded_paths`` or it asks for ``text/event-stream``
+    (as ``EventSource`` does).
+    """
+
+    def __init__(
+        self, app: ASGIApp, minimum_size: int = 500, compresslevel: int = 9, excluded_paths: Iterable[str] = ()
+    ) -> None:
+        super().__init__(app, minimum_size=minimum_size, compresslevel=compresslevel)
+        self.excluded_paths = frozenset(excluded_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and self._is_stream(scope):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+    def _is_stream(self, scope: Scope) -> bool:
+        if scope["path"] in self.excluded_paths:
+            return True
+        accept = Headers(scope=scope).get("Accept", "")
+        return any(media_type in accept for media_type in UNCOMPRESSED_MEDIA_TYPES)
+
+
+def _encoders() -> Iterator[Tuple[str, Callable[[bytes], bytes]]]:
+    yield ".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0)
+    if brotli is not None:
+        yield ".br", lambda data: brotli.compress(data, quality=11)
+
+
+def precompress(directory: Path, minimum_size: int = 0) -> int:
+    """Write missing or outdated compressed siblings of the text assets under ``directory``.
+
+    Returns the number of files written.
+    """
+    written = 0
+    for path in sorted(directory.rglob("*")):
+        if path.suffix not in COMPRESSIBLE_SUFFIXES or not path.is_file():
+            continue
+        source = path.stat()
+        if source.st_size < minimum_size:
+            continue
+        data = None
+        for suffix, compress in _encoders():
+            target = path.with_name(path.name + suffix)
+            if target.exists() and target.stat().st_mtime >= source.st_mtime:
+                continue
+            if data is None:
+                data = path.read_bytes()
+            # Write beside the target and rename so a running server never
+            # serves a half-written file.
+            partial = target.with_name(target.name + ".tmp")
+            partial.write_bytes(compress(data))
+            os.replace(partial, target)
+            written += 1
+    return written
+
+
+def compressed_variant(
+    path: str, source: os.stat_result, accept_encoding: str
+) -> Optional[Tuple[str, str, os.stat_result]]:
+    """Pick the preferred precompressed sibling of ``path`` the client accepts.
+
+    Returns ``(encoding, sibling path, sibling stat)``, or ``None`` when no
+    accepted sibling exists that is at least as new as the source.
+    """
+    for encoding, suffix in ENCODINGS:
+        if encoding not in accept_encoding:
+            continue
+        try:
+            stat = os.stat(path + suffix)
+        except OSError:
+            continue
+        if stat.st_mtime >= source.st_mtime:
+            return encoding, path + suffix, stat
+    return None
+
+
+def _compressed_response(variant: Tuple[str, str, os.stat_result], media_type: Optional[str]) -> FileResponse:
+    encoding, variant_path, stat = variant
+    response = FileResponse(variant_path, stat_result=stat, media_type=media_type)
+    response.headers["Content-Encoding"] = encoding
+    response.headers.add_vary_header("Accept-Encoding")
+    return response
+
+
+def negotiated_file_response(path: Path, accept_encoding: str) -> FileResponse:
+    """``FileResponse`` for ``path``, from a precompressed sibling when one fits."""
+    response = FileResponse(path, stat_result=os.stat(path))
+    variant = compressed_variant(str(path), response.stat_result, accept_encoding)
+    if variant is None:
+        return response
+    return _compressed_response(variant, response.media_type)
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """``StaticFiles`` that answers with a ``.br``/``.gz`` sibling when the client accepts it."""
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = await super().get_response(path, scope)
+        if not isinstance(response, FileResponse) or response.stat_result is None:
+            return response
+        request_headers = Headers(scope=scope)
+        variant = await anyio.to_thread.run_sync(
+            compressed_variant, str(response.path), response.stat_result, request_headers.get("Accept-Encoding", "")
+        )
+        if variant is None:
+            return response
+        compressed = _compressed_response(variant, response.media_type)
+        if self.is_not_modified(compressed.headers, request_headers):
+            return NotModifiedResponse(compressed.headers)
+        return compressed
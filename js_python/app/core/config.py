@@ -1,5 +1,6 @@
 """Central place for application-level configuration constants."""
 
+import os
 from pathlib import Path
 
 
@@ -15,3 +16,38 @@ CORS_ALLOW_METHODS = ["*"]
 CORS_ALLOW_HEADERS = ["*"]
 CORS_ALLOW_CREDENTIALS = True
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+TASK_BATCH_MAX_OPERATIONS = 200
+# Rows fetched per round trip when exporting, and inserted per statement when importing
+PROJECT_TRANSFER_CHUNK_SIZE = 1000
+PRINCIPAL_CACHE_MAX_ENTRIES = 1024
+PRINCIPAL_CACHE_TTL_SECONDS = 60
+DEPENDENCY_MAP_CACHE_MAX_PROJECTS = 4096
+DEPENDENCY_MAP_CACHE_MAX_MAPS = 256
+PROJECT_ACCESS_CACHE_MAX_USERS = 4096
+# Raw task activities older than this many days are rolled up into daily counts
+TASK_ACTIVITY_RETENTION_DAYS = int(os.getenv("TASK_ACTIVITY_RETENTION_DAYS", "180"))
+PASSWORD_HASH_ROUNDS = int(os.getenv("PASSWORD_HASH_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "32"))
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/dsbp.db")
+# Driver URL for the asyncio engine; derived from DATABASE_URL when unset
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", "")
+# "production" applies the tuned SQLite pragmas below; "default" leaves SQLite's own defaults
+DATABASE_PROFILE = os.getenv("DATABASE_PROFILE", "production")
+DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "10"))
+DATABASE_MAX_OVERFLOW = int(os.getenv("DATABASE_MAX_OVERFLOW", "20"))
+DATABASE_POOL_TIMEOUT = float(os.getenv("DATABASE_POOL_TIMEOUT", "30"))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+# Responses smaller than this many bytes are sent uncompressed
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+COMPRESSION_LEVEL = int(os.getenv("COMPRESSION_LEVEL", "6"))
+# Streaming endpoints that must reach the client unbuffered
+COMPRESSION_EXCLUDED_PATHS = ("/notifications/stream",)
+# Write .gz (and .br with brotli installed) siblings of frontend assets at startup
+PRECOMPRESS_STATIC_FILES = os.getenv("PRECOMPRESS_STATIC_FILES", "1") != "0"
+NOTIFICATION_STREAM_KEEPALIVE_SECONDS = 15
+NOTIFICATION_STREAM_QUEUE_SIZE = 100
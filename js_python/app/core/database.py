@@ -1,19 +1,147 @@
-from sqlalchemy import create_engine
+"""Database engines, session factories and declarative base.
+
+Two engines share one database: the blocking engine behind ``get_db`` and an
+asyncio engine (aiosqlite for SQLite) behind ``get_async_db``. Only read-only
+handlers (the user, project, task and notification lists) use the asyncio
+session; every write goes through ``get_db``, because the mutation paths and
+the services they call rely on lazy relationship loading and on the session
+events that bump ``scope_versions``.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from sqlalchemy import Table, create_engine, event, inspect
+from sqlalchemy.engine import URL, Connection, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.schema import CreateColumn
+
+from app.core import config
+
+SQLALCHEMY_DATABASE_URL = config.DATABASE_URL
+
+# PRAGMAs applied to every new SQLite connection, per engine profile.
+SQLITE_PROFILES: Dict[str, Dict[str, object]] = {
+    "default": {},
+    "production": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": config.SQLITE_BUSY_TIMEOUT_MS,
+        "mmap_size": config.SQLITE_MMAP_SIZE,
+        "cache_size": -config.SQLITE_CACHE_SIZE_KB,
+        "temp_store": "MEMORY",
+    },
+}
+
+# Drivers used by the asyncio engine for each synchronous backend.
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def _is_memory_database(url: URL) -> bool:
+    return url.database in (None, "", ":memory:")
+
+
+def _engine_options(url: URL, profile: str) -> Dict[str, Any]:
+    """Keyword arguments shared by the blocking and asyncio engines."""
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown database profile: {profile}")
+
+    pool_options = {
+        "pool_size": config.DATABASE_POOL_SIZE,
+        "max_overflow": config.DATABASE_MAX_OVERFLOW,
+        "pool_timeout": config.DATABASE_POOL_TIMEOUT,
+    }
+    if url.get_backend_name() != "sqlite":
+        return {**pool_options, "pool_pre_ping": True}
+    if _is_memory_database(url):
+        return {"connect_args": {"check_same_thread": False}}
+
+    Path(url.database).parent.mkdir(parents=True, exist_ok=True)
+    return {**pool_options, "connect_args": {"check_same_thread": False}}
+
+
+def _register_sqlite_pragmas(sync_engine: Engine, url: URL, profile: str) -> None:
+    pragmas = SQLITE_PROFILES[profile]
+    if url.get_backend_name() != "sqlite" or _is_memory_database(url) or not pragmas:
+        return
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./data/dsbp.db"
+    @event.listens_for(sync_engine, "connect")
+    def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+
+def create_database_engine(url: str = SQLALCHEMY_DATABASE_URL, profile: Optional[str] = None) -> Engine:
+    """Build a blocking engine for ``url`` using the named SQLite tuning profile."""
+    profile = profile or config.DATABASE_PROFILE
+    parsed = make_url(url)
+    engine = create_engine(url, **_engine_options(parsed, profile))
+    _register_sqlite_pragmas(engine, parsed, profile)
+    return engine
+
+
+def async_database_url(url: str = SQLALCHEMY_DATABASE_URL) -> str:
+    """Return ``url`` rewritten for the matching asyncio driver."""
+    parsed = make_url(url)
+    if parsed.get_dialect().is_async:
+        return url
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver configured for {backend}")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def create_async_database_engine(url: Optional[str] = None, profile: Optional[str] = None) -> AsyncEngine:
+    """Build an asyncio engine with the same profile as ``create_database_engine``."""
+    profile = profile or config.DATABASE_PROFILE
+    url = url or config.ASYNC_DATABASE_URL or async_database_url()
+    parsed = make_url(url)
+    options = _engine_options(parsed, profile)
+    if "pool_size" in options:
+        # aiosqlite defaults to NullPool for file databases; keep connections pooled.
+        options["poolclass"] = AsyncAdaptedQueuePool
+    engine = create_async_engine(url, **options)
+    _register_sqlite_pragmas(engine.sync_engine, parsed, profile)
+    return engine
+
+
+engine = create_database_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_database_engine()
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 
+def add_missing_columns(bind: Union[Engine, Connection], table: Table) -> list:
+    """ALTER an existing table to add nullable columns declared on the model but absent in the database.
+
+    An engine gets its own transaction; a connection uses the caller's.
+    """
+    if isinstance(bind, Engine):
+        with bind.begin() as connection:
+            return add_missing_columns(connection, table)
+    existing = {column["name"] for column in inspect(bind).get_columns(table.name)}
+    missing = [column for column in table.columns if column.name not in existing]
+    for column in missing:
+        ddl = CreateColumn(column).compile(dialect=bind.dialect)
+        bind.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {ddl}")
+    return [column.name for column in missing]
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,131 @@
+"""Versioned schema migrations.
+
+``Base.metadata.create_all`` only creates missing tables, so changes to tables
+that already exist (new columns, indexes, constraints, backfills) are
+numbered steps here. ``schema_migrations`` records which steps a database has
+applied; ``upgrade`` runs the pending ones in order, each in its own
+transaction together with its bookkeeping row.
+
+A database created from scratch already matches the models and is only
+stamped. Steps must never be edited or reordered once released; append new
+ones to ``MIGRATIONS``.
+"""
+
+from datetime import datetime
+from typing import Callable, List, Set, Tuple
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, delete, func, inspect, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+import app.models as models
+from app.core.database import Base, add_missing_columns
+from app.services import dependency_graph, notifications, search, status_counts
+
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("name", String(100), nullable=False),
+    Column("applied_at", DateTime, nullable=False, default=datetime.utcnow),
+)
+
+
+def _create_indexes(connection: Connection, table: Table, *names: str) -> None:
+    """Create the model's indexes of the given names unless they exist already."""
+    indexes = {index.name: index for index in table.indexes}
+    for name in names:
+        indexes[name].create(connection, checkfirst=True)
+
+
+def _notification_context(connection: Connection) -> None:
+    add_missing_columns(connection, models.Notification.__table__)
+    _create_indexes(connection, models.Notification.__table__, "ix_notifications_recipient_read_created")
+    with Session(bind=connection) as db:
+        notifications.backfill_context(db)
+
+
+def _task_activity_history_index(connection: Connection) -> None:
+    _create_indexes(connection, models.TaskActivity.__table__, "ix_task_activities_project_user_created")
+
+
+def _foreign_key_indexes(connection: Connection) -> None:
+    _create_indexes(connection, models.Task.__table__, "ix_tasks_project_id")
+    _create_indexes(connection, models.Comment.__table__, "ix_comments_task_id", "ix_comments_parent_id")
+    _create_indexes(connection, models.task_assignees, "ix_task_assignees_user_id")
+    _create_indexes(connection, models.project_shared_users, "ix_project_shared_users_user_id")
+    _create_indexes(connection, models.TaskDependency.__table__, "ix_task_dependencies_depends_on_task_id")
+
+
+def _unique_dependency_edges(connection: Connection) -> None:
+    # Keep the oldest copy of each duplicated edge, then enforce uniqueness.
+    dependencies = models.TaskDependency.__table__
+    keep = select(func.min(dependencies.c.id)).group_by(
+        dependencies.c.dependent_task_id, dependencies.c.depends_on_task_id
+    )
+    connection.execute(delete(dependencies).where(dependencies.c.id.not_in(keep)))
+    _create_indexes(connection, dependencies, "uq_task_dependencies_edge")
+
+
+def _dependency_closure(connection: Connection) -> None:
+    dependency_graph.recreate(connection)
+
+
+def _project_status_counts(connection: Connection) -> None:
+    with Session(bind=connection) as db:
+        status_counts.rebuild(db)
+
+
+def _project_access_indexes(connection: Connection) -> None:
+    _create_indexes(connection, models.Project.__table__, "ix_projects_owner_id", "ix_projects_visibility")
+
+
+def _full_text_search(connection: Connection) -> None:
+    if connection.dialect.name != "sqlite":
+        return
+    search.create(connection)
+    search.rebuild(connection)
+
+
+# (version, name, step); versions are never reused.
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "notification_context", _notification_context),
+    (2, "task_activity_history_index", _task_activity_history_index),
+    (3, "foreign_key_indexes", _foreign_key_indexes),
+    (4, "unique_dependency_edges", _unique_dependency_edges),
+    (5, "dependency_closure", _dependency_closure),
+    (6, "project_status_counts", _project_status_counts),
+    (7, "full_text_search", _full_text_search),
+    (8, "project_access_indexes", _project_access_indexes),
+]
+
+
+def applied_versions(bind: Engine) -> Set[int]:
+    with bind.connect() as connection:
+        if not inspect(connection).has_table(schema_migrations.name):
+            return set()
+        return set(connection.execute(select(schema_migrations.c.version)).scalars())
+
+
+def _record(connection: Connection, version: int, name: str) -> None:
+    connection.execute(schema_migrations.insert().values(version=version, name=name, applied_at=datetime.utcnow()))
+
+
+def upgrade(bind: Engine) -> List[str]:
+    """Bring the database up to date; returns the names of the steps that ran."""
+    with bind.connect() as connection:
+        fresh = not inspect(connection).has_table(models.User.__tablename__)
+    Base.metadata.create_all(bind=bind)
+    schema_migrations.create(bind, checkfirst=True)
+
+    applied = applied_versions(bind)
+    ran = []
+    for version, name, step in MIGRATIONS:
+        if version in applied:
+            continue
+        with bind.begin() as connection:
+            if not fresh:
+                step(connection)
+                ran.append(name)
+            _record(connection, version, name)
+    return ran
@@ -2,8 +2,10 @@ from datetime import datetime
 from sqlalchemy import (
     Boolean,
     Column,
+    Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Table,
@@ -18,14 +20,14 @@ project_shared_users = Table(
     "project_shared_users",
     Base.metadata,
     Column("project_id", ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True),
-    Column("user_id", ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    Column("user_id", ForeignKey("users.id", ondelete="CASCADE"), primary_key=True, index=True),
 )
 
 task_assignees = Table(
     "task_assignees",
     Base.metadata,
     Column("task_id", ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True),
-    Column("user_id", ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    Column("user_id", ForeignKey("users.id", ondelete="CASCADE"), primary_key=True, index=True),
 )
 
 
@@ -65,9 +67,9 @@ class Project(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
     description = Column(Text, default="")
-    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    visibility = Column(String(20), default="all", nullable=False)
+    visibility = Column(String(20), default="all", nullable=False, index=True)
 
     owner = relationship("User", back_populates="projects")
     tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan")
@@ -86,7 +88,7 @@ class Task(Base):
     title = Column(String(150), nullable=False)
     description = Column(Text, default="")
     status = Column(String(50), default="new_task")
-    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
     due_date = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
@@ -113,10 +115,14 @@ class Task(Base):
 
 class TaskDependency(Base):
     __tablename__ = "task_dependencies"
+    __table_args__ = (
+        # One edge per pair; also serves lookups by dependent task.
+        Index("uq_task_dependencies_edge", "dependent_task_id", "depends_on_task_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     dependent_task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
-    depends_on_task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
+    depends_on_task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     dependent_task = relationship(
@@ -131,6 +137,47 @@ class TaskDependency(Base):
     )
 
 
+class TaskDependencyClosure(Base):
+    """Transitive closure of the dependency graph.
+
+    One row per (upstream ancestor, downstream descendant) pair connected by a
+    path, with the length of the shortest one as ``depth`` (1 for a direct
+    dependency). Maintained by ``app.services.dependency_graph``.
+    """
+
+    __tablename__ = "task_dependency_closure"
+    __table_args__ = (
+        Index("ix_task_dependency_closure_descendant", "descendant_id", "ancestor_id"),
+    )
+
+    ancestor_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    descendant_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    depth = Column(Integer, nullable=False, default=1)
+
+
+class ProjectStatusCount(Base):
+    """Number of tasks per status in each project, maintained by ``app.services.status_counts``."""
+
+    __tablename__ = "project_status_counts"
+
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    status = Column(String(50), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class ScopeVersion(Base):
+    """Monotonic change counter per cache scope (e.g. ``project:42``).
+
+    Bumped in the same transaction as the change it describes, so every worker
+    process can validate its in-memory caches with one query.
+    """
+
+    __tablename__ = "scope_versions"
+
+    scope = Column(String(64), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
 class Comment(Base):
     __tablename__ = "comments"
 
@@ -138,9 +185,9 @@ class Comment(Base):
     content = Column(Text, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     solved = Column(Boolean, default=False)
-    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
+    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False, index=True)
     author_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    parent_id = Column(Integer, ForeignKey("comments.id", ondelete="CASCADE"))
+    parent_id = Column(Integer, ForeignKey("comments.id", ondelete="CASCADE"), index=True)
 
     task = relationship("Task", back_populates="comments")
     author = relationship("User", back_populates="comments")
@@ -150,6 +197,10 @@ class Comment(Base):
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Serves unread counts, bulk mark-read and the newest-first inbox listing.
+        Index("ix_notifications_recipient_read_created", "recipient_id", "read", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     recipient_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -157,33 +208,24 @@ class Notification(Base):
     message = Column(String(255), nullable=False)
     read = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Context captured when the notification is created, so listing needs no joins.
+    # task_title and project_name are point-in-time copies: renaming or moving
+    # the task later does not update them. Read the task or project for current names.
+    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=True)
+    task_title = Column(String(150), nullable=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=True)
+    project_name = Column(String(100), nullable=True)
 
     recipient = relationship("User", back_populates="notifications", foreign_keys=[recipient_id])
     comment = relationship("Comment", back_populates="notifications")
 
-    @property
-    def task_id(self):
-        return self.comment.task_id if self.comment else None
-
-    @property
-    def task_title(self):
-        return self.comment.task.title if self.comment and self.comment.task else None
-
-    @property
-    def project_id(self):
-        if self.comment and self.comment.task:
-            return self.comment.task.project_id
-        return None
-
-    @property
-    def project_name(self):
-        if self.comment and self.comment.task and self.comment.task.project:
-            return self.comment.task.project.name
-        return None
-
 
 class TaskActivity(Base):
     __tablename__ = "task_activities"
+    __table_args__ = (
+        # Serves the per-user history range scan, its daily GROUP BY and newest-first paging.
+        Index("ix_task_activities_project_user_created", "project_id", "user_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     action = Column(String(50), nullable=False)
@@ -196,4 +238,19 @@ class TaskActivity(Base):
 
     user = relationship("User", back_populates="task_activities")
     project = relationship("Project", back_populates="task_activities")
-    task = relationship("Task")
\ No newline at end of file
+    task = relationship("Task")
+
+
+class TaskActivityRollup(Base):
+    """Per-day activity counts for history compacted out of ``task_activities``.
+
+    Maintained by ``app.services.activity_history``.
+    """
+
+    __tablename__ = "task_activity_rollups"
+
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    action = Column(String(50), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
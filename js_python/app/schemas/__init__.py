@@ -1,7 +1,9 @@
 from datetime import datetime
-from typing import Dict, List, Literal, Optional
+from typing import Annotated, Dict, List, Literal, Optional
 
-from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, WithJsonSchema, model_validator
+
+from app.core.config import TASK_BATCH_MAX_OPERATIONS
 
 
 class UserCreate(BaseModel):
@@ -15,10 +17,15 @@ class UserLogin(BaseModel):
     password: str
 
 
+# Addresses are validated once, on registration. Re-validating every stored
+# address on output cost more than the rest of a large task list.
+StoredEmail = Annotated[str, WithJsonSchema({"type": "string", "format": "email"})]
+
+
 class UserOut(BaseModel):
     id: int
     username: str
-    email: EmailStr
+    email: StoredEmail
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
@@ -85,6 +92,52 @@ class TaskOut(TaskBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class TaskPage(BaseModel):
+    items: List[TaskOut]
+    next_cursor: Optional[str] = None
+
+
+class TaskBatchOperation(BaseModel):
+    """One step of ``POST /tasks/batch``.
+
+    ``create`` takes ``task``; ``update`` takes ``task_id`` and ``changes``;
+    ``delete`` takes ``task_id``.
+    """
+
+    op: Literal["create", "update", "delete"]
+    task_id: Optional[int] = None
+    task: Optional[TaskCreate] = None
+    changes: Optional[TaskUpdate] = None
+
+    @model_validator(mode="after")
+    def check_operands(self) -> "TaskBatchOperation":
+        if self.op == "create" and (self.task is None or self.task_id is not None):
+            raise ValueError("'create' needs 'task' and no 'task_id'")
+        if self.op == "update" and (self.task_id is None or self.changes is None):
+            raise ValueError("'update' needs 'task_id' and 'changes'")
+        if self.op == "delete" and self.task_id is None:
+            raise ValueError("'delete' needs 'task_id'")
+        return self
+
+
+class TaskBatchRequest(BaseModel):
+    operations: List[TaskBatchOperation] = Field(..., min_length=1, max_length=TASK_BATCH_MAX_OPERATIONS)
+
+
+class TaskBatchResult(BaseModel):
+    """Outcome of one operation; ``status`` is the code the single-task endpoint would return."""
+
+    op: Literal["create", "update", "delete"]
+    status: int
+    task_id: Optional[int] = None
+    task: Optional[TaskOut] = None
+    detail: Optional[str] = None
+
+
+class TaskBatchResponse(BaseModel):
+    results: List[TaskBatchResult]
+
+
 class TaskSummary(BaseModel):
     id: int
     title: str
@@ -132,6 +185,21 @@ class DependencyMapOut(BaseModel):
     convergences: List[DependencyConvergenceOut]
 
 
+class DependencyNodeOut(TaskSummary):
+    level: int
+    position: int
+    x: float
+    y: float
+
+
+class ProjectDependencyMapOut(BaseModel):
+    nodes: List[DependencyNodeOut]
+    edges: List[DependencyEdgeOut]
+    levels: int
+    total_nodes: int
+    next_cursor: Optional[str] = None
+
+
 class CommentCreate(BaseModel):
     task_id: int
     content: str
@@ -154,6 +222,29 @@ class CommentOut(BaseModel):
 CommentOut.update_forward_refs()
 
 
+class CommentPage(BaseModel):
+    items: List[CommentOut]
+    next_cursor: Optional[str] = None
+
+
+class SearchHit(BaseModel):
+    kind: Literal["task", "comment"]
+    id: int
+    task_id: int
+    task_title: str
+    project_id: int
+    project_name: str
+    snippet: str
+    score: float
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SearchPage(BaseModel):
+    items: List[SearchHit]
+    next_cursor: Optional[str] = None
+
+
 class NotificationOut(BaseModel):
     id: int
     comment_id: int
@@ -168,9 +259,44 @@ class NotificationOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class NotificationPage(BaseModel):
+    items: List[NotificationOut]
+    next_cursor: Optional[str] = None
+
+
+class NotificationUnreadCount(BaseModel):
+    unread: int
+
+
+class NotificationBulkRead(BaseModel):
+    """Select notifications to mark read: all of them, an id list, or up to a cursor.
+
+    ``cursor`` takes a ``next_cursor`` from the paginated listing and marks that
+    position and everything older.
+    """
+
+    all: bool = False
+    ids: Optional[List[int]] = None
+    cursor: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_single_selector(self) -> "NotificationBulkRead":
+        selectors = [self.all, self.ids is not None, self.cursor is not None]
+        if sum(selectors) != 1:
+            raise ValueError("Provide exactly one of 'all', 'ids' or 'cursor'")
+        return self
+
+
+class NotificationBulkReadResult(BaseModel):
+    updated: int
+
+
+TaskActivityAction = Literal["created", "deleted", "status_changed"]
+
+
 class TaskActivityOut(BaseModel):
     id: int
-    action: Literal["created", "deleted", "status_changed"]
+    action: TaskActivityAction
     status: Optional[str] = None
     task_id: Optional[int] = None
     task_title: Optional[str] = None
@@ -179,6 +305,11 @@ class TaskActivityOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ProjectImportResult(BaseModel):
+    project_id: int
+    counts: Dict[str, int]
+
+
 class ProjectDashboardOut(BaseModel):
     project_id: int
     total_tasks: int
@@ -186,6 +317,12 @@ class ProjectDashboardOut(BaseModel):
     updated_at: datetime
 
 
+class TaskActivityPage(BaseModel):
+    items: List[TaskActivityOut]
+    next_cursor: Optional[str] = None
+
+
 class TaskHistoryResponse(BaseModel):
     activities: List[TaskActivityOut]
-    daily_counts: Dict[str, int]
\ No newline at end of file
+    daily_counts: Dict[str, int]
+    next_cursor: Optional[str] = None
\ No newline at end of file
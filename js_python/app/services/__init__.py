@@ -1,6 +1,33 @@
 """Service-layer exports."""
 
-from . import auth  # noqa: F401
-
-__all__ = ["auth"]
+from . import (  # noqa: F401
+    activity_history,
+    auth,
+    comment_threads,
+    dependency_graph,
+    dependency_map,
+    notifications,
+    pagination,
+    project_access,
+    project_transfer,
+    realtime,
+    search,
+    status_counts,
+    versions,
+)
 
+__all__ = [
+    "activity_history",
+    "auth",
+    "comment_threads",
+    "dependency_graph",
+    "dependency_map",
+    "notifications",
+    "pagination",
+    "project_access",
+    "project_transfer",
+    "realtime",
+    "search",
+    "status_counts",
+    "versions",
+]
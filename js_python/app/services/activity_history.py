@@ -0,0 +1,111 @@
+"""Task activity history with bounded raw storage.
+
+Raw ``task_activities`` rows are kept for ``TASK_ACTIVITY_RETENTION_DAYS``.
+``compact`` rolls older rows into per-day counts in ``task_activity_rollups``,
+keyed by ``(project_id, user_id, day, action)``, and deletes them in the same
+transaction. ``daily_counts`` merges both tables, so day-level history covers
+any range while only recent days keep their individual entries.
+"""
+
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import delete, event, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+import app.models as models
+from app.services import versions
+
+activities = models.TaskActivity.__table__
+rollups = models.TaskActivityRollup.__table__
+
+
+def _day_key(day_value) -> str:
+    # SQLite's date() yields "YYYY-MM-DD"; other backends return a date.
+    return day_value if isinstance(day_value, str) else day_value.isoformat()
+
+
+def range_filter(project_id: int, user_id: int, start_date: date, end_date: date):
+    """Filter for the raw activities of one user in a project over whole days."""
+    return (
+        models.TaskActivity.project_id == project_id,
+        models.TaskActivity.user_id == user_id,
+        models.TaskActivity.created_at >= datetime.combine(start_date, time.min),
+        models.TaskActivity.created_at <= datetime.combine(end_date, time.max),
+    )
+
+
+def daily_counts(db: Session, project_id: int, user_id: int, start_date: date, end_date: date) -> Dict[str, int]:
+    """Activities per day (``YYYY-MM-DD``) over the range, raw and rolled-up rows combined."""
+    day = func.date(models.TaskActivity.created_at)
+    totals: Counter = Counter()
+    raw = db.execute(
+        select(day, func.count(models.TaskActivity.id))
+        .where(*range_filter(project_id, user_id, start_date, end_date))
+        .group_by(day)
+    )
+    for day_value, count in raw:
+        totals[_day_key(day_value)] += count
+    rolled = db.execute(
+        select(rollups.c.day, func.sum(rollups.c.count))
+        .where(
+            rollups.c.project_id == project_id,
+            rollups.c.user_id == user_id,
+            rollups.c.day >= start_date,
+            rollups.c.day <= end_date,
+        )
+        .group_by(rollups.c.day)
+    )
+    for day_value, count in rolled:
+        totals[_day_key(day_value)] += count
+    return {key: totals[key] for key in sorted(totals)}
+
+
+def retention_cutoff(retention_days: int, now: Optional[datetime] = None) -> datetime:
+    """Start of the oldest day whose raw activities are kept.
+
+    Cutting at midnight keeps every day either fully raw or fully rolled up.
+    """
+    today = (now or datetime.utcnow()).date()
+    return datetime.combine(today - timedelta(days=retention_days), time.min)
+
+
+def compact(db: Session, before: datetime) -> Tuple[int, int]:
+    """Roll activities created before ``before`` into daily counts and purge them.
+
+    Returns ``(purged activities, rollup rows written)``. Runs again safely: a
+    day that already has a rollup row is added to.
+    """
+    connection = db.connection()
+    old = activities.c.created_at < before
+    day = func.date(activities.c.created_at)
+    per_day = (
+        select(activities.c.project_id, activities.c.user_id, day, activities.c.action, func.count())
+        .where(old)
+        .group_by(activities.c.project_id, activities.c.user_id, day, activities.c.action)
+    )
+    dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(rollups).from_select(["project_id", "user_id", "day", "action", "count"], per_day)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[rollups.c.project_id, rollups.c.user_id, rollups.c.day, rollups.c.action],
+        set_={"count": rollups.c.count + stmt.excluded.count},
+    )
+    project_ids = connection.execute(select(activities.c.project_id).where(old).distinct()).scalars().all()
+    rolled = connection.execute(stmt).rowcount
+    purged = connection.execute(delete(activities).where(old)).rowcount
+    # Purged entries drop out of the history responses these versions validate.
+    versions.bump(connection, [versions.project_scope(project_id) for project_id in project_ids])
+    return purged, rolled
+
+
+@event.listens_for(models.Project, "after_delete")
+def _on_project_delete(mapper, connection, target: models.Project) -> None:
+    # Raw activities go with the project through the ORM cascade; rollups have no relationship.
+    connection.execute(delete(rollups).where(rollups.c.project_id == target.id))
+
+
+@event.listens_for(models.User, "after_delete")
+def _on_user_delete(mapper, connection, target: models.User) -> None:
+    connection.execute(delete(rollups).where(rollups.c.user_id == target.id))
@@ -1,21 +1,36 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
 
 import app.models as models
-from app.core.database import get_db
+from app.core import config
+from app.core.database import get_async_db, get_db
 
 SECRET_KEY = "CHANGE_ME_SECRET"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24
 
-pwd_context = CryptContext(schemes=["bcrypt_sha256"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt_sha256"],
+    deprecated="auto",
+    bcrypt_sha256__rounds=config.PASSWORD_HASH_ROUNDS,
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
+
+T = TypeVar("T")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -26,6 +41,53 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Return True when a stored hash was made with a different cost factor."""
+    return pwd_context.needs_update(hashed_password)
+
+
+class PasswordHashPool:
+    """Dedicated, size-limited executor for bcrypt work.
+
+    At most ``workers`` hashes run at once and at most ``queue_limit`` more may
+    wait; beyond that callers get a 503 instead of piling up, so a login burst
+    cannot starve the threadpool that serves the rest of the API.
+    """
+
+    def __init__(self, workers: int, queue_limit: int):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._slots = threading.BoundedSemaphore(workers + queue_limit)
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        if not self._slots.acquire(blocking=False):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication is busy, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return await asyncio.wrap_future(future)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self.run(verify_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        return await self.run(get_password_hash, password)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_password_hash_pool(request: Request) -> PasswordHashPool:
+    """The pool owned by the running application (see ``create_app``)."""
+    return request.app.state.password_hash_pool
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
@@ -33,21 +95,163 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> models.User:
-    credentials_exception = HTTPException(
+class PrincipalCache:
+    """Bounded LRU cache of authenticated users keyed by access token.
+
+    Entries hold a column snapshot of the user rather than the ORM instance, so
+    they never leak across sessions. An entry lives for ``ttl_seconds`` or until
+    the token expires, whichever comes first, and is evicted when a change to
+    its user commits. The cache is process-local: with several workers, a
+    change committed through one of them reaches the others only when their
+    entries expire, so ``ttl_seconds`` bounds that staleness.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Return the cached user snapshot for a token, counting the hit or miss."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None and entry[0] <= now:
+                del self._entries[token]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, token: str, user: models.User, token_expires_at: float) -> None:
+        """Remember the user a token resolved to."""
+        snapshot = {column.key: getattr(user, column.key) for column in models.User.__table__.columns}
+        expires_at = min(time.time() + self.ttl_seconds, token_expires_at)
+        with self._lock:
+            self._entries[token] = (expires_at, snapshot)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop every cached token that resolves to the given user."""
+        with self._lock:
+            stale = [token for token, (_, snapshot) in self._entries.items() if snapshot["id"] == user_id]
+            for token in stale:
+                del self._entries[token]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+principal_cache = PrincipalCache(
+    max_entries=config.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=config.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+_CHANGED_USERS = "principal_cache_changed_user_ids"
+
+
+@event.listens_for(models.User, "after_update")
+@event.listens_for(models.User, "after_delete")
+def _remember_changed_user(mapper, connection, target: models.User) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_CHANGED_USERS, set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_cached_principals(session: Session) -> None:
+    # Only committed changes evict: a rolled-back update leaves the cached
+    # snapshot as correct as the row it was taken from.
+    for user_id in session.info.pop(_CHANGED_USERS, ()):
+        principal_cache.invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session: Session) -> None:
+    session.info.pop(_CHANGED_USERS, None)
+
+
+def _snapshot_user(snapshot: Dict[str, Any]) -> models.User:
+    """Rebuild a detached user from a cached snapshot, ready for merge(load=False)."""
+    user = models.User(**snapshot)
+    make_transient_to_detached(user)
+    return user
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _decode_token(token: str) -> Tuple[str, float]:
+    """Return the username and expiry timestamp carried by a valid access token."""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
         if username is None:
-            raise credentials_exception
+            raise _credentials_exception()
     except JWTError as exc:
-        raise credentials_exception from exc
+        raise _credentials_exception() from exc
+    return username, float(payload.get("exp", 0))
+
+
+def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> models.User:
+    cached = principal_cache.get(token)
+    if cached is not None:
+        return db.merge(_snapshot_user(cached), load=False)
 
+    username, expires_at = _decode_token(token)
     user = db.query(models.User).filter(models.User.username == username).first()
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
+    principal_cache.put(token, user, expires_at)
+    return user
+
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)
+) -> models.User:
+    """``get_current_user`` for handlers running on the asyncio session."""
+    cached = principal_cache.get(token)
+    if cached is not None:
+        return await db.merge(_snapshot_user(cached), load=False)
+
+    username, expires_at = _decode_token(token)
+    user = await db.scalar(select(models.User).where(models.User.username == username))
+    if user is None:
+        raise _credentials_exception()
+    principal_cache.put(token, user, expires_at)
     return user
+
+
+async def get_streaming_user(
+    db: AsyncSession = Depends(get_async_db),
+    header_token: Optional[str] = Depends(optional_oauth2_scheme),
+    access_token: Optional[str] = None,
+) -> models.User:
+    """Authenticate a long-lived stream request.
+
+    Browsers' ``EventSource`` cannot send headers, so the token may also be
+    passed as the ``access_token`` query parameter.
+    """
+    token = header_token or access_token
+    if not token:
+        raise _credentials_exception()
+    return await get_current_user_async(db=db, token=token)
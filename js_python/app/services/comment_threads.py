@@ -0,0 +1,51 @@
+"""Comment threads assembled in memory.
+
+``Comment.replies`` is a lazy backref, so serializing a thread node by node
+issues one query per comment. ``attach_replies`` instead loads every reply
+below a set of top-level comments (with authors) in a single recursive query
+and fills in ``replies`` on each loaded comment, so rendering a task's
+comments costs the same number of statements however long its threads are.
+"""
+
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import literal, select
+from sqlalchemy.orm import Session, contains_eager
+from sqlalchemy.orm.attributes import set_committed_value
+
+import app.models as models
+
+
+def attach_replies(db: Session, roots: Sequence[models.Comment], depth: Optional[int] = None) -> None:
+    """Populate ``replies`` below ``roots``, down to ``depth`` levels (all when ``None``).
+
+    Comments on the last included level get an empty ``replies`` list.
+    """
+    comments = models.Comment
+    loaded: List[models.Comment] = list(roots)
+    root_ids = [root.id for root in roots]
+    if root_ids and depth != 0:
+        tree = (
+            select(comments.id, literal(1).label("depth"))
+            .where(comments.parent_id.in_(root_ids))
+            .cte("reply_tree", recursive=True)
+        )
+        step = select(comments.id, tree.c.depth + 1).join(tree, comments.parent_id == tree.c.id)
+        if depth is not None:
+            step = step.where(tree.c.depth < depth)
+        tree = tree.union_all(step)
+        loaded += db.scalars(
+            select(comments)
+            .join(tree, tree.c.id == comments.id)
+            .join(comments.author)
+            .options(contains_eager(comments.author))
+            .order_by(comments.created_at, comments.id)
+        ).all()
+
+    children: Dict[int, List[models.Comment]] = defaultdict(list)
+    for comment in loaded[len(root_ids):]:
+        children[comment.parent_id].append(comment)
+    for comment in loaded:
+        # Set as loaded state so the lazy backref never fires during serialization.
+        set_committed_value(comment, "replies", children.get(comment.id, []))
@@ -0,0 +1,287 @@
+"""Incrementally maintained transitive closure of task dependencies.
+
+An edge ``TaskDependency(depends_on_task_id=u, dependent_task_id=v)`` points
+from the upstream task ``u`` to the downstream task ``v``. For every pair of
+tasks connected by a path, ``task_dependency_closure`` stores one row with
+the length of the shortest such path as ``depth``, which makes cycle checks
+and upstream/downstream queries single indexed lookups.
+
+Adding ``u -> v`` connects ``u`` and its ancestors to ``v`` and its
+descendants. Removing it can only disconnect (or lengthen the paths of)
+those same pairs, so exactly that rectangle is deleted and recomputed from
+the remaining edges: the shortest remaining path from ``a`` to ``d`` has a
+last task ``x`` that still reaches ``u``, followed by an edge ``x -> y``,
+and the pairs ``(a, x)`` and ``(y, d)`` lie outside the rectangle, so their
+rows are still exact.
+
+Edges inserted or deleted through the ORM unit of work (including cascades
+from task and project deletion) are applied by mapper events in the same
+transaction. Bulk Core inserts bypass those events; callers must call
+``add_edge`` or ``add_isolated_edges`` themselves, or run ``rebuild``.
+"""
+
+from collections import defaultdict, deque
+from typing import Collection, Dict, Iterable, List, Set, Tuple
+
+from sqlalchemy import Integer, case, delete, event, exists, func, insert, literal, or_, select, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session, object_session
+
+import app.models as models
+
+closure = models.TaskDependencyClosure.__table__
+dependencies = models.TaskDependency.__table__
+
+# (ancestor_id, descendant_id) -> length of the shortest path
+Depths = Dict[Tuple[int, int], int]
+Edge = Tuple[int, int]
+
+# Session.info key: edges deleted in the current flush whose closure update
+# has not run yet. They still count as edges when an earlier one is removed.
+_PENDING_DELETES = "pending_dependency_deletes"
+
+
+def _ancestors(connection: Connection, task_id: int) -> List[Tuple[int, int]]:
+    """(ancestor, depth) for every task upstream of ``task_id``, itself included."""
+    rows = connection.execute(
+        select(closure.c.ancestor_id, closure.c.depth).where(closure.c.descendant_id == task_id)
+    ).all()
+    return [(task_id, 0), *rows]
+
+
+def _descendants(connection: Connection, task_id: int) -> List[Tuple[int, int]]:
+    """(descendant, depth) for every task downstream of ``task_id``, itself included."""
+    rows = connection.execute(
+        select(closure.c.descendant_id, closure.c.depth).where(closure.c.ancestor_id == task_id)
+    ).all()
+    return [(task_id, 0), *rows]
+
+
+def _edge_depths(connection: Connection, upstream_id: int, downstream_id: int) -> Depths:
+    """Shortest paths that run through the edge ``upstream_id -> downstream_id``."""
+    descendants = _descendants(connection, downstream_id)
+    return {
+        (ancestor, descendant): up_depth + 1 + down_depth
+        for ancestor, up_depth in _ancestors(connection, upstream_id)
+        for descendant, down_depth in descendants
+    }
+
+
+def _literal(value: int):
+    return literal(value, Integer)
+
+
+def _insert_depths(connection: Connection, depths: Depths) -> None:
+    if not depths:
+        return
+    dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(closure)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[closure.c.ancestor_id, closure.c.descendant_id],
+        set_={
+            "depth": case(
+                (closure.c.depth <= stmt.excluded.depth, closure.c.depth),
+                else_=stmt.excluded.depth,
+            )
+        },
+    )
+    connection.execute(
+        stmt,
+        [{"ancestor_id": a, "descendant_id": d, "depth": depth} for (a, d), depth in depths.items()],
+    )
+
+
+def add_edge(connection: Connection, upstream_id: int, downstream_id: int) -> None:
+    """Record a new edge in the closure."""
+    _insert_depths(connection, _edge_depths(connection, upstream_id, downstream_id))
+
+
+def remove_edge(
+    connection: Connection, upstream_id: int, downstream_id: int, pending: Collection[Edge] = ()
+) -> None:
+    """Withdraw an edge that is no longer in ``task_dependencies`` from the closure.
+
+    Every pair (upstream_id or one of its ancestors, downstream_id or one of
+    its descendants) is deleted and recomputed from the remaining edges plus
+    ``pending``, the edges deleted in the same flush that are still in the
+    closure.
+    """
+    upstream = select(closure.c.ancestor_id).where(closure.c.descendant_id == upstream_id)
+    downstream = select(closure.c.descendant_id).where(closure.c.ancestor_id == downstream_id)
+    connection.execute(
+        delete(closure).where(
+            or_(closure.c.ancestor_id == upstream_id, closure.c.ancestor_id.in_(upstream)),
+            or_(closure.c.descendant_id == downstream_id, closure.c.descendant_id.in_(downstream)),
+        )
+    )
+
+    # (ancestor, x, depth) for every x that reaches upstream_id, and
+    # (y, descendant, depth) for every descendant of downstream_id; the
+    # zero-length rows let the path start or end at the edge itself.
+    heads = union_all(
+        select(closure.c.ancestor_id, closure.c.descendant_id.label("via_id"), closure.c.depth).where(
+            or_(closure.c.descendant_id == upstream_id, closure.c.descendant_id.in_(upstream))
+        ),
+        select(closure.c.ancestor_id, closure.c.ancestor_id, _literal(0)).where(
+            closure.c.descendant_id == upstream_id
+        ),
+        select(_literal(upstream_id), _literal(upstream_id), _literal(0)),
+    ).subquery()
+    tails = union_all(
+        select(closure.c.ancestor_id.label("via_id"), closure.c.descendant_id, closure.c.depth).where(
+            or_(closure.c.descendant_id == downstream_id, closure.c.descendant_id.in_(downstream))
+        ),
+        select(closure.c.descendant_id, closure.c.descendant_id, _literal(0)).where(
+            closure.c.ancestor_id == downstream_id
+        ),
+        select(_literal(downstream_id), _literal(downstream_id), _literal(0)),
+    ).subquery()
+    edges = union_all(
+        select(dependencies.c.depends_on_task_id, dependencies.c.dependent_task_id),
+        *(select(_literal(a), _literal(b)) for a, b in pending),
+    ).subquery()
+    recomputed = (
+        select(heads.c.ancestor_id, tails.c.descendant_id, func.min(heads.c.depth + 1 + tails.c.depth))
+        .select_from(
+            heads.join(edges, edges.c.depends_on_task_id == heads.c.via_id).join(
+                tails, tails.c.via_id == edges.c.dependent_task_id
+            )
+        )
+        .group_by(heads.c.ancestor_id, tails.c.descendant_id)
+    )
+    connection.execute(insert(closure).from_select(["ancestor_id", "descendant_id", "depth"], recomputed))
+
+
+def _pending_deletes(target) -> Set[Edge]:
+    session = object_session(target)
+    if session is None:
+        return set()
+    return session.info.setdefault(_PENDING_DELETES, set())
+
+
+@event.listens_for(models.TaskDependency, "after_insert")
+def _on_dependency_insert(mapper, connection, target: models.TaskDependency) -> None:
+    add_edge(connection, target.depends_on_task_id, target.dependent_task_id)
+
+
+@event.listens_for(models.TaskDependency, "before_delete")
+def _on_dependency_deleting(mapper, connection, target: models.TaskDependency) -> None:
+    # The unit of work deletes all edges of a flush before any after_delete runs.
+    _pending_deletes(target).add((target.depends_on_task_id, target.dependent_task_id))
+
+
+@event.listens_for(models.TaskDependency, "after_delete")
+def _on_dependency_delete(mapper, connection, target: models.TaskDependency) -> None:
+    pending = _pending_deletes(target)
+    pending.discard((target.depends_on_task_id, target.dependent_task_id))
+    remove_edge(connection, target.depends_on_task_id, target.dependent_task_id, pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_deletes(session: Session) -> None:
+    session.info.pop(_PENDING_DELETES, None)
+
+
+def would_create_cycle(db: Session, depends_on_task_id: int, dependent_task_id: int) -> bool:
+    """Return True if adding ``depends_on -> dependent`` would close a cycle.
+
+    That happens exactly when the dependent task already reaches the task it
+    would depend on, which is one primary-key prefix lookup.
+    """
+    if depends_on_task_id == dependent_task_id:
+        return True
+    return bool(
+        db.scalar(
+            select(
+                exists().where(
+                    closure.c.ancestor_id == dependent_task_id,
+                    closure.c.descendant_id == depends_on_task_id,
+                )
+            )
+        )
+    )
+
+
+def upstream_task_ids(db: Session, task_id: int) -> Set[int]:
+    """Every task the given task depends on, directly or transitively."""
+    return set(db.scalars(select(closure.c.ancestor_id).where(closure.c.descendant_id == task_id)))
+
+
+def downstream_task_ids(db: Session, task_id: int) -> Set[int]:
+    """Every task that depends on the given task, directly or transitively."""
+    return set(db.scalars(select(closure.c.descendant_id).where(closure.c.ancestor_id == task_id)))
+
+
+def closure_of_edges(edges: Iterable[Edge]) -> Depths:
+    """Compute the closure of an acyclic edge list in memory (topological order)."""
+    parents: Dict[int, List[int]] = defaultdict(list)
+    children: Dict[int, List[int]] = defaultdict(list)
+    indegree: Dict[int, int] = defaultdict(int)
+    nodes: Set[int] = set()
+    for upstream, downstream in edges:
+        parents[downstream].append(upstream)
+        children[upstream].append(downstream)
+        indegree[downstream] += 1
+        nodes.update((upstream, downstream))
+
+    queue = deque(node for node in nodes if indegree[node] == 0)
+    upstream_depths: Dict[int, Dict[int, int]] = {}
+    depths: Depths = {}
+    visited = 0
+    while queue:
+        node = queue.popleft()
+        visited += 1
+        reach: Dict[int, int] = {}
+        for parent in parents[node]:
+            reach[parent] = 1
+        for parent in parents[node]:
+            for ancestor, depth in upstream_depths[parent].items():
+                if depth + 1 < reach.get(ancestor, depth + 2):
+                    reach[ancestor] = depth + 1
+        upstream_depths[node] = reach
+        for ancestor, depth in reach.items():
+            depths[(ancestor, node)] = depth
+        for child in children[node]:
+            indegree[child] -= 1
+            if indegree[child] == 0:
+                queue.append(child)
+
+    if visited != len(nodes):
+        raise ValueError("Dependency graph contains a cycle; cannot build its closure")
+    return depths
+
+
+def add_isolated_edges(connection: Connection, edges: Iterable[Edge]) -> int:
+    """Record edges among tasks that have no other dependencies yet, e.g. a freshly imported project.
+
+    Computed in memory in one pass instead of two lookups per edge. Raises
+    ValueError if the edges contain a cycle; returns the closure row count.
+    """
+    depths = closure_of_edges(edges)
+    _insert_depths(connection, depths)
+    return len(depths)
+
+
+def rebuild(db: Session) -> int:
+    """Recompute the whole closure from ``task_dependencies``; returns the row count."""
+    edges = db.execute(
+        select(models.TaskDependency.depends_on_task_id, models.TaskDependency.dependent_task_id)
+    ).all()
+    depths = closure_of_edges(edges)
+    connection = db.connection()
+    connection.execute(delete(closure))
+    _insert_depths(connection, depths)
+    return len(depths)
+
+
+def recreate(connection: Connection) -> int:
+    """Drop, recreate and rebuild the closure table; returns the row count.
+
+    The table holds only derived data, so this also brings a table created by
+    an older schema to the current shape.
+    """
+    closure.drop(connection, checkfirst=True)
+    closure.create(connection)
+    with Session(bind=connection) as db:
+        return rebuild(db)
@@ -0,0 +1,365 @@
+"""Dependency map assembly backed by per-project graph caches.
+
+The map a user sees is the union of the graphs of every project they can
+access. Each project's task summaries and incoming edges are cached together
+with the ``project:<id>`` version they were loaded at (see
+``app.services.versions``). A request reloads only projects whose version moved.
+
+Chains and convergences are computed per cluster: a set of projects linked by
+cross-project edges. A cluster's result depends only on its own projects, so
+a change in one project re-derives just the cluster that contains it.
+
+Project-scoped views get a server-side layered layout (``graph_layout``),
+cached per project version, root task and depth so paging through it is cheap.
+"""
+
+import bisect
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, contains_eager
+
+import app.models as models
+import app.schemas as schemas
+from app.core.config import DEPENDENCY_MAP_CACHE_MAX_MAPS, DEPENDENCY_MAP_CACHE_MAX_PROJECTS
+from app.services.graph_layout import Adjacency, Edge, layered_layout, neighbourhood
+
+# (version, task summaries by id, edges whose dependent task lives in the project)
+ProjectGraph = Tuple[int, Dict[int, schemas.TaskSummary], List[Edge]]
+Chains = List[List[int]]
+Convergences = List[Tuple[int, List[int]]]
+
+
+def task_summary(task: models.Task) -> schemas.TaskSummary:
+    """Build a display-friendly summary object for the provided task."""
+    project_name = task.project.name if task.project else "Unknown"
+    return schemas.TaskSummary(
+        id=task.id,
+        title=task.title,
+        project_id=task.project_id,
+        project_name=project_name,
+    )
+
+
+def derive_structure(task_ids: List[int], edges: List[Edge]) -> Tuple[Chains, Convergences]:
+    """Find linear chains and convergences (tasks with several prerequisites).
+
+    ``task_ids`` must contain both endpoints of every edge.
+    """
+    graph = Adjacency(task_ids, edges)
+    indegree, outdegree = graph.indegree, graph.outdegree
+    adjacency, reverse_adj = graph.adjacency, graph.reverse_adj
+
+    chains: Chains = []
+    visited_nodes: Set[int] = set()  # Tracks nodes already part of a chain
+
+    for task_id in task_ids:
+        if task_id in visited_nodes:
+            continue
+
+        # A "chain head" is a node that is NOT a "middle" link.
+        # A "middle" link is: indegree == 1 AND its predecessor also has outdegree == 1
+        is_middle_link = False
+        if indegree[task_id] == 1:
+            predecessor_id = reverse_adj[task_id][0]
+            if outdegree[predecessor_id] == 1:
+                is_middle_link = True
+
+        # Only start tracing from a true head that has exactly one dependent.
+        if not is_middle_link and outdegree[task_id] == 1:
+            chain_ids = [task_id]
+            visited_nodes.add(task_id)
+            current = task_id
+
+            while outdegree[current] == 1:
+                nxt = adjacency[current][0]
+                # The chain continues only while the next node is also a linear link;
+                # a convergence (indegree > 1) ends it.
+                if indegree[nxt] != 1 or nxt in chain_ids:
+                    break
+                chain_ids.append(nxt)
+                visited_nodes.add(nxt)
+                current = nxt
+
+            if len(chain_ids) > 1:
+                chains.append(chain_ids)
+
+    convergences: Convergences = [
+        (task_id, reverse_adj[task_id]) for task_id in task_ids if len(reverse_adj[task_id]) > 1
+    ]
+    return chains, convergences
+
+
+def map_etag(project_versions: Dict[int, int]) -> str:
+    """Strong validator for the map built from exactly these project versions."""
+    key = ",".join(f"{project_id}:{version}" for project_id, version in sorted(project_versions.items()))
+    return '"depmap-' + hashlib.sha1(key.encode()).hexdigest()[:20] + '"'
+
+
+def _load_projects(db: Session, project_ids: List[int]) -> Dict[int, Tuple[Dict[int, schemas.TaskSummary], List[Edge]]]:
+    graphs = {project_id: ({}, []) for project_id in project_ids}
+    tasks = (
+        db.query(models.Task)
+        .join(models.Task.project)
+        .options(contains_eager(models.Task.project))
+        .filter(models.Task.project_id.in_(project_ids))
+        .order_by(models.Task.id)
+    )
+    for task in tasks:
+        graphs[task.project_id][0][task.id] = task_summary(task)
+    edges = db.execute(
+        select(
+            models.TaskDependency.id,
+            models.TaskDependency.depends_on_task_id,
+            models.TaskDependency.dependent_task_id,
+            models.Task.project_id,
+        )
+        .join(models.Task, models.TaskDependency.dependent_task_id == models.Task.id)
+        .where(models.Task.project_id.in_(project_ids))
+        .order_by(models.TaskDependency.id)
+    )
+    for edge_id, upstream, downstream, project_id in edges:
+        graphs[project_id][1].append((edge_id, upstream, downstream))
+    return graphs
+
+
+class ProjectLayout:
+    """Laid-out nodes of one project graph in (level, position) order."""
+
+    def __init__(self, summaries: Dict[int, schemas.TaskSummary], adjacency: Adjacency, edges: List[Edge]):
+        placement = layered_layout(adjacency)
+        order = sorted(placement, key=lambda task_id: placement[task_id][:2])
+        self.levels = max((level for level, _, _, _ in placement.values()), default=-1) + 1
+        self.keys: List[Tuple[int, int]] = [placement[task_id][:2] for task_id in order]
+        self.nodes = [
+            schemas.DependencyNodeOut(
+                **summaries[task_id].model_dump(),
+                level=placement[task_id][0],
+                position=placement[task_id][1],
+                x=placement[task_id][2],
+                y=placement[task_id][3],
+            )
+            for task_id in order
+        ]
+        self.incoming: Dict[int, List[schemas.DependencyEdgeOut]] = {}
+        for edge_id, upstream, downstream in edges:
+            self.incoming.setdefault(downstream, []).append(
+                schemas.DependencyEdgeOut(id=edge_id, depends_on=summaries[upstream], dependent=summaries[downstream])
+            )
+
+    def page(
+        self, after: Optional[Tuple[int, int]], limit: int
+    ) -> Tuple[List[schemas.DependencyNodeOut], List[schemas.DependencyEdgeOut], bool]:
+        """Nodes following ``after``, the edges into them, and whether more nodes remain.
+
+        Upstream tasks always sit on a lower level, so every edge's source has
+        been sent on this page or an earlier one.
+        """
+        start = bisect.bisect_right(self.keys, after) if after is not None else 0
+        nodes = self.nodes[start:start + limit]
+        edges = [edge for node in nodes for edge in self.incoming.get(node.id, [])]
+        return nodes, edges, start + limit < len(self.nodes)
+
+
+class DependencyMapCache:
+    """Process-local cache of project graphs, cluster structure and whole maps.
+
+    All entries are keyed by the versions they were computed from, so stale
+    entries are simply never hit again and age out of the LRU.
+    """
+
+    def __init__(self, max_projects: int, max_maps: int):
+        self.max_projects = max_projects
+        self.max_maps = max_maps
+        self.project_loads = 0
+        self.cluster_builds = 0
+        self._projects: "OrderedDict[int, ProjectGraph]" = OrderedDict()
+        self._clusters: "OrderedDict[Tuple[Tuple[int, int], ...], Tuple[Chains, Convergences]]" = OrderedDict()
+        self._maps: "OrderedDict[Tuple[int, ...], Tuple[str, schemas.DependencyMapOut]]" = OrderedDict()
+        self._layouts: "OrderedDict[Tuple[int, int, Optional[int], Optional[int]], ProjectLayout]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _remember(entries: OrderedDict, key, value, limit: int) -> None:
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > limit:
+            entries.popitem(last=False)
+
+    def _lookup(self, entries: OrderedDict, key):
+        with self._lock:
+            value = entries.get(key)
+            if value is not None:
+                entries.move_to_end(key)
+            return value
+
+    def get_map(self, db: Session, project_versions: Dict[int, int]) -> Tuple[str, schemas.DependencyMapOut]:
+        """Return ``(etag, map)`` for the given accessible projects and their versions."""
+        etag = map_etag(project_versions)
+        map_key = tuple(sorted(project_versions))
+        cached = self._lookup(self._maps, map_key)
+        if cached is not None and cached[0] == etag:
+            return cached
+
+        graphs = self._project_graphs(db, project_versions)
+        dependency_map = self._assemble(project_versions, graphs)
+        with self._lock:
+            self._remember(self._maps, map_key, (etag, dependency_map), self.max_maps)
+        return etag, dependency_map
+
+    def project_layout(
+        self,
+        db: Session,
+        project_id: int,
+        version: int,
+        root_task_id: Optional[int] = None,
+        depth: Optional[int] = None,
+    ) -> Optional[ProjectLayout]:
+        """Layout of the project's own tasks and the edges between them.
+
+        With ``root_task_id`` only tasks within ``depth`` hops of the root (in
+        either direction) are kept. Returns None if the root is not in the project.
+        """
+        key = (project_id, version, root_task_id, depth)
+        cached = self._lookup(self._layouts, key)
+        if cached is not None:
+            return cached
+
+        _, summaries, project_edges = self._project_graphs(db, {project_id: version})[project_id]
+        edges = [edge for edge in project_edges if edge[1] in summaries]
+        adjacency = Adjacency(sorted(summaries), edges)
+        if root_task_id is not None:
+            if root_task_id not in summaries:
+                return None
+            keep = neighbourhood(adjacency, root_task_id, depth)
+            edges = [edge for edge in edges if edge[1] in keep and edge[2] in keep]
+            adjacency = Adjacency(sorted(keep), edges)
+        layout = ProjectLayout(summaries, adjacency, edges)
+        with self._lock:
+            self._remember(self._layouts, key, layout, self.max_maps)
+        return layout
+
+    def _project_graphs(self, db: Session, project_versions: Dict[int, int]) -> Dict[int, ProjectGraph]:
+        graphs: Dict[int, ProjectGraph] = {}
+        stale: List[int] = []
+        with self._lock:
+            for project_id, version in project_versions.items():
+                graph = self._projects.get(project_id)
+                if graph is not None and graph[0] == version:
+                    self._projects.move_to_end(project_id)
+                    graphs[project_id] = graph
+                else:
+                    stale.append(project_id)
+        if stale:
+            loaded = _load_projects(db, stale)
+            with self._lock:
+                self.project_loads += len(stale)
+                for project_id in stale:
+                    graph = (project_versions[project_id], *loaded[project_id])
+                    graphs[project_id] = graph
+                    self._remember(self._projects, project_id, graph, self.max_projects)
+        return graphs
+
+    def _assemble(
+        self, project_versions: Dict[int, int], graphs: Dict[int, ProjectGraph]
+    ) -> schemas.DependencyMapOut:
+        summaries: Dict[int, schemas.TaskSummary] = {}
+        for project_id in sorted(graphs):
+            summaries.update(graphs[project_id][1])
+
+        # Group projects linked by visible cross-project edges (union-find).
+        parent: Dict[int, int] = {project_id: project_id for project_id in graphs}
+
+        def find(project_id: int) -> int:
+            while parent[project_id] != project_id:
+                parent[project_id] = parent[parent[project_id]]
+                project_id = parent[project_id]
+            return project_id
+
+        edges: List[Edge] = []
+        for project_id in sorted(graphs):
+            for edge in graphs[project_id][2]:
+                if edge[1] not in summaries:
+                    continue  # upstream task lives in a project the user cannot see
+                edges.append(edge)
+                upstream_root, downstream_root = find(summaries[edge[1]].project_id), find(project_id)
+                if upstream_root != downstream_root:
+                    parent[max(upstream_root, downstream_root)] = min(upstream_root, downstream_root)
+        edges.sort()
+
+        clusters: Dict[int, List[int]] = {}
+        for project_id in sorted(graphs):
+            clusters.setdefault(find(project_id), []).append(project_id)
+        cluster_edges: Dict[int, List[Edge]] = {root: [] for root in clusters}
+        for edge in edges:
+            cluster_edges[find(summaries[edge[2]].project_id)].append(edge)
+
+        chains: Chains = []
+        convergences: Convergences = []
+        for root, project_ids in clusters.items():
+            cluster_chains, cluster_convergences = self._cluster_structure(
+                project_ids, project_versions, graphs, cluster_edges[root]
+            )
+            chains.extend(cluster_chains)
+            convergences.extend(cluster_convergences)
+        chains.sort(key=lambda chain: chain[0])
+        convergences.sort(key=lambda convergence: convergence[0])
+
+        return schemas.DependencyMapOut(
+            tasks=[summaries[task_id] for task_id in sorted(summaries)],
+            edges=[
+                schemas.DependencyEdgeOut(id=edge_id, depends_on=summaries[upstream], dependent=summaries[downstream])
+                for edge_id, upstream, downstream in edges
+            ],
+            chains=[schemas.DependencyChainOut(tasks=[summaries[task_id] for task_id in chain]) for chain in chains],
+            convergences=[
+                schemas.DependencyConvergenceOut(
+                    target=summaries[target], sources=[summaries[source] for source in sources]
+                )
+                for target, sources in convergences
+            ],
+        )
+
+    def _cluster_structure(
+        self,
+        project_ids: List[int],
+        project_versions: Dict[int, int],
+        graphs: Dict[int, ProjectGraph],
+        edges: List[Edge],
+    ) -> Tuple[Chains, Convergences]:
+        key = tuple((project_id, project_versions[project_id]) for project_id in project_ids)
+        cached: Optional[Tuple[Chains, Convergences]] = self._lookup(self._clusters, key)
+        if cached is not None:
+            return cached
+        task_ids = sorted(task_id for project_id in project_ids for task_id in graphs[project_id][1])
+        structure = derive_structure(task_ids, edges)
+        with self._lock:
+            self.cluster_builds += 1
+            self._remember(self._clusters, key, structure, self.max_projects)
+        return structure
+
+    def clear(self) -> None:
+        with self._lock:
+            self._projects.clear()
+            self._clusters.clear()
+            self._maps.clear()
+            self._layouts.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "project_loads": self.project_loads,
+                "cluster_builds": self.cluster_builds,
+                "projects": len(self._projects),
+                "maps": len(self._maps),
+                "layouts": len(self._layouts),
+            }
+
+
+dependency_map_cache = DependencyMapCache(
+    max_projects=DEPENDENCY_MAP_CACHE_MAX_PROJECTS,
+    max_maps=DEPENDENCY_MAP_CACHE_MAX_MAPS,
+)
@@ -0,0 +1,86 @@
+"""Helpers for the task/project context stored on notifications."""
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+import app.models as models
+from app.services import versions
+
+
+def notification_context(task: Optional[models.Task], project: Optional[models.Project]) -> Dict[str, object]:
+    """Column values that denormalize a comment's task and project onto a notification."""
+    return {
+        "task_id": task.id if task else None,
+        "task_title": task.title if task else None,
+        "project_id": project.id if project else None,
+        "project_name": project.name if project else None,
+    }
+
+
+def notify_mentions(
+    db: Session,
+    comment: models.Comment,
+    author: models.User,
+    recipients: Iterable[models.User],
+    task: Optional[models.Task],
+    project: Optional[models.Project],
+) -> List[models.Notification]:
+    """Insert one notification per mentioned user in a single statement.
+
+    Recipients are deduplicated and the author is skipped. The comment must be
+    flushed already; nothing is committed.
+    """
+    recipient_ids = sorted({user.id for user in recipients} - {author.id})
+    if not recipient_ids:
+        return []
+    location_bits = []
+    if project:
+        location_bits.append(f"project '{project.name}'")
+    if task:
+        location_bits.append(f"task '{task.title}'")
+    location = " in " + ", ".join(location_bits) if location_bits else ""
+    shared = {
+        "comment_id": comment.id,
+        "message": f"{author.username} mentioned you{location}",
+        "read": False,
+        "created_at": datetime.utcnow(),
+        **notification_context(task, project),
+    }
+    rows = [{"recipient_id": recipient_id, **shared} for recipient_id in recipient_ids]
+    notifications = list(db.scalars(insert(models.Notification).returning(models.Notification), rows))
+    # The Core insert skips the mapper events that normally bump these.
+    versions.bump(db.connection(), [versions.user_scope(recipient_id) for recipient_id in recipient_ids])
+    return notifications
+
+
+def backfill_context(db: Session) -> int:
+    """Fill the context columns of notifications created before they existed.
+
+    Runs as one UPDATE with correlated subqueries and returns the row count.
+    """
+    task_id = (
+        select(models.Comment.task_id)
+        .where(models.Comment.id == models.Notification.comment_id)
+        .scalar_subquery()
+    )
+    task_row = select(models.Task).where(models.Task.id == task_id)
+    project_row = (
+        select(models.Project)
+        .join(models.Task, models.Task.project_id == models.Project.id)
+        .where(models.Task.id == task_id)
+    )
+    result = db.execute(
+        update(models.Notification)
+        .where(models.Notification.task_id.is_(None))
+        .values(
+            task_id=task_id,
+            task_title=task_row.with_only_columns(models.Task.title).scalar_subquery(),
+            project_id=task_row.with_only_columns(models.Task.project_id).scalar_subquery(),
+            project_name=project_row.with_only_columns(models.Project.name).scalar_subquery(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
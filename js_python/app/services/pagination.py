@@ -0,0 +1,103 @@
+"""Opaque keyset (cursor) pagination ordered on ``(created_at, id)``.
+
+Layout pages use the same token format over ``(level, position)``, and
+search pages, ordered by relevance, over a plain offset.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query
+
+
+def _encode(key: list) -> str:
+    raw = json.dumps(key).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode(cursor: str, parse):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return parse(*json.loads(base64.urlsafe_b64decode(padded.encode())))
+    except (binascii.Error, TypeError, ValueError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Serialize the sort key of the last row on a page into an opaque token."""
+    return _encode([created_at.isoformat(), row_id])
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Parse a token produced by ``encode_cursor`` or reject it with a 400."""
+    return _decode(cursor, lambda created_at, row_id: (datetime.fromisoformat(created_at), int(row_id)))
+
+
+def encode_position_cursor(level: int, position: int) -> str:
+    """Token for the last node on a layout page."""
+    return _encode([level, position])
+
+
+def decode_position_cursor(cursor: str) -> Tuple[int, int]:
+    """Parse a token produced by ``encode_position_cursor`` or reject it with a 400."""
+    return _decode(cursor, lambda level, position: (int(level), int(position)))
+
+
+def encode_offset_cursor(offset: int) -> str:
+    """Token for the position after the last row of a relevance-ordered page."""
+    return _encode([offset])
+
+
+def decode_offset_cursor(cursor: str) -> int:
+    """Parse a token produced by ``encode_offset_cursor`` or reject it with a 400."""
+    return _decode(cursor, lambda offset: max(int(offset), 0))
+
+
+def at_or_before_cursor(model, cursor: str):
+    """Filter matching the cursor's row and every row that sorts after it (older)."""
+    created_at, row_id = decode_cursor(cursor)
+    return or_(
+        model.created_at < created_at,
+        and_(model.created_at == created_at, model.id <= row_id),
+    )
+
+
+def _keyset_page(query, model, limit: int, cursor: Optional[str]):
+    """Apply the cursor filter, keyset ordering and look-ahead limit to a query or select."""
+    created_col, id_col = model.created_at, model.id
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(
+            or_(created_col < created_at, and_(created_col == created_at, id_col < row_id))
+        )
+    return query.order_by(None).order_by(created_col.desc(), id_col.desc()).limit(limit + 1)
+
+
+def _split_page(rows: List, limit: int) -> Tuple[List, Optional[str]]:
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+
+
+def paginate(query: Query, model, limit: int, cursor: Optional[str] = None) -> Tuple[List, Optional[str]]:
+    """Return one newest-first page of ``query`` and the cursor for the next page.
+
+    ``model`` must expose ``created_at`` and ``id`` columns; any ordering already
+    applied to the query is replaced by the keyset ordering.
+    """
+    return _split_page(_keyset_page(query, model, limit, cursor).all(), limit)
+
+
+async def paginate_async(
+    db: AsyncSession, stmt: Select, model, limit: int, cursor: Optional[str] = None
+) -> Tuple[List, Optional[str]]:
+    """``paginate`` for a ``select()`` statement executed on an ``AsyncSession``."""
+    rows = (await db.scalars(_keyset_page(stmt, model, limit, cursor))).all()
+    return _split_page(list(rows), limit)
@@ -0,0 +1,88 @@
+"""Per-user cache of the projects each user may see.
+
+A user sees the projects they own, every project with ``visibility == "all"``
+and the ``"selected"`` projects shared with them. The set is computed once and
+kept with the versions of the two scopes it depends on (see
+``app.services.versions``): ``public-projects``, bumped when a public project
+appears or disappears, and the user's own ``access:<id>``, bumped when a
+project they own or share is created, deleted, handed over, shared or
+unshared, or changes visibility. The bumps happen in the same transaction as
+the change, so a stale set is never served, in this or any other worker
+process, while edits that do not affect access (a description, a rename)
+leave every cached set valid. Access checks become set lookups and list
+queries a plain ``project_id IN (...)`` instead of an OR/EXISTS filter.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import FrozenSet, Optional, Tuple
+
+from sqlalchemy import select, union
+from sqlalchemy.orm import Session
+
+import app.models as models
+from app.core.config import PROJECT_ACCESS_CACHE_MAX_USERS
+from app.services import versions
+
+
+def load_visible_project_ids(db: Session, user_id: int) -> FrozenSet[int]:
+    """Query the ids of the projects ``user_id`` may see.
+
+    One indexed SELECT per access path, combined with UNION.
+    """
+    shares = models.project_shared_users
+    owned = select(models.Project.id).where(models.Project.owner_id == user_id)
+    public = select(models.Project.id).where(models.Project.visibility == "all")
+    shared = (
+        select(models.Project.id)
+        .join(shares, shares.c.project_id == models.Project.id)
+        .where(shares.c.user_id == user_id, models.Project.visibility == "selected")
+    )
+    return frozenset(db.scalars(union(owned, public, shared)))
+
+
+def access_scopes(user_id: int) -> Tuple[str, str]:
+    """The version scopes a user's visible project set depends on."""
+    return versions.PUBLIC_PROJECTS_SCOPE, versions.access_scope(user_id)
+
+
+class ProjectAccessCache:
+    """Bounded LRU of visible project ids per user, keyed by the user's ``access_scopes`` versions."""
+
+    def __init__(self, max_users: int):
+        self.max_users = max_users
+        self.loads = 0
+        self._entries: "OrderedDict[int, Tuple[Tuple[int, int], FrozenSet[int]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def visible_project_ids(
+        self, db: Session, user_id: int, version: Optional[Tuple[int, int]] = None
+    ) -> FrozenSet[int]:
+        """Ids of the projects the user may see, reloaded only when a version moved.
+
+        Pass ``version`` if the caller has just read the ``access_scopes``
+        versions, in that order.
+        """
+        if version is None:
+            current = versions.current(db, access_scopes(user_id))
+            version = tuple(current[scope] for scope in access_scopes(user_id))
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(user_id)
+                return entry[1]
+        project_ids = load_visible_project_ids(db, user_id)
+        with self._lock:
+            self.loads += 1
+            self._entries[user_id] = (version, project_ids)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+        return project_ids
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+project_access_cache = ProjectAccessCache(max_users=PROJECT_ACCESS_CACHE_MAX_USERS)
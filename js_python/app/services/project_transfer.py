@@ -0,0 +1,511 @@
+"""NDJSON export and import of whole projects.
+
+An export is one JSON object per line, each with a ``type``::
+
+    header          {"format": "dsbp-project", "version": 1}
+    project         name, description, visibility, created_at, shared_users
+    task            id, title, description, status, due_date, created_at
+    assignee        task_id, username
+    dependency      dependent_task_id, depends_on_task_id, created_at
+    comment         id, task_id, parent_id, author, content, solved, created_at
+    activity        task_id, task_title, user, action, status, created_at
+    activity_rollup user, day, action, count
+
+Records appear in that order, so every id a record refers to has been seen
+before. Users are referred to by username. Dependencies on tasks outside the
+project are not exported.
+
+``export_lines`` reads with ``yield_per`` and ``ProjectImporter`` inserts in
+chunks with Core executemany ``INSERT``s. Memory stays flat apart from the
+old-id to new-id maps. Core inserts bypass the mapper events, so the importer
+maintains the dependency closure, status counts and cache versions itself.
+"""
+
+import json
+from collections import Counter
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Literal, Optional, Set, Tuple, Type
+
+from pydantic import BaseModel, NonNegativeInt, StrictInt, ValidationError
+from sqlalchemy import func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, aliased
+
+import app.models as models
+from app.core.config import PROJECT_TRANSFER_CHUNK_SIZE
+from app.schemas import TaskActivityAction
+from app.services import dependency_graph, status_counts, versions
+
+FORMAT = "dsbp-project"
+VERSION = 1
+MEDIA_TYPE = "application/x-ndjson"
+
+tasks = models.Task.__table__
+dependencies = models.TaskDependency.__table__
+comments = models.Comment.__table__
+activities = models.TaskActivity.__table__
+rollups = models.TaskActivityRollup.__table__
+users = models.User.__table__
+task_assignees = models.task_assignees
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+# One encoder for the whole export; json.dumps(default=...) would build one per line.
+_encoder = json.JSONEncoder(default=_json_default)
+
+
+def _line(record_type: str, **fields) -> str:
+    return _encoder.encode({"type": record_type, **fields}) + "\n"
+
+
+def export_lines(session_factory: Callable[[], Session], project_id: int) -> Iterator[str]:
+    """Yield the NDJSON lines of one project, reading every table in chunks.
+
+    Opens its own session so it can outlive the request's; all reads share
+    one transaction and therefore one snapshot.
+    """
+    with session_factory() as db:
+
+        def rows(statement):
+            return db.execute(statement.execution_options(yield_per=PROJECT_TRANSFER_CHUNK_SIZE))
+
+        project = db.get(models.Project, project_id)
+        if project is None:
+            return
+        yield _line("header", format=FORMAT, version=VERSION)
+        yield _line(
+            "project",
+            name=project.name,
+            description=project.description,
+            visibility=project.visibility,
+            created_at=project.created_at,
+            shared_users=sorted(user.username for user in project.shared_users),
+        )
+
+        in_project = tasks.c.project_id == project_id
+        for row in rows(
+            select(
+                tasks.c.id,
+                tasks.c.title,
+                tasks.c.description,
+                tasks.c.status,
+                tasks.c.due_date,
+                tasks.c.created_at,
+            )
+            .where(in_project)
+            .order_by(tasks.c.id)
+        ):
+            yield _line("task", **row._asdict())
+
+        for task_id, username in rows(
+            select(task_assignees.c.task_id, users.c.username)
+            .join(tasks, tasks.c.id == task_assignees.c.task_id)
+            .join(users, users.c.id == task_assignees.c.user_id)
+            .where(in_project)
+            .order_by(task_assignees.c.task_id, users.c.username)
+        ):
+            yield _line("assignee", task_id=task_id, username=username)
+
+        upstream = aliased(models.Task)
+        for row in rows(
+            select(dependencies.c.dependent_task_id, dependencies.c.depends_on_task_id, dependencies.c.created_at)
+            .join(tasks, tasks.c.id == dependencies.c.dependent_task_id)
+            .join(upstream, upstream.id == dependencies.c.depends_on_task_id)
+            .where(in_project, upstream.project_id == project_id)
+            .order_by(dependencies.c.id)
+        ):
+            yield _line("dependency", **row._asdict())
+
+        # Ordered by id, so a reply always follows the comment it answers.
+        for row in rows(
+            select(
+                comments.c.id,
+                comments.c.task_id,
+                comments.c.parent_id,
+                users.c.username.label("author"),
+                comments.c.content,
+                comments.c.solved,
+                comments.c.created_at,
+            )
+            .join(tasks, tasks.c.id == comments.c.task_id)
+            .join(users, users.c.id == comments.c.author_id)
+            .where(in_project)
+            .order_by(comments.c.id)
+        ):
+            yield _line("comment", **row._asdict())
+
+        for row in rows(
+            select(
+                activities.c.task_id,
+                activities.c.task_title,
+                users.c.username.label("user"),
+                activities.c.action,
+                activities.c.status,
+                activities.c.created_at,
+            )
+            .join(users, users.c.id == activities.c.user_id)
+            .where(activities.c.project_id == project_id)
+            .order_by(activities.c.id)
+        ):
+            yield _line("activity", **row._asdict())
+
+        for row in rows(
+            select(users.c.username.label("user"), rollups.c.day, rollups.c.action, rollups.c.count)
+            .join(users, users.c.id == rollups.c.user_id)
+            .where(rollups.c.project_id == project_id)
+            .order_by(rollups.c.day, rollups.c.user_id, rollups.c.action)
+        ):
+            yield _line("activity_rollup", **row._asdict())
+
+
+# Shapes of the imported records. Fields the importer checks itself (names,
+# titles, referenced ids) are optional here so its messages stay specific.
+
+
+class ProjectRecord(BaseModel):
+    name: Optional[str] = None
+    description: Optional[str] = None
+    visibility: Optional[Literal["all", "private", "selected"]] = None
+    created_at: Optional[datetime] = None
+    shared_users: Optional[List[Optional[str]]] = None
+
+
+class TaskRecord(BaseModel):
+    id: StrictInt
+    title: Optional[str] = None
+    description: Optional[str] = None
+    status: Optional[str] = None
+    due_date: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+
+
+class AssigneeRecord(BaseModel):
+    task_id: Optional[StrictInt] = None
+    username: Optional[str] = None
+
+
+class DependencyRecord(BaseModel):
+    dependent_task_id: Optional[StrictInt] = None
+    depends_on_task_id: Optional[StrictInt] = None
+    created_at: Optional[datetime] = None
+
+
+class CommentRecord(BaseModel):
+    id: StrictInt
+    task_id: Optional[StrictInt] = None
+    parent_id: Optional[StrictInt] = None
+    author: Optional[str] = None
+    content: Optional[str] = None
+    solved: Optional[bool] = None
+    created_at: Optional[datetime] = None
+
+
+class ActivityRecord(BaseModel):
+    task_id: Optional[StrictInt] = None
+    task_title: Optional[str] = None
+    user: Optional[str] = None
+    action: TaskActivityAction
+    status: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
+class ActivityRollupRecord(BaseModel):
+    user: Optional[str] = None
+    day: date
+    action: TaskActivityAction
+    count: NonNegativeInt = 0
+
+
+RECORDS: Dict[str, Type[BaseModel]] = {
+    "project": ProjectRecord,
+    "task": TaskRecord,
+    "assignee": AssigneeRecord,
+    "dependency": DependencyRecord,
+    "comment": CommentRecord,
+    "activity": ActivityRecord,
+    "activity_rollup": ActivityRollupRecord,
+}
+
+
+class ProjectImporter:
+    """Recreate an exported project as a new project owned by ``owner``.
+
+    Feed the export's lines in order, then call ``finish``; the caller owns
+    ``db`` and commits or rolls back. Unknown usernames are mapped to the
+    owner (comment authors, activities) or dropped (assignees, shared users).
+    Malformed input raises ValueError naming the offending line.
+    """
+
+    def __init__(self, db: Session, owner: models.User, name: Optional[str] = None):
+        self.db = db
+        self.owner_id = owner.id
+        self.name = name
+        self.project_id: Optional[int] = None
+        self.counts: Counter = Counter()
+        self.line_number = 0
+        self._task_ids: Dict[int, int] = {}
+        self._comment_ids: Dict[int, int] = {}
+        self._user_ids: Dict[str, Optional[int]] = {owner.username: owner.id}
+        self._statuses: Counter = Counter()
+        self._edges: List[Tuple[int, int]] = []
+        self._pending_type: Optional[str] = None
+        self._pending: List[dict] = []
+        self._pending_comment_ids: Set[int] = set()
+        self._header_seen = False
+
+    # -- input ---------------------------------------------------------------
+
+    def feed_lines(self, lines: Iterable[bytes]) -> None:
+        for raw in lines:
+            self.line_number += 1
+            if not raw.strip():
+                continue
+            try:
+                record = json.loads(raw)
+            except ValueError:
+                raise ValueError(f"Line {self.line_number}: not valid JSON") from None
+            if not isinstance(record, dict):
+                raise ValueError(f"Line {self.line_number}: expected a JSON object")
+            self.feed(record)
+
+    def feed(self, record: dict) -> None:
+        record_type = record.get("type")
+        if not self._header_seen:
+            if record_type != "header" or record.get("format") != FORMAT or record.get("version") != VERSION:
+                raise ValueError(f"Line {self.line_number}: expected a {FORMAT} version {VERSION} header")
+            self._header_seen = True
+            return
+        if record_type == "project":
+            if self.project_id is not None:
+                raise ValueError(f"Line {self.line_number}: more than one project record")
+            self._create_project(self._validate(record_type, record))
+            return
+        if self.project_id is None:
+            raise ValueError(f"Line {self.line_number}: the project record must come first")
+        if record_type not in self._FLUSHERS:
+            raise ValueError(f"Line {self.line_number}: unknown record type {record_type!r}")
+
+        record = self._validate(record_type, record)
+        if record_type != self._pending_type:
+            self._flush()
+            self._pending_type = record_type
+        elif record_type == "comment" and record.get("parent_id") in self._pending_comment_ids:
+            self._flush()  # the parent needs its new id first
+            self._pending_type = record_type
+        record["_line"] = self.line_number
+        self._pending.append(record)
+        if record_type == "comment":
+            self._pending_comment_ids.add(record["id"])
+        if len(self._pending) >= PROJECT_TRANSFER_CHUNK_SIZE:
+            self._flush()
+
+    def finish(self) -> Dict[str, int]:
+        """Write what is still buffered and the derived rows; returns record counts by type."""
+        if self.project_id is None:
+            raise ValueError("The export contains no project record")
+        self._flush()
+        connection = self.db.connection()
+        try:
+            dependency_graph.add_isolated_edges(connection, self._edges)
+        except ValueError:
+            raise ValueError("The exported dependencies contain a cycle") from None
+        status_counts.apply_deltas(
+            connection,
+            {(self.project_id, status): count for status, count in self._statuses.items()},
+        )
+        # Core inserts skipped the mapper events that normally bump this.
+        versions.bump(connection, [versions.project_scope(self.project_id), versions.comments_scope(self.project_id)])
+        return dict(self.counts)
+
+    # -- helpers -------------------------------------------------------------
+
+    def _validate(self, record_type: str, record: dict) -> dict:
+        """Check the field types of a record; returns its fields with defaults filled in."""
+        try:
+            return RECORDS[record_type].model_validate(record).model_dump()
+        except ValidationError as exc:
+            error = exc.errors()[0]
+            field = ".".join(str(part) for part in error["loc"])
+            message = f"invalid {record_type} field {field!r}: {error['msg']}"
+            raise ValueError(f"Line {self.line_number}: {message}") from None
+
+    def _fail(self, record: dict, message: str) -> None:
+        raise ValueError(f"Line {record['_line']}: {message}")
+
+    def _resolve_users(self, usernames: Iterable[Optional[str]]) -> None:
+        missing = {username for username in usernames if username and username not in self._user_ids}
+        if not missing:
+            return
+        found = dict(self.db.execute(select(users.c.username, users.c.id).where(users.c.username.in_(missing))).all())
+        for username in missing:
+            self._user_ids[username] = found.get(username)
+
+    def _task_id(self, record: dict, key: str) -> int:
+        task_id = self._task_ids.get(record.get(key))
+        if task_id is None:
+            self._fail(record, f"unknown task id {record.get(key)!r} in {key!r}")
+        return task_id
+
+    def _create_project(self, record: dict) -> None:
+        if not record.get("name") and not self.name:
+            raise ValueError(f"Line {self.line_number}: the project needs a name")
+        shared = [username for username in record.get("shared_users") or [] if username]
+        self._resolve_users(shared)
+        visibility = record.get("visibility") or "all"
+        if visibility not in ("all", "private", "selected"):
+            raise ValueError(f"Line {self.line_number}: unknown visibility {visibility!r}")
+        project = models.Project(
+            name=self.name or record["name"],
+            description=record.get("description") or "",
+            visibility=visibility,
+            owner_id=self.owner_id,
+        )
+        shared_ids = {self._user_ids[username] for username in shared} - {None, self.owner_id}
+        if visibility == "selected" and shared_ids:
+            project.shared_users = self.db.query(models.User).filter(models.User.id.in_(shared_ids)).all()
+        self.db.add(project)
+        self.db.flush()
+        self.project_id = project.id
+        self.counts["project"] += 1
+
+    def _flush(self) -> None:
+        pending, record_type = self._pending, self._pending_type
+        self._pending = []
+        self._pending_comment_ids = set()
+        if pending:
+            self._FLUSHERS[record_type](self, pending)
+            self.counts[record_type] += len(pending)
+
+    def _insert_returning_ids(self, table, rows: List[dict]) -> List[int]:
+        connection = self.db.connection()
+        if connection.dialect.name != "sqlite":
+            statement = insert(table).returning(table.c.id, sort_by_parameter_order=True)
+            return list(connection.execute(statement, rows).scalars())
+        # SQLite cannot batch an ordered RETURNING and would insert row by row.
+        # The project insert already took the database write lock, so the
+        # next ids are ours to assign.
+        start = (connection.scalar(select(func.max(table.c.id))) or 0) + 1
+        ids = list(range(start, start + len(rows)))
+        connection.execute(insert(table), [{**row, "id": new_id} for row, new_id in zip(rows, ids)])
+        return ids
+
+    def _flush_tasks(self, records: List[dict]) -> None:
+        rows = []
+        for record in records:
+            if not record.get("title"):
+                self._fail(record, "a task needs a title")
+            if record["id"] in self._task_ids:
+                self._fail(record, f"duplicate task id {record['id']!r}")
+            rows.append(
+                {
+                    "project_id": self.project_id,
+                    "title": record["title"],
+                    "description": record.get("description") or "",
+                    "status": record.get("status"),
+                    "due_date": record["due_date"],
+                    "created_at": record["created_at"] or datetime.utcnow(),
+                }
+            )
+        for record, new_id in zip(records, self._insert_returning_ids(tasks, rows)):
+            self._task_ids[record["id"]] = new_id
+            self._statuses[status_counts.status_key(record.get("status"))] += 1
+
+    def _flush_assignees(self, records: List[dict]) -> None:
+        self._resolve_users(record.get("username") for record in records)
+        rows = []
+        for record in records:
+            user_id = self._user_ids.get(record.get("username"))
+            task_id = self._task_id(record, "task_id")
+            if user_id is not None:
+                rows.append({"task_id": task_id, "user_id": user_id})
+        if rows:
+            self.db.connection().execute(insert(task_assignees), rows)
+
+    def _flush_dependencies(self, records: List[dict]) -> None:
+        rows = []
+        for record in records:
+            edge = (self._task_id(record, "depends_on_task_id"), self._task_id(record, "dependent_task_id"))
+            self._edges.append(edge)
+            rows.append(
+                {
+                    "depends_on_task_id": edge[0],
+                    "dependent_task_id": edge[1],
+                    "created_at": record["created_at"] or datetime.utcnow(),
+                }
+            )
+        self.db.connection().execute(insert(dependencies), rows)
+
+    def _flush_comments(self, records: List[dict]) -> None:
+        self._resolve_users(record.get("author") for record in records)
+        rows = []
+        for record in records:
+            parent_id = record.get("parent_id")
+            if parent_id is not None and parent_id not in self._comment_ids:
+                self._fail(record, f"unknown parent comment {parent_id!r}")
+            if not record.get("content"):
+                self._fail(record, "a comment needs content")
+            rows.append(
+                {
+                    "task_id": self._task_id(record, "task_id"),
+                    "parent_id": self._comment_ids[parent_id] if parent_id is not None else None,
+                    "author_id": self._user_ids.get(record.get("author")) or self.owner_id,
+                    "content": record["content"],
+                    "solved": bool(record.get("solved")),
+                    "created_at": record["created_at"] or datetime.utcnow(),
+                }
+            )
+        for record, new_id in zip(records, self._insert_returning_ids(comments, rows)):
+            self._comment_ids[record["id"]] = new_id
+
+    def _flush_activities(self, records: List[dict]) -> None:
+        self._resolve_users(record.get("user") for record in records)
+        rows = []
+        for record in records:
+            rows.append(
+                {
+                    "project_id": self.project_id,
+                    "user_id": self._user_ids.get(record.get("user")) or self.owner_id,
+                    # Activities of deleted tasks keep their title but lose the link.
+                    "task_id": self._task_ids.get(record.get("task_id")),
+                    "task_title": record.get("task_title"),
+                    "action": record["action"],
+                    "status": record.get("status"),
+                    "created_at": record["created_at"] or datetime.utcnow(),
+                }
+            )
+        self.db.connection().execute(insert(activities), rows)
+
+    def _flush_rollups(self, records: List[dict]) -> None:
+        self._resolve_users(record.get("user") for record in records)
+        totals: Counter = Counter()
+        for record in records:
+            user_id = self._user_ids.get(record.get("user")) or self.owner_id
+            totals[(user_id, record["day"], record["action"])] += record["count"]
+        connection = self.db.connection()
+        dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+        statement = dialect.insert(rollups)
+        statement = statement.on_conflict_do_update(
+            index_elements=[rollups.c.project_id, rollups.c.user_id, rollups.c.day, rollups.c.action],
+            set_={"count": rollups.c.count + statement.excluded.count},
+        )
+        connection.execute(
+            statement,
+            [
+                {"project_id": self.project_id, "user_id": user_id, "day": day, "action": action, "count": count}
+                for (user_id, day, action), count in totals.items()
+            ],
+        )
+
+    _FLUSHERS = {
+        "task": _flush_tasks,
+        "assignee": _flush_assignees,
+        "dependency": _flush_dependencies,
+        "comment": _flush_comments,
+        "activity": _flush_activities,
+        "activity_rollup": _flush_rollups,
+    }
@@ -0,0 +1,115 @@
+"""Pub/sub hub that pushes notification deltas to connected clients.
+
+The hub talks to a ``Broker``. ``InProcessBroker`` fans messages out to the
+subscribers of this worker only; deployments running several workers can
+plug in a broker backed by Redis or similar via ``notification_hub.set_broker``.
+"""
+
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Any, Dict, Optional, Set
+
+from app.core import config
+
+Message = Dict[str, Any]
+
+
+class Subscription:
+    """A bounded per-client message queue bound to the subscriber's event loop."""
+
+    def __init__(self, broker: "Broker", channel: str, maxsize: int):
+        self.broker = broker
+        self.channel = channel
+        self._loop = asyncio.get_running_loop()
+        self._queue: "asyncio.Queue[Message]" = asyncio.Queue(maxsize=maxsize)
+
+    def deliver(self, message: Message) -> None:
+        """Hand a message over from any thread; the oldest one is dropped when full."""
+        self._loop.call_soon_threadsafe(self._put, message)
+
+    def _put(self, message: Message) -> None:
+        if self._queue.full():
+            self._queue.get_nowait()
+        self._queue.put_nowait(message)
+
+    async def get(self, timeout: float) -> Optional[Message]:
+        """Wait for the next message, returning None if ``timeout`` elapses first."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class Broker(ABC):
+    """Transport that carries messages from publishers to channel subscribers."""
+
+    @abstractmethod
+    def publish(self, channel: str, message: Message) -> None:
+        """Send a message to every subscriber of ``channel``; safe to call from any thread."""
+
+    @abstractmethod
+    def subscribe(self, channel: str) -> Subscription:
+        """Register a subscriber; must be called from the subscriber's event loop."""
+
+    @abstractmethod
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Stop delivering messages to ``subscription``."""
+
+
+class InProcessBroker(Broker):
+    """Broker that only reaches subscribers connected to the current process."""
+
+    def __init__(self, queue_size: int = config.NOTIFICATION_STREAM_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, channel: str, message: Message) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            subscription.deliver(message)
+
+    def subscribe(self, channel: str) -> Subscription:
+        subscription = Subscription(self, channel, self.queue_size)
+        with self._lock:
+            self._subscribers[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.channel]
+
+
+class NotificationHub:
+    """Routes notification events to per-user channels on the configured broker."""
+
+    def __init__(self, broker: Broker):
+        self.broker = broker
+
+    def set_broker(self, broker: Broker) -> None:
+        self.broker = broker
+
+    @staticmethod
+    def channel_for(user_id: int) -> str:
+        return f"notifications:user:{user_id}"
+
+    def publish(self, user_id: int, event: str, data: Any) -> None:
+        """Send a JSON-serializable ``data`` payload to one user as ``event``."""
+        self.broker.publish(self.channel_for(user_id), {"event": event, "data": data})
+
+    def subscribe(self, user_id: int) -> Subscription:
+        return self.broker.subscribe(self.channel_for(user_id))
+
+
+notification_hub = NotificationHub(InProcessBroker())
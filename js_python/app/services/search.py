@@ -0,0 +1,160 @@
+"""Full-text search over task titles/descriptions and comment content.
+
+Two SQLite FTS5 tables index ``tasks`` and ``comments`` as external content,
+so the text itself is not stored twice. Triggers keep them in sync with every
+write, including the Core bulk inserts of batches and project imports that
+bypass ORM events. The tables and triggers are created with the schema
+(``Base.metadata.create_all``); existing databases get them, and a full index
+build, from a migration.
+
+Search is SQLite-only; other backends have no FTS5 tables.
+"""
+
+import html
+import re
+from typing import List, Optional
+
+from sqlalchemy import DDL, Select, column, event, func, literal, literal_column, select, table, union_all
+from sqlalchemy.engine import Connection
+
+import app.models as models
+from app.core.database import Base
+
+TASK_INDEX = "task_search"
+COMMENT_INDEX = "comment_search"
+
+_TOKENIZE = "unicode61 remove_diacritics 2"
+
+_CREATE = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {TASK_INDEX} USING fts5("
+    f"title, description, content='tasks', content_rowid='id', tokenize='{_TOKENIZE}')",
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {COMMENT_INDEX} USING fts5("
+    f"content, content='comments', content_rowid='id', tokenize='{_TOKENIZE}')",
+    # External-content tables are told about removals with the old column values.
+    f"""CREATE TRIGGER IF NOT EXISTS tasks_search_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO {TASK_INDEX}(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS tasks_search_delete AFTER DELETE ON tasks BEGIN
+        INSERT INTO {TASK_INDEX}({TASK_INDEX}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS tasks_search_update AFTER UPDATE OF title, description ON tasks BEGIN
+        INSERT INTO {TASK_INDEX}({TASK_INDEX}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {TASK_INDEX}(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS comments_search_insert AFTER INSERT ON comments BEGIN
+        INSERT INTO {COMMENT_INDEX}(rowid, content) VALUES (new.id, new.content);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS comments_search_delete AFTER DELETE ON comments BEGIN
+        INSERT INTO {COMMENT_INDEX}({COMMENT_INDEX}, rowid, content) VALUES ('delete', old.id, old.content);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS comments_search_update AFTER UPDATE OF content ON comments BEGIN
+        INSERT INTO {COMMENT_INDEX}({COMMENT_INDEX}, rowid, content) VALUES ('delete', old.id, old.content);
+        INSERT INTO {COMMENT_INDEX}(rowid, content) VALUES (new.id, new.content);
+    END""",
+]
+
+_DROP = [f"DROP TABLE IF EXISTS {TASK_INDEX}", f"DROP TABLE IF EXISTS {COMMENT_INDEX}"]
+
+for _statement in _CREATE:
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+for _statement in _DROP:
+    event.listen(Base.metadata, "before_drop", DDL(_statement).execute_if(dialect="sqlite"))
+
+
+def create(connection: Connection) -> None:
+    """Create the index tables and triggers unless they exist."""
+    for statement in _CREATE:
+        connection.exec_driver_sql(statement)
+
+
+def rebuild(connection: Connection) -> None:
+    """Re-read every task and comment into the indexes."""
+    for index in (TASK_INDEX, COMMENT_INDEX):
+        connection.exec_driver_sql(f"INSERT INTO {index}({index}) VALUES ('rebuild')")
+
+
+_TERM = re.compile(r"(\w+)(\*?)")
+
+
+def match_expression(text: str) -> Optional[str]:
+    """Turn user input into an FTS5 query: every word must match, ``word*`` matches a prefix.
+
+    Words are quoted, so FTS5 operators and column filters in the input are
+    treated as plain text. Returns ``None`` when the input has no words.
+    """
+    terms: List[str] = [f'"{word}"{star}' for word, star in _TERM.findall(text)]
+    return " ".join(terms) or None
+
+
+# FTS5 brackets each match with these; ``highlight`` escapes the text first and
+# only then turns them into <mark> tags. Private-use code points, so ordinary
+# text never contains them.
+_MATCH_START = "\ue000"
+_MATCH_END = "\ue001"
+
+
+def highlight(snippet: str) -> str:
+    """HTML for a raw snippet: the task or comment text escaped, matches wrapped in ``<mark>``."""
+    return html.escape(snippet).replace(_MATCH_START, "<mark>").replace(_MATCH_END, "</mark>")
+
+
+task_index = table(TASK_INDEX, column("rowid"))
+comment_index = table(COMMENT_INDEX, column("rowid"))
+
+
+def _hits(index, weights, snippet_column: int) -> tuple:
+    name = literal_column(index.name)
+    return (
+        name.op("MATCH"),
+        func.bm25(name, *weights).label("score"),
+        func.snippet(name, snippet_column, _MATCH_START, _MATCH_END, "…", 12).label("snippet"),
+    )
+
+
+def statement(match: str, access_filter) -> Select:
+    """Matching tasks and comments in accessible projects, best match first.
+
+    ``access_filter`` is a condition on ``Project``, such as ``Project.id.in_(accessible ids)``.
+    Rows carry ``kind``, ``id``, ``task_id``, ``task_title``, ``project_id``,
+    ``project_name``, ``snippet`` and ``score`` (bm25, lower is better). The
+    snippet is raw text with private markers; pass it through ``highlight``.
+    """
+    task_match, task_score, task_snippet = _hits(task_index, (10.0, 1.0), -1)
+    tasks = (
+        select(
+            literal("task").label("kind"),
+            models.Task.id.label("id"),
+            models.Task.id.label("task_id"),
+            models.Task.title.label("task_title"),
+            models.Project.id.label("project_id"),
+            models.Project.name.label("project_name"),
+            task_snippet,
+            task_score,
+        )
+        .select_from(task_index)
+        .join(models.Task, models.Task.id == task_index.c.rowid)
+        .join(models.Project, models.Project.id == models.Task.project_id)
+        .where(task_match(match), access_filter)
+    )
+    comment_match, comment_score, comment_snippet = _hits(comment_index, (), 0)
+    comments = (
+        select(
+            literal("comment").label("kind"),
+            models.Comment.id.label("id"),
+            models.Task.id.label("task_id"),
+            models.Task.title.label("task_title"),
+            models.Project.id.label("project_id"),
+            models.Project.name.label("project_name"),
+            comment_snippet,
+            comment_score,
+        )
+        .select_from(comment_index)
+        .join(models.Comment, models.Comment.id == comment_index.c.rowid)
+        .join(models.Task, models.Task.id == models.Comment.task_id)
+        .join(models.Project, models.Project.id == models.Task.project_id)
+        .where(comment_match(match), access_filter)
+    )
+    hits = union_all(tasks, comments).subquery("hits")
+    return select(hits).order_by(hits.c.score, hits.c.kind, hits.c.id)
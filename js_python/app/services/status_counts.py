@@ -0,0 +1,150 @@
+"""Materialized task counts per project and status for the dashboard.
+
+Task mapper events record +1/-1 deltas as tasks are created, deleted, change
+status or move between projects; a session ``after_flush`` hook applies them
+with one upsert in the same transaction. Rows of deleted projects are removed
+in the same hook. Bulk Core writes bypass the events; run ``rebuild`` after them.
+"""
+
+from collections import Counter
+from typing import Dict, List, Set, Tuple
+
+from sqlalchemy import delete, event, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.orm.attributes import get_history
+
+import app.models as models
+
+counts = models.ProjectStatusCount.__table__
+
+_PENDING_DELTAS = "pending_status_count_deltas"
+_DELETED_PROJECTS = "pending_status_count_deleted_projects"
+
+
+def status_key(status) -> str:
+    """Tasks without a status are counted as ``unknown``, as the dashboard always showed them."""
+    return status or "unknown"
+
+
+def _session_state(target, key: str, factory):
+    session = object_session(target)
+    if session is None:
+        return factory()
+    return session.info.setdefault(key, factory())
+
+
+def _record(target, project_id: int, status, delta: int) -> None:
+    _session_state(target, _PENDING_DELTAS, Counter)[(project_id, status_key(status))] += delta
+
+
+def _previous(target, key: str):
+    """The attribute's value as last loaded from or written to the database."""
+    history = get_history(target, key)
+    return history.deleted[0] if history.deleted else getattr(target, key)
+
+
+@event.listens_for(models.Task.status, "set", active_history=True)
+@event.listens_for(models.Task.project_id, "set", active_history=True)
+def _load_previous_value(target, value, oldvalue, initiator):
+    # Registered for active_history alone: assigning to an expired attribute
+    # then loads the stored value first, so ``_previous`` always sees it.
+    return value
+
+
+@event.listens_for(models.Task, "after_insert")
+def _on_task_insert(mapper, connection, target: models.Task) -> None:
+    _record(target, target.project_id, target.status, 1)
+
+
+@event.listens_for(models.Task, "after_delete")
+def _on_task_delete(mapper, connection, target: models.Task) -> None:
+    # Unflushed edits are discarded by the DELETE; count the row as stored.
+    _record(target, _previous(target, "project_id"), _previous(target, "status"), -1)
+
+
+@event.listens_for(models.Task, "after_update")
+def _on_task_update(mapper, connection, target: models.Task) -> None:
+    previous = (_previous(target, "project_id"), status_key(_previous(target, "status")))
+    current = (target.project_id, status_key(target.status))
+    if previous != current:
+        _record(target, previous[0], previous[1], -1)
+        _record(target, current[0], current[1], 1)
+
+
+@event.listens_for(models.Project, "after_delete")
+def _on_project_delete(mapper, connection, target: models.Project) -> None:
+    _session_state(target, _DELETED_PROJECTS, set).add(target.id)
+
+
+def apply_deltas(connection: Connection, deltas: Dict[Tuple[int, str], int]) -> None:
+    """Add each ``(project_id, status) -> delta`` to the stored counts."""
+    rows = [
+        {"project_id": project_id, "status": status, "count": delta}
+        for (project_id, status), delta in sorted(deltas.items())
+        if delta
+    ]
+    if not rows:
+        return
+    dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(counts)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[counts.c.project_id, counts.c.status],
+        set_={"count": counts.c.count + stmt.excluded.count},
+    )
+    connection.execute(stmt, rows)
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_flushed_deltas(session: Session, flush_context) -> None:
+    deltas: Counter = session.info.pop(_PENDING_DELTAS, Counter())
+    deleted: Set[int] = session.info.pop(_DELETED_PROJECTS, set())
+    if not deltas and not deleted:
+        return
+    connection = session.connection()
+    apply_deltas(connection, {key: delta for key, delta in deltas.items() if key[0] not in deleted})
+    if deleted:
+        connection.execute(delete(counts).where(counts.c.project_id.in_(deleted)))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_deltas(session: Session) -> None:
+    session.info.pop(_PENDING_DELTAS, None)
+    session.info.pop(_DELETED_PROJECTS, None)
+
+
+def project_counts(db: Session, project_id: int) -> Dict[str, int]:
+    """Non-zero task counts by status for one project (a primary-key range scan)."""
+    rows = db.execute(
+        select(counts.c.status, counts.c.count).where(counts.c.project_id == project_id, counts.c.count != 0)
+    )
+    return dict(rows.all())
+
+
+def _live_counts_query():
+    status = func.coalesce(models.Task.status, "unknown")
+    return select(models.Task.project_id, status, func.count(models.Task.id)).group_by(
+        models.Task.project_id, status
+    )
+
+
+def check(db: Session) -> List[Tuple[int, str, int, int]]:
+    """Compare stored counters with the tasks table: ``(project_id, status, stored, actual)`` per mismatch."""
+    stored = {(project_id, status): count for project_id, status, count in db.execute(select(counts)).all()}
+    actual = {(project_id, status): count for project_id, status, count in db.execute(_live_counts_query()).all()}
+    mismatches = []
+    for key in sorted(stored.keys() | actual.keys()):
+        if stored.get(key, 0) != actual.get(key, 0):
+            mismatches.append((*key, stored.get(key, 0), actual.get(key, 0)))
+    return mismatches
+
+
+def rebuild(db: Session) -> int:
+    """Recompute every counter from the tasks table; returns the row count."""
+    connection = db.connection()
+    connection.execute(delete(counts))
+    result = connection.execute(
+        insert(counts).from_select(["project_id", "status", "count"], _live_counts_query())
+    )
+    return result.rowcount
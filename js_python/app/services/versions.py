@@ -0,0 +1,225 @@
+"""Database-backed version counters used to validate in-memory caches.
+
+Every cacheable scope has a row in ``scope_versions``:
+
+* ``project:<id>``: a project, its tasks, their history and dependency edges
+* ``comments:<id>``: the comments on a project's tasks
+* ``projects``: the set of projects and their contents
+* ``public-projects``: which projects have ``visibility == "all"``
+* ``access:<id>``: the projects a user owns or has shared with them
+* ``user:<id>``: a user's notifications
+* ``users``: the set of users
+
+Mapper events collect the scopes touched by a flush and a session
+``after_flush`` hook bumps them with one upsert, inside the same transaction
+as the change; Core statements that bypass the mapper call ``bump`` directly.
+Caches compare the versions they were built from with the current ones
+instead of subscribing to invalidation messages, which keeps them correct
+across worker processes. The same versions are the HTTP validators of the
+read endpoints (see ``etag``).
+"""
+
+import hashlib
+from typing import Dict, Iterable, Set
+
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.orm.attributes import PASSIVE_NO_INITIALIZE, get_history
+
+import app.models as models
+
+scope_versions = models.ScopeVersion.__table__
+
+PROJECTS_SCOPE = "projects"
+PUBLIC_PROJECTS_SCOPE = "public-projects"
+USERS_SCOPE = "users"
+_PENDING_SCOPES = "pending_version_scopes"
+_PENDING_TASKS = "pending_version_task_ids"
+_PENDING_COMMENT_TASKS = "pending_version_comment_task_ids"
+
+
+def project_scope(project_id: int) -> str:
+    return f"project:{project_id}"
+
+
+def comments_scope(project_id: int) -> str:
+    return f"comments:{project_id}"
+
+
+def user_scope(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def access_scope(user_id: int) -> str:
+    return f"access:{user_id}"
+
+
+def etag(kind: str, *parts) -> str:
+    """Strong validator for a ``kind`` of response built from ``parts`` (versions, ids, arguments)."""
+    key = ",".join(map(str, parts))
+    return f'"{kind}-' + hashlib.sha1(key.encode()).hexdigest()[:20] + '"'
+
+
+def bump(connection: Connection, scopes: Iterable[str]) -> None:
+    """Increment the version of each scope, creating missing rows at 1."""
+    rows = [{"scope": scope, "version": 1} for scope in sorted(set(scopes))]
+    if not rows:
+        return
+    dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(scope_versions)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[scope_versions.c.scope],
+        set_={"version": scope_versions.c.version + 1},
+    )
+    connection.execute(stmt, rows)
+
+
+def current(db: Session, scopes: Iterable[str]) -> Dict[str, int]:
+    """Current version of each scope; scopes never bumped report 0."""
+    scopes = list(scopes)
+    versions = {scope: 0 for scope in scopes}
+    if scopes:
+        rows = db.execute(
+            select(scope_versions.c.scope, scope_versions.c.version).where(scope_versions.c.scope.in_(scopes))
+        )
+        versions.update(rows.all())
+    return versions
+
+
+def _pending(target, key: str) -> Set:
+    session = object_session(target)
+    if session is None:
+        return set()
+    return session.info.setdefault(key, set())
+
+
+def _touch_project(target, project_id) -> None:
+    if project_id is not None:
+        _pending(target, _PENDING_SCOPES).add(project_scope(project_id))
+
+
+def _touch_comments(target, project_id) -> None:
+    if project_id is not None:
+        _pending(target, _PENDING_SCOPES).add(comments_scope(project_id))
+
+
+@event.listens_for(models.Task, "after_insert")
+@event.listens_for(models.Task, "after_delete")
+def _on_task_insert_or_delete(mapper, connection, target: models.Task) -> None:
+    _touch_project(target, target.project_id)
+
+
+@event.listens_for(models.Task, "after_update")
+def _on_task_update(mapper, connection, target: models.Task) -> None:
+    _touch_project(target, target.project_id)
+    for previous_project_id in get_history(target, "project_id").deleted:
+        _touch_project(target, previous_project_id)
+        # Its comments moved with it.
+        _touch_comments(target, previous_project_id)
+        _touch_comments(target, target.project_id)
+
+
+@event.listens_for(models.Task, "after_delete")
+def _on_task_delete(mapper, connection, target: models.Task) -> None:
+    # The cascade removes its comments.
+    _touch_comments(target, target.project_id)
+
+
+@event.listens_for(models.Comment, "after_insert")
+@event.listens_for(models.Comment, "after_update")
+@event.listens_for(models.Comment, "after_delete")
+def _on_comment_change(mapper, connection, target: models.Comment) -> None:
+    _pending(target, _PENDING_COMMENT_TASKS).add(target.task_id)
+
+
+@event.listens_for(models.Notification, "after_insert")
+@event.listens_for(models.Notification, "after_update")
+@event.listens_for(models.Notification, "after_delete")
+def _on_notification_change(mapper, connection, target: models.Notification) -> None:
+    _pending(target, _PENDING_SCOPES).add(user_scope(target.recipient_id))
+
+
+@event.listens_for(models.User, "after_insert")
+@event.listens_for(models.User, "after_update")
+@event.listens_for(models.User, "after_delete")
+def _on_user_change(mapper, connection, target: models.User) -> None:
+    _pending(target, _PENDING_SCOPES).add(USERS_SCOPE)
+
+
+@event.listens_for(models.TaskDependency, "after_insert")
+@event.listens_for(models.TaskDependency, "after_delete")
+def _on_dependency_change(mapper, connection, target: models.TaskDependency) -> None:
+    _pending(target, _PENDING_TASKS).update((target.depends_on_task_id, target.dependent_task_id))
+
+
+@event.listens_for(models.Project, "after_insert")
+@event.listens_for(models.Project, "after_update")
+@event.listens_for(models.Project, "after_delete")
+def _on_project_change(mapper, connection, target: models.Project) -> None:
+    _touch_project(target, target.id)
+    _pending(target, _PENDING_SCOPES).add(PROJECTS_SCOPE)
+
+
+@event.listens_for(models.Project, "after_insert")
+@event.listens_for(models.Project, "after_delete")
+def _on_project_insert_or_delete(mapper, connection, target: models.Project) -> None:
+    scopes = _pending(target, _PENDING_SCOPES)
+    scopes.add(access_scope(target.owner_id))
+    if target.visibility == "all":
+        scopes.add(PUBLIC_PROJECTS_SCOPE)
+    # Deleting the project loaded its shares before removing them.
+    shared = get_history(target, "shared_users", passive=PASSIVE_NO_INITIALIZE).sum()
+    scopes.update(access_scope(user.id) for user in shared)
+
+
+@event.listens_for(models.Project.owner_id, "set", active_history=True)
+@event.listens_for(models.Project.visibility, "set", active_history=True)
+def _load_previous_access(target, value, oldvalue, initiator) -> None:
+    # Registered for active_history alone: the replaced value is loaded, so
+    # _on_project_update sees it even when the attribute had expired.
+    pass
+
+
+@event.listens_for(models.Project, "after_update")
+def _on_project_update(mapper, connection, target: models.Project) -> None:
+    # Only ownership, visibility and sharing change who may see a project.
+    scopes = _pending(target, _PENDING_SCOPES)
+    owners = get_history(target, "owner_id")
+    if owners.has_changes():
+        scopes.update(access_scope(owner_id) for owner_id in owners.sum() if owner_id is not None)
+    visibility = get_history(target, "visibility")
+    if visibility.has_changes():
+        if "all" in visibility.sum():
+            scopes.add(PUBLIC_PROJECTS_SCOPE)
+        scopes.update(access_scope(user.id) for user in get_history(target, "shared_users").sum())
+    else:
+        shares = get_history(target, "shared_users", passive=PASSIVE_NO_INITIALIZE)
+        scopes.update(access_scope(user.id) for user in shares.added + shares.deleted)
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_flushed_scopes(session: Session, flush_context) -> None:
+    scopes: Set[str] = session.info.pop(_PENDING_SCOPES, set())
+    task_ids: Set[int] = session.info.pop(_PENDING_TASKS, set())
+    comment_task_ids: Set[int] = session.info.pop(_PENDING_COMMENT_TASKS, set())
+    if not scopes and not task_ids and not comment_task_ids:
+        return
+    connection = session.connection()
+    # Tasks deleted in this flush are gone already, but their own delete
+    # event has recorded their project.
+    for pending_ids, scope in ((task_ids, project_scope), (comment_task_ids, comments_scope)):
+        if pending_ids:
+            project_ids = connection.execute(
+                select(models.Task.project_id).where(models.Task.id.in_(pending_ids)).distinct()
+            ).scalars()
+            scopes.update(scope(project_id) for project_id in project_ids)
+    bump(connection, scopes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_scopes(session: Session) -> None:
+    session.info.pop(_PENDING_SCOPES, None)
+    session.info.pop(_PENDING_TASKS, None)
+    session.info.pop(_PENDING_COMMENT_TASKS, None)
@@ -0,0 +1,5 @@
+"""Benchmark and query-budget scripts (run with ``python -m benchmarks.<name>``)."""
+
+# Import the application package in the same order as ``main.py`` so the
+# routes/models modules resolve without a circular-import error.
+import app.core  # noqa: F401
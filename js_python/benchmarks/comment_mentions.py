@@ -0,0 +1,72 @@
+"""Benchmark comment creation latency as the number of @mentions grows.
+
+Calls the ``create_comment`` route against a file-backed SQLite database, so
+every commit pays for a real fsync, and reports the mean latency and the SQL
+statements per comment for each mention count.
+
+    python -m benchmarks.comment_mentions [--mentions 0 1 10 50 200] [--repeat 20]
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import insert
+
+import app.models as models
+import app.schemas as schemas
+from app.api import routes
+from benchmarks.common import QueryCounter, make_session_factory
+
+
+def build_task(db, users: int):
+    author = models.User(username="author", email="author@example.com", hashed_password="x")
+    db.add(author)
+    db.flush()
+    db.execute(
+        insert(models.User),
+        [{"username": f"user{i}", "email": f"user{i}@example.com", "hashed_password": "x"} for i in range(users)],
+    )
+    project = models.Project(name="Mentions", owner_id=author.id)
+    db.add(project)
+    db.flush()
+    task = models.Task(title="Discussed task", project_id=project.id)
+    db.add(task)
+    db.commit()
+    return author, task.id
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mentions", type=int, nargs="+", default=[0, 1, 10, 50, 200])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, SessionLocal = make_session_factory(f"sqlite:///{Path(tmp) / 'mentions.db'}")
+        with SessionLocal() as db:
+            author, task_id = build_task(db, max(args.mentions))
+            for mentions in args.mentions:
+                # Mention every user twice: fan-out is deduplicated per recipient.
+                names = " ".join(f"@user{i}" for i in range(mentions))
+                payload = schemas.CommentCreate(task_id=task_id, content=f"Please review {names} {names}")
+                timings = []
+                with QueryCounter(engine) as counter:
+                    for _ in range(args.repeat):
+                        start = time.perf_counter()
+                        routes.create_comment(comment_in=payload, db=db, current_user=author)
+                        timings.append(time.perf_counter() - start)
+                per_comment = counter.count / args.repeat
+                print(
+                    f"{mentions:>4} mention(s): {statistics.mean(timings) * 1000:8.2f} ms mean, "
+                    f"{max(timings) * 1000:8.2f} ms max, {per_comment:.1f} statements"
+                )
+            notifications = db.query(models.Notification).count()
+        print(f"notifications written: {notifications} (expected {sum(args.mentions) * args.repeat})")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
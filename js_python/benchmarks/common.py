@@ -0,0 +1,29 @@
+"""Shared helpers for the benchmark and query-budget scripts.
+
+The database helpers live in ``tests/conftest.py`` so the tests do not depend
+on these scripts; they are re-exported here for the benchmarks.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from tests.conftest import (  # noqa: F401
+    QueryCounter,
+    get_request,
+    make_async_session_factory,
+    make_session_factory,
+    seed,
+    serialize,
+)
+
+
+@contextmanager
+def timed(label: str, results: Optional[dict] = None):
+    """Print (and optionally record) the wall-clock time of the wrapped block."""
+    start = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - start
+    if results is not None:
+        results[label] = elapsed
+    print(f"{label:<48} {elapsed * 1000:10.2f} ms")
@@ -0,0 +1,122 @@
+"""Benchmark dependency cycle checks: per-node DFS queries vs the closure table.
+
+Builds a dependency graph of independent project-sized components (10k+
+edges by default), fills the closure with ``dependency_graph.rebuild`` and
+then times cycle checks for random candidate edges with both strategies.
+
+    python -m benchmarks.dependency_closure [--components 200] [--tasks 50] [--edges-per-task 1.2]
+"""
+
+import argparse
+import random
+from typing import List, Set, Tuple
+
+from sqlalchemy import insert, select
+
+import app.models as models
+from app.services import dependency_graph
+from benchmarks.common import QueryCounter, make_session_factory, timed
+
+
+def dfs_creates_cycle(db, depends_on_task_id: int, dependent_task_id: int) -> bool:
+    """The previous implementation: one SELECT per visited task."""
+    stack = [dependent_task_id]
+    visited: Set[int] = set()
+    while stack:
+        current = stack.pop()
+        if current == depends_on_task_id:
+            return True
+        if current in visited:
+            continue
+        visited.add(current)
+        next_tasks = (
+            db.query(models.TaskDependency.dependent_task_id)
+            .filter(models.TaskDependency.depends_on_task_id == current)
+            .all()
+        )
+        stack.extend(dep_id for (dep_id,) in next_tasks)
+    return False
+
+
+def build_graph(db, components: int, tasks: int, edges_per_task: float, rng: random.Random) -> List[List[int]]:
+    owner = models.User(username="bench", email="bench@example.com", hashed_password="x")
+    db.add(owner)
+    db.flush()
+    groups: List[List[int]] = []
+    edges: List[Tuple[int, int]] = []
+    for c in range(components):
+        project = models.Project(name=f"Component {c}", owner_id=owner.id)
+        db.add(project)
+        db.flush()
+        rows = [{"title": f"T{c}-{i}", "project_id": project.id} for i in range(tasks)]
+        ids = list(db.scalars(insert(models.Task).returning(models.Task.id, sort_by_parameter_order=True), rows))
+        groups.append(ids)
+        pairs: Set[Tuple[int, int]] = set()
+        while len(pairs) < int(tasks * edges_per_task):
+            # Edges only point forward in creation order, so each component stays acyclic.
+            a, b = sorted(rng.sample(range(tasks), 2))
+            pairs.add((ids[a], ids[b]))
+        edges.extend(pairs)
+    db.execute(
+        insert(models.TaskDependency),
+        [{"depends_on_task_id": a, "dependent_task_id": b} for a, b in edges],
+    )
+    db.commit()
+    print(f"graph: {components * tasks} tasks, {len(edges)} edges")
+    return groups
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--components", type=int, default=200)
+    parser.add_argument("--tasks", type=int, default=50)
+    parser.add_argument("--edges-per-task", type=float, default=1.2)
+    parser.add_argument("--checks", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    engine, SessionLocal = make_session_factory()
+    with SessionLocal() as db:
+        groups = build_graph(db, args.components, args.tasks, args.edges_per_task, rng)
+        with timed("closure rebuild"):
+            rows = dependency_graph.rebuild(db)
+            db.commit()
+        print(f"closure rows: {rows}")
+
+        candidates = []
+        for _ in range(args.checks):
+            ids = rng.choice(groups)
+            candidates.append(tuple(rng.sample(ids, 2)))
+
+        results = {}
+        for label, check in (
+            ("DFS (query per visited task)", lambda a, b: dfs_creates_cycle(db, a, b)),
+            ("closure lookup", lambda a, b: dependency_graph.would_create_cycle(db, a, b)),
+        ):
+            with QueryCounter(engine) as counter, timed(f"{args.checks} cycle checks, {label}"):
+                results[label] = [check(a, b) for a, b in candidates]
+            print(f"{'':<4}{counter.count} statements")
+        assert len(set(map(tuple, results.values()))) == 1, "strategies disagree"
+
+        with timed(f"{args.checks} incremental edge inserts + deletes"):
+            for depends_on, dependent in candidates:
+                if dependency_graph.would_create_cycle(db, depends_on, dependent):
+                    continue
+                if db.scalar(
+                    select(models.TaskDependency.id).where(
+                        models.TaskDependency.depends_on_task_id == depends_on,
+                        models.TaskDependency.dependent_task_id == dependent,
+                    )
+                ):
+                    continue  # already an edge
+                edge = models.TaskDependency(depends_on_task_id=depends_on, dependent_task_id=dependent)
+                db.add(edge)
+                db.flush()
+                db.delete(edge)
+                db.flush()
+            db.rollback()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
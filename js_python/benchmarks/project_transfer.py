@@ -0,0 +1,114 @@
+"""Benchmark NDJSON project export and import.
+
+Seeds one large project (100k tasks by default, with assignees, dependency
+edges, comments and history), streams its export to a file and imports the
+file back as a new project, reporting the time of each. With
+``--trace-memory`` the peak Python heap is reported too (tracing slows both
+steps down several times, so compare timings only between untraced runs).
+
+    python -m benchmarks.project_transfer [--tasks 100000] [--trace-memory]
+"""
+
+import argparse
+import tempfile
+import tracemalloc
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+
+from sqlalchemy import insert
+
+import app.models as models
+from app.core.config import PROJECT_TRANSFER_CHUNK_SIZE
+from app.services import dependency_graph, project_transfer, status_counts
+from benchmarks.common import make_session_factory, timed
+
+
+def build_project(db, tasks: int) -> int:
+    owner = models.User(username="bench", email="bench@example.com", hashed_password="x")
+    helper = models.User(username="helper", email="helper@example.com", hashed_password="x")
+    db.add_all([owner, helper])
+    db.flush()
+    project = models.Project(name="Large project", owner_id=owner.id)
+    db.add(project)
+    db.flush()
+    statuses = ["new_task", "in_progress", "done"]
+    rows = [{"title": f"Task {i}", "project_id": project.id, "status": statuses[i % 3]} for i in range(tasks)]
+    ids = list(db.scalars(insert(models.Task).returning(models.Task.id, sort_by_parameter_order=True), rows))
+    db.execute(insert(models.task_assignees), [{"task_id": task_id, "user_id": helper.id} for task_id in ids[::2]])
+    # Short chains: every fourth task depends on the one before it.
+    db.execute(
+        insert(models.TaskDependency),
+        [{"depends_on_task_id": ids[i - 1], "dependent_task_id": ids[i]} for i in range(1, tasks, 4)],
+    )
+    db.execute(
+        insert(models.Comment),
+        [{"task_id": task_id, "author_id": owner.id, "content": "Looks good"} for task_id in ids[::10]],
+    )
+    db.execute(
+        insert(models.TaskActivity),
+        [
+            {"user_id": owner.id, "project_id": project.id, "task_id": task_id, "action": "created", "status": "new_task"}
+            for task_id in ids
+        ],
+    )
+    dependency_graph.rebuild(db)
+    status_counts.rebuild(db)
+    db.commit()
+    return project.id
+
+
+@contextmanager
+def peak_memory(label: str, enabled: bool):
+    if not enabled:
+        yield
+        return
+    tracemalloc.start()
+    try:
+        yield
+    finally:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{label:<48} {peak / 1024 / 1024:10.2f} MiB peak")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--trace-memory", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, SessionLocal = make_session_factory(f"sqlite:///{Path(tmp) / 'transfer.db'}")
+        with SessionLocal() as db:
+            project_id = build_project(db, args.tasks)
+            owner = db.query(models.User).filter(models.User.username == "bench").one()
+            db.expunge(owner)
+
+        export_path = Path(tmp) / "project.ndjson"
+        with peak_memory("export heap", args.trace_memory), timed(f"export {args.tasks} tasks"):
+            with export_path.open("w") as out:
+                for line in project_transfer.export_lines(SessionLocal, project_id):
+                    out.write(line)
+        print(f"{'export size':<48} {export_path.stat().st_size / 1024 / 1024:10.2f} MiB")
+
+        with peak_memory("import heap", args.trace_memory), timed(f"import {args.tasks} tasks"):
+            with SessionLocal() as db, export_path.open("rb") as source:
+                importer = project_transfer.ProjectImporter(db, owner, name="Imported")
+                while True:
+                    lines = list(islice(source, PROJECT_TRANSFER_CHUNK_SIZE))
+                    if not lines:
+                        break
+                    importer.feed_lines(line.rstrip(b"\n") for line in lines)
+                counts = importer.finish()
+                db.commit()
+        print(f"imported {dict(counts)}")
+
+        with SessionLocal() as db:
+            mismatches = status_counts.check(db)
+        print(f"status counters after import: {'ok' if not mismatches else mismatches}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""Report the SQL statements each list endpoint runs against its budget.
+
+The same endpoints are exercised against a small and a large dataset. The
+budgets and the measurement live in ``tests/conftest.py`` and are enforced by
+``tests/test_query_budget.py``; this script prints the counts for both datasets.
+
+    python -m benchmarks.query_budget
+"""
+
+import asyncio
+
+from tests.conftest import QUERY_BUDGETS, measure_statements
+
+
+def main() -> None:
+    for size in (5, 200):
+        counts = asyncio.run(measure_statements(size))
+        for name, count in counts.items():
+            budget = QUERY_BUDGETS[name]
+            verdict = "ok" if count <= budget else "OVER BUDGET"
+            print(f"[{size:>4} tasks/project] {name:<28} {count:>4} / {budget:<4} {verdict}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Print the SQLite query plan of every statement the hot read routes issue.
+
+Each route runs once against a seeded database built from the models (the
+same schema ``manage.py migrate`` produces). Every statement it executed is
+then passed to ``EXPLAIN QUERY PLAN``; full table scans are marked with ``!``.
+
+    python -m benchmarks.query_plans
+"""
+
+import asyncio
+import inspect
+import sys
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, List, Set, Tuple
+
+from fastapi import Response
+
+import app.schemas as schemas
+from app.api import routes
+from app.core.config import DEFAULT_PAGE_SIZE
+from app.services.project_access import project_access_cache
+from tests.conftest import (
+    QueryCounter,
+    budget_endpoints,
+    get_request,
+    make_async_session_factory,
+    make_session_factory,
+    seed,
+)
+
+
+def _extra_endpoints(db, adb, user, project_id: int, task_id: int) -> Dict[str, Callable]:
+    return {
+        "task_history": lambda: routes.task_history(
+            project_id=project_id,
+            request=get_request(f"/projects/{project_id}/task-history"),
+            response=Response(),
+            date_filter=None,
+            start_date=None,
+            end_date=None,
+            limit=DEFAULT_PAGE_SIZE,
+            cursor=None,
+            db=db,
+            current_user=user,
+        ),
+        "list_upstream_tasks": lambda: routes.list_upstream_tasks(
+            task_id=task_id,
+            request=get_request(f"/tasks/{task_id}/upstream"),
+            response=Response(),
+            db=db,
+            current_user=user,
+        ),
+        "list_downstream_tasks": lambda: routes.list_downstream_tasks(
+            task_id=task_id,
+            request=get_request(f"/tasks/{task_id}/downstream"),
+            response=Response(),
+            db=db,
+            current_user=user,
+        ),
+        "count_unread_notifications": lambda: routes.count_unread_notifications(
+            request=get_request("/notifications/unread-count"), response=Response(), db=adb, current_user=user
+        ),
+    }
+
+
+def is_full_scan(detail: str, ctes: Set[str] = frozenset()) -> bool:
+    """``SCAN <table>`` without an index; covering-index scans, temp b-trees and CTEs are fine."""
+    if not detail.startswith("SCAN ") or " USING " in detail or detail.startswith("SCAN CONSTANT"):
+        return False
+    return detail.split()[1] not in ctes
+
+
+async def collect(tasks_per_project: int) -> Dict[str, List[Tuple[str, List[str]]]]:
+    """Return ``route -> [(statement, plan lines)]`` for a seeded dataset."""
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{Path(tmp) / 'plans.db'}"
+        engine, SessionLocal = make_session_factory(url)
+        async_engine, AsyncSessionLocal = make_async_session_factory(url)
+        plans: Dict[str, List[Tuple[str, List[str]]]] = {}
+        project_access_cache.clear()
+        with SessionLocal() as db:
+            users = seed(db, tasks_per_project=tasks_per_project)
+            user = users[1]
+            project = user.shared_projects[0]
+            task = project.tasks[0]
+            async with AsyncSessionLocal() as adb:
+                calls = {name: call for name, (call, _) in budget_endpoints(db, adb, user, project.id, task.id).items()}
+                calls.update(_extra_endpoints(db, adb, user, project.id, task.id))
+                for name, call in calls.items():
+                    db.expire_all()
+                    user.id  # reload the principal, as get_current_user would
+                    with QueryCounter(engine) as counter, QueryCounter(async_engine) as async_counter:
+                        result = call()
+                        if inspect.iscoroutine(result):
+                            await result
+                    executed = list(zip(counter.statements, counter.parameters))
+                    executed += zip(async_counter.statements, async_counter.parameters)
+                    with engine.connect() as connection:
+                        plans[name] = [
+                            (
+                                statement,
+                                [row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)],
+                            )
+                            for statement, parameters in executed
+                        ]
+        await async_engine.dispose()
+        engine.dispose()
+    return plans
+
+
+def main() -> int:
+    plans = asyncio.run(collect(200))
+    scans = 0
+    for name, statements in plans.items():
+        print(f"== {name} ({len(statements)} statement(s))")
+        for statement, plan in statements:
+            print("   " + " ".join(statement.split())[:110])
+            ctes = {detail.split()[1] for detail in plan if detail.startswith("MATERIALIZE ")}
+            for detail in plan:
+                marker = "!" if is_full_scan(detail, ctes) else " "
+                scans += marker == "!"
+                print(f"   {marker}  {detail}")
+    print(f"{scans} full table scan(s) across {len(plans)} route(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
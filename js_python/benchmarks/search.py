@@ -0,0 +1,115 @@
+"""Benchmark full-text search latency over a large comment corpus.
+
+Seeds 1M comments (by default) spread over many tasks and projects, with
+words drawn from a Zipf-like vocabulary so some terms match a large share of
+the corpus and others only a handful of rows. The FTS5 indexes are filled by
+the same triggers the application uses. Each query then runs like
+``GET /search`` does (first page of 20, access filter applied) and the mean
+and worst latency are reported.
+
+    python -m benchmarks.search [--comments 1000000] [--repeat 5]
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from sqlalchemy import insert
+
+import app.models as models
+from app.api.routes import accessible_project_ids
+from app.core.config import DEFAULT_PAGE_SIZE
+from app.services import search
+from benchmarks.common import make_session_factory, timed
+
+SYLLABLES = ["ka", "lo", "mi", "ne", "po", "ru", "sa", "ti", "vo", "ze", "dra", "kel", "mon", "tur"]
+CHUNK = 20_000
+
+
+def vocabulary(size: int, rng: random.Random) -> List[str]:
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words, key=lambda word: rng.random())
+
+
+def build_corpus(db, comments: int, tasks: int, projects: int, words: List[str], rng: random.Random):
+    owner = models.User(username="bench", email="bench@example.com", hashed_password="x")
+    reader = models.User(username="reader", email="reader@example.com", hashed_password="x")
+    db.add_all([owner, reader])
+    db.flush()
+    project_ids = []
+    for p in range(projects):
+        # Half the projects are private to the owner, so the access filter matters.
+        project = models.Project(name=f"Project {p}", owner_id=owner.id, visibility="all" if p % 2 else "private")
+        db.add(project)
+        db.flush()
+        project_ids.append(project.id)
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+
+    def text(length: int) -> str:
+        return " ".join(rng.choices(words, weights, k=length))
+
+    task_ids = list(
+        db.scalars(
+            insert(models.Task).returning(models.Task.id),
+            [{"title": text(4), "description": text(12), "project_id": project_ids[t % projects]} for t in range(tasks)],
+        )
+    )
+    for start in range(0, comments, CHUNK):
+        db.execute(
+            insert(models.Comment),
+            [
+                {"task_id": rng.choice(task_ids), "author_id": owner.id, "content": text(rng.randint(5, 30))}
+                for _ in range(start, min(start + CHUNK, comments))
+            ],
+        )
+    db.commit()
+    return reader
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--comments", type=int, default=1_000_000)
+    parser.add_argument("--tasks", type=int, default=20_000)
+    parser.add_argument("--projects", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    words = vocabulary(5000, rng)
+    queries = {
+        "most common word": words[0],
+        "mid-frequency word": words[100],
+        "rare word": words[-1],
+        "two words": f"{words[3]} {words[40]}",
+        "prefix": f"{words[7][:3]}*",
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, SessionLocal = make_session_factory(f"sqlite:///{Path(tmp) / 'search.db'}")
+        with SessionLocal() as db:
+            with timed(f"seed {args.comments} comments (indexed by triggers)"):
+                reader = build_corpus(db, args.comments, args.tasks, args.projects, words, rng)
+            for label, text in queries.items():
+                access_filter = models.Project.id.in_(accessible_project_ids(db, reader))
+                stmt = search.statement(search.match_expression(text), access_filter)
+                stmt = stmt.limit(DEFAULT_PAGE_SIZE + 1)
+                timings = []
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    rows = db.execute(stmt).all()
+                    timings.append(time.perf_counter() - start)
+                print(
+                    f"{label + ' (' + text + ')':<40} {statistics.mean(timings) * 1000:9.2f} ms mean, "
+                    f"{max(timings) * 1000:9.2f} ms max, {len(rows)} row(s)"
+                )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Compare FastAPI's default response serialization with ``ModelResponse``.
+
+The default path is what a route with ``response_model`` does: validate the
+ORM objects, dump the models to Python primitives (``serialize_response``)
+and encode them with ``JSONResponse``. ``ModelResponse`` validates through a
+cached ``TypeAdapter`` and writes the bytes with ``dump_json``. Both bodies are
+checked to decode to the same JSON.
+
+    python -m benchmarks.serialization [--tasks 1000 5000] [--repeat 10]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Any, Callable, List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+from sqlalchemy import insert, select
+from sqlalchemy.orm import selectinload
+
+import app.models as models
+import app.schemas as schemas
+from app.api.responses import ModelResponse
+from benchmarks.common import make_session_factory
+
+
+def build_tasks(db, tasks: int, users: int = 20) -> None:
+    user_rows = [
+        models.User(username=f"user{i}", email=f"user{i}@example.com", hashed_password="x") for i in range(users)
+    ]
+    db.add_all(user_rows)
+    db.flush()
+    project = models.Project(name="Serialization", owner_id=user_rows[0].id)
+    db.add(project)
+    db.flush()
+    task_ids = db.scalars(
+        insert(models.Task).returning(models.Task.id),
+        [
+            {"title": f"Task {t}", "description": "Lorem ipsum dolor sit amet " * 4, "project_id": project.id}
+            for t in range(tasks)
+        ],
+    ).all()
+    db.execute(
+        insert(models.task_assignees),
+        [
+            {"task_id": task_id, "user_id": user_rows[(t + k) % users].id}
+            for t, task_id in enumerate(task_ids)
+            for k in range(2)
+        ],
+    )
+    db.commit()
+
+
+def fastapi_default(schema: Any) -> Callable[[List[Any]], bytes]:
+    route = APIRoute("/bench", endpoint=lambda: None, response_model=schema)
+
+    def render(content: List[Any]) -> bytes:
+        serialized = asyncio.run(
+            serialize_response(field=route.secure_cloned_response_field, response_content=content)
+        )
+        return JSONResponse(serialized).body
+
+    return render
+
+
+def model_response(schema: Any) -> Callable[[List[Any]], bytes]:
+    return lambda content: ModelResponse(content, schema).body
+
+
+def time_render(render: Callable[[List[Any]], bytes], content: List[Any], repeat: int):
+    render(content)  # warm up (adapter and schema construction)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = render(content)
+        timings.append(time.perf_counter() - start)
+    return statistics.mean(timings), body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    schema = List[schemas.TaskOut]
+    for size in args.tasks:
+        engine, SessionLocal = make_session_factory()
+        with SessionLocal() as db:
+            build_tasks(db, size)
+            tasks = db.scalars(select(models.Task).options(selectinload(models.Task.assignees))).all()
+            default_seconds, default_body = time_render(fastapi_default(schema), tasks, args.repeat)
+            fast_seconds, fast_body = time_render(model_response(schema), tasks, args.repeat)
+            assert json.loads(default_body) == json.loads(fast_body), "bodies differ"
+        engine.dispose()
+        print(
+            f"{size:>6} tasks: response_model {default_seconds * 1000:8.2f} ms, "
+            f"ModelResponse {fast_seconds * 1000:8.2f} ms ({default_seconds / fast_seconds:.1f}x), "
+            f"{len(fast_body) / 1024:.0f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
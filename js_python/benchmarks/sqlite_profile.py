@@ -0,0 +1,92 @@
+"""Compare throughput of the SQLite engine profiles under concurrent load.
+
+Each profile gets a fresh file database. Writer threads insert tasks and
+commit one row at a time while reader threads list a project's tasks; the
+script reports operations per second and "database is locked" failures.
+
+    python -m benchmarks.sqlite_profile [--seconds 5] [--writers 4] [--readers 8]
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+import app.models as models
+from app.core.database import SQLITE_PROFILES, Base, create_database_engine
+
+
+def run_profile(profile: str, seconds: float, writers: int, readers: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_database_engine(f"sqlite:///{Path(tmp) / 'bench.db'}", profile=profile)
+        Base.metadata.create_all(bind=engine)
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        with SessionLocal() as db:
+            owner = models.User(username="owner", email="owner@example.com", hashed_password="x")
+            db.add(owner)
+            db.flush()
+            project = models.Project(name="Bench", owner_id=owner.id)
+            db.add(project)
+            db.commit()
+            project_id = project.id
+
+        counts = {"writes": 0, "reads": 0, "locked": 0}
+        lock = threading.Lock()
+        deadline = time.perf_counter() + seconds
+
+        def record(key: str) -> None:
+            with lock:
+                counts[key] += 1
+
+        def writer() -> None:
+            while time.perf_counter() < deadline:
+                with SessionLocal() as db:
+                    try:
+                        db.add(models.Task(title="bench", project_id=project_id))
+                        db.commit()
+                        record("writes")
+                    except OperationalError:
+                        db.rollback()
+                        record("locked")
+
+        def reader() -> None:
+            while time.perf_counter() < deadline:
+                with SessionLocal() as db:
+                    try:
+                        db.query(models.Task).filter(models.Task.project_id == project_id).limit(200).all()
+                        record("reads")
+                    except OperationalError:
+                        record("locked")
+
+        threads = [threading.Thread(target=writer) for _ in range(writers)]
+        threads += [threading.Thread(target=reader) for _ in range(readers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        engine.dispose()
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"{'profile':<12} {'writes/s':>10} {'reads/s':>10} {'locked':>8}")
+    for profile in SQLITE_PROFILES:
+        counts = run_profile(profile, args.seconds, args.writers, args.readers)
+        print(
+            f"{profile:<12} {counts['writes'] / args.seconds:>10.1f} "
+            f"{counts['reads'] / args.seconds:>10.1f} {counts['locked']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1453,8 +1453,18 @@ let taskCreationAssigneeIds = [];
 let projectSettingsUserIds = [];
 let dependencyMapData = null;
 let dependencyDataLoaded = false;
+const DEPENDENCY_GRAPH_PAGE_SIZE = 200;
+const DEPENDENCY_GRAPH_FOCUS_DEPTH = 2;
+let dependencyGraphProjectId = null;
+let dependencyGraphFocus = null;
+let dependencyGraphCursor = null;
+let dependencyGraphNodes = null;
+let dependencyGraphEdges = null;
 let notifications = [];
 let notificationsLoaded = false;
+let notificationStream = null;
+let notificationStreamConnected = false;
+let unreadNotificationCount = 0;
 let dashboardMetrics = null;
 let historyMonthCursor = new Date(new Date().getFullYear(), new Date().getMonth(), 1);
 let historyActivitiesByDay = {};
@@ -1466,6 +1476,8 @@ const currentUsernameEl = document.getElementById("current-username");
 const currentUserIcon = document.getElementById("current-user-icon"); // Added this
 const logoutBtn = document.getElementById("logout-btn");
 const projectsList = document.getElementById("projects-list");
+const projectSearchInput = document.getElementById("project-search");
+const searchResultsList = document.getElementById("search-results");
 const btnAddProject = document.getElementById("btn-add-project");
 const btnSelectUser = document.getElementById("btn-select-user");
 const btnAddTask = document.getElementById("btn-add-task");
@@ -1488,12 +1500,18 @@ const projectSettingsMessage = document.getElementById("project-settings-message
 const btnProjectSettingsUsers = document.getElementById("btn-project-settings-users");
 const notificationsList = document.getElementById("notifications-list");
 const btnRefreshNotifications = document.getElementById("btn-refresh-notifications");
+const btnMarkAllNotifications = document.getElementById("btn-mark-all-notifications");
+const notificationsUnreadBadge = document.getElementById("notifications-unread-badge");
 const dependencyChainsContainer = document.getElementById("dependency-chains");
 const dependencyConvergenceContainer = document.getElementById("dependency-convergences");
 const dependencyEdgesContainer = document.getElementById("dependency-edges");
 const dependencyDependentSelect = document.getElementById("dependency-dependent");
 const dependencyDependsOnSelect = document.getElementById("dependency-depends-on");
 const dependencyStatusText = document.getElementById("dependency-status-text");
+const dependencyGraphToolbar = document.getElementById("dependency-graph-toolbar");
+const dependencyGraphInfo = document.getElementById("dependency-graph-info");
+const btnDependencyGraphMore = document.getElementById("btn-dependency-graph-more");
+const btnDependencyGraphReset = document.getElementById("btn-dependency-graph-reset");
 const btnSaveSettings = document.getElementById("btn-save-settings"); // Added this
 const statusDonutCanvas = document.getElementById("status-donut-chart");
 const statusLegend = document.getElementById("status-legend");
@@ -1533,6 +1551,11 @@ const modalUserSelector = document.getElementById("modal-user-selector");
 const modalAddTask = document.getElementById("modal-add-task");
 const taskDetailPanel = document.getElementById("task-detail-panel");
 
+// Last ETag and body of each GET path, sent back as If-None-Match so unchanged
+// data comes back as an empty 304
+const MAX_CACHED_RESPONSES = 200;
+const cachedResponses = new Map();
+
 // API Request Helper
 async function apiRequest(path, options = {}) {
   const headers = options.headers || {};
@@ -1542,9 +1565,21 @@ async function apiRequest(path, options = {}) {
   if (!(options.body instanceof FormData)) {
     headers["Content-Type"] = "application/json";
   }
+  const isGet = !options.method || options.method.toUpperCase() === "GET";
+  const cached = isGet ? cachedResponses.get(path) : undefined;
+  if (cached) {
+    headers["If-None-Match"] = cached.etag;
+  }
 
   const response = await fetch(`${API_BASE}${path}`, { ...options, headers });
 
+  if (response.status === 304 && cached) {
+    // Most recently used last, so the oldest entry is evicted first
+    cachedResponses.delete(path);
+    cachedResponses.set(path, cached);
+    return JSON.parse(cached.body);
+  }
+
   if (!response.ok) {
     if (response.status === 401) {
       logoutUser();
@@ -1565,7 +1600,37 @@ async function apiRequest(path, options = {}) {
     return null;
   }
 
-  return response.json();
+  // Keep the raw body so callers never share (and mutate) the cached copy
+  const body = await response.text();
+  const etag = response.headers.get("ETag");
+  if (isGet && etag) {
+    cachedResponses.delete(path);
+    cachedResponses.set(path, { etag, body });
+    if (cachedResponses.size > MAX_CACHED_RESPONSES) {
+      cachedResponses.delete(cachedResponses.keys().next().value);
+    }
+  }
+  return JSON.parse(body);
+}
+
+// Page through a cursor-paginated list endpoint, reporting each page as it lands
+async function apiRequestAllPages(path, { pageSize = 200, onPage } = {}) {
+  const items = [];
+  let cursor = null;
+  do {
+    const params = new URLSearchParams({ limit: String(pageSize) });
+    if (cursor) {
+      params.set("cursor", cursor);
+    }
+    const separator = path.includes("?") ? "&" : "?";
+    const page = await apiRequest(`${path}${separator}${params.toString()}`);
+    items.push(...page.items);
+    cursor = page.next_cursor;
+    if (onPage) {
+      onPage(items);
+    }
+  } while (cursor);
+  return items;
 }
 
 // Authentication
@@ -1574,6 +1639,8 @@ function redirectToLogin() {
 }
 
 function logoutUser() {
+  closeNotificationStream();
+  cachedResponses.clear();
   token = null;
   currentUser = null;
   localStorage.removeItem("kanban_token");
@@ -1613,6 +1680,8 @@ async function initializeApp() {
 
 
     await loadProjects();
+    openNotificationStream();
+    loadUnreadNotificationCount();
 
     // Determine initial tab from URL hash
     const initialTab = getTabFromLocation();
@@ -1864,7 +1933,7 @@ function describeActivity(activity) {
 }
 
 function getFirstHistoryDateKey() {
-  const keys = Object.keys(historyActivitiesByDay);
+  const keys = Object.keys(historyDailyCounts);
   if (keys.length === 0) {
     return formatDateKey(new Date(historyMonthCursor));
   }
@@ -1899,10 +1968,13 @@ function renderHistoryCalendar() {
       dayEl.classList.add("selected");
     }
 
-    dayEl.addEventListener("click", () => {
+    dayEl.addEventListener("click", async () => {
       selectedHistoryDate = key;
       renderHistoryCalendar();
       renderHistoryList();
+      if (currentProject) {
+        await loadHistoryActivitiesForDay(currentProject.id, key);
+      }
     });
 
     historyCalendarGrid.appendChild(dayEl);
@@ -1924,9 +1996,19 @@ function renderHistoryList() {
   }
 
   historySelectedDateText.textContent = formatFullDateLabel(selectedHistoryDate);
-  const activities = historyActivitiesByDay[selectedHistoryDate] || [];
+  const activities = historyActivitiesByDay[selectedHistoryDate];
+  const dayCount = historyDailyCounts[selectedHistoryDate] || 0;
 
-  if (activities.length === 0) {
+  if (dayCount && !activities) {
+    historyListContainer.innerHTML = '<div class="empty-state">Loading activity...</div>';
+    return;
+  }
+  if (dayCount && activities.length === 0) {
+    // Older days are kept only as daily totals once activity history is compacted.
+    historyListContainer.innerHTML = `<div class="empty-state">${dayCount} task change(s) on this day. Details are no longer kept for older history.</div>`;
+    return;
+  }
+  if (!activities || activities.length === 0) {
     historyListContainer.innerHTML = '<div class="empty-state">No task changes for this day.</div>';
     return;
   }
@@ -1947,30 +2029,41 @@ function renderHistoryList() {
   });
 }
 
+async function loadHistoryActivitiesForDay(projectId, dateKey) {
+  if (!projectId || !dateKey || !historyDailyCounts[dateKey] || historyActivitiesByDay[dateKey]) return;
+  try {
+    const activities = await apiRequestAllPages(
+      `/projects/${projectId}/task-history/activities?date_filter=${encodeURIComponent(dateKey)}`
+    );
+    historyActivitiesByDay[dateKey] = activities;
+    if (selectedHistoryDate === dateKey) {
+      renderHistoryList();
+    }
+  } catch (error) {
+    console.error("Failed to load task history activities:", error);
+  }
+}
+
 async function loadHistoryForMonth(projectId) {
   if (!projectId || !historyCalendarGrid) return;
   try {
     const start = new Date(historyMonthCursor.getFullYear(), historyMonthCursor.getMonth(), 1);
     const end = new Date(historyMonthCursor.getFullYear(), historyMonthCursor.getMonth() + 1, 0);
+    // Only the per-day counts here; a day's activities are fetched when it is shown.
     const params = new URLSearchParams({
       start_date: formatDateKey(start),
       end_date: formatDateKey(end),
+      limit: "0",
     });
     const response = await apiRequest(`/projects/${projectId}/task-history?${params.toString()}`);
     historyDailyCounts = response.daily_counts || {};
     historyActivitiesByDay = {};
-    (response.activities || []).forEach((activity) => {
-      const key = formatDateKey(new Date(activity.created_at));
-      if (!historyActivitiesByDay[key]) {
-        historyActivitiesByDay[key] = [];
-      }
-      historyActivitiesByDay[key].push(activity);
-    });
-    if (!selectedHistoryDate || !historyActivitiesByDay[selectedHistoryDate]) {
-      selectedHistoryDate = Object.keys(historyActivitiesByDay).length > 0 ? getFirstHistoryDateKey() : formatDateKey(new Date(historyMonthCursor));
+    if (!selectedHistoryDate || !historyDailyCounts[selectedHistoryDate]) {
+      selectedHistoryDate = getFirstHistoryDateKey();
     }
     renderHistoryCalendar();
     renderHistoryList();
+    await loadHistoryActivitiesForDay(projectId, selectedHistoryDate);
   } catch (error) {
     console.error("Failed to load task history:", error);
   }
@@ -2010,7 +2103,14 @@ async function selectProject(projectId) {
 // Load Tasks
 async function loadTasks(projectId) {
   try {
-    allTasks = await apiRequest(`/projects/${projectId}/tasks`);
+    allTasks = await apiRequestAllPages(`/projects/${projectId}/tasks`, {
+      onPage: (items) => {
+        if (currentProject && currentProject.id === projectId) {
+          allTasks = items;
+          renderTaskBoard();
+        }
+      },
+    });
     renderTaskBoard();
   } catch (error) {
     console.error("Failed to load tasks:", error);
@@ -2939,54 +3039,17 @@ function renderDependencyView() {
     }
   }
   
-  // ADDED: Render the visual graph
-  renderVisGraph(dependencyMapData);
-}
-
-// ADDED: New function to render the vis.js graph
-function renderVisGraph(data) {
-  const container = document.getElementById("vis-graph-container");
-  if (!container) return;
-
-  if (!data || !data.tasks || data.tasks.length === 0) {
-    container.innerHTML = "<p style='padding: 20px; text-align: center; color: #94a3b8;'>No tasks to display in graph.</p>";
-    return;
+  // Render the visual graph: the selected project's server-side layout, or the whole map
+  if (currentProject) {
+    loadProjectDependencyGraph();
+  } else {
+    renderVisGraph(dependencyMapData);
   }
+}
 
-  // 1. Create nodes
-  const nodes = new vis.DataSet(
-    data.tasks.map(task => ({
-      id: task.id,
-      label: `${task.title}\n(${task.project_name})`,
-      group: task.project_id, // Group nodes by project
-    }))
-  );
-
-  // 2. Create edges
-  const edges = new vis.DataSet(
-    data.edges.map(edge => ({
-      from: edge.depends_on.id,
-      to: edge.dependent.id,
-      arrows: "to",
-    }))
-  );
-
-  // 3. Provide the data
-  const graphData = {
-    nodes: nodes,
-    edges: edges,
-  };
-
-  // 4. Define options
-  const options = {
-    layout: {
-      hierarchical: {
-        direction: "LR", // Left-to-Right
-        sortMethod: "directed",
-        levelSeparation: 200,
-        nodeSpacing: 100,
-      },
-    },
+function buildVisGraphOptions(layout) {
+  return {
+    layout,
     edges: {
       smooth: {
         type: 'cubicBezier',
@@ -3028,11 +3091,141 @@ function renderVisGraph(data) {
         zoomView: true
     }
   };
+}
+
+// Render the whole accessible map; vis.js computes the hierarchical layout
+function renderVisGraph(data) {
+  const container = document.getElementById("vis-graph-container");
+  if (!container) return;
+  if (dependencyGraphToolbar) dependencyGraphToolbar.classList.add("hidden");
+  dependencyGraphNodes = null;
+  dependencyGraphEdges = null;
+
+  if (!data || !data.tasks || data.tasks.length === 0) {
+    container.innerHTML = "<p style='padding: 20px; text-align: center; color: #94a3b8;'>No tasks to display in graph.</p>";
+    return;
+  }
+
+  // 1. Create nodes
+  const nodes = new vis.DataSet(
+    data.tasks.map(task => ({
+      id: task.id,
+      label: `${task.title}\n(${task.project_name})`,
+      group: task.project_id, // Group nodes by project
+    }))
+  );
+
+  // 2. Create edges
+  const edges = new vis.DataSet(data.edges.map(dependencyGraphEdgeData));
+
+  // 3. Provide the data
+  const graphData = {
+    nodes: nodes,
+    edges: edges,
+  };
+
+  // 4. Define options
+  const options = buildVisGraphOptions({
+    hierarchical: {
+      direction: "LR", // Left-to-Right
+      sortMethod: "directed",
+      levelSeparation: 200,
+      nodeSpacing: 100,
+    },
+  });
 
   // 5. Initialize the Network
   const network = new vis.Network(container, graphData, options);
 }
 
+function dependencyGraphNodeData(node) {
+  return {
+    id: node.id,
+    label: `${node.title}\n(${node.project_name})`,
+    x: node.x,
+    y: node.y,
+  };
+}
+
+function dependencyGraphEdgeData(edge) {
+  return {
+    id: edge.id,
+    from: edge.depends_on.id,
+    to: edge.dependent.id,
+    arrows: "to",
+  };
+}
+
+// Render the selected project's graph page by page, at the coordinates laid out by the server
+async function loadProjectDependencyGraph(append = false) {
+  const container = document.getElementById("vis-graph-container");
+  if (!container || !currentProject) return;
+
+  if (dependencyGraphProjectId !== currentProject.id) {
+    dependencyGraphProjectId = currentProject.id;
+    dependencyGraphFocus = null;
+  }
+
+  const params = new URLSearchParams({ limit: String(DEPENDENCY_GRAPH_PAGE_SIZE) });
+  if (dependencyGraphFocus) {
+    params.set("root_task_id", String(dependencyGraphFocus.taskId));
+    params.set("depth", String(dependencyGraphFocus.depth));
+  }
+  if (append && dependencyGraphCursor) {
+    params.set("cursor", dependencyGraphCursor);
+  }
+
+  let page;
+  try {
+    page = await apiRequest(`/projects/${currentProject.id}/dependency-map?${params.toString()}`);
+  } catch (error) {
+    container.innerHTML = `<p style='padding: 20px; text-align: center; color: #94a3b8;'>${escapeHtml(error.message)}</p>`;
+    return;
+  }
+
+  if (append && dependencyGraphNodes) {
+    dependencyGraphNodes.add(page.nodes.map(dependencyGraphNodeData));
+    dependencyGraphEdges.add(page.edges.map(dependencyGraphEdgeData));
+  } else if (page.nodes.length === 0) {
+    dependencyGraphNodes = null;
+    dependencyGraphEdges = null;
+    container.innerHTML = "<p style='padding: 20px; text-align: center; color: #94a3b8;'>No tasks to display in graph.</p>";
+  } else {
+    dependencyGraphNodes = new vis.DataSet(page.nodes.map(dependencyGraphNodeData));
+    dependencyGraphEdges = new vis.DataSet(page.edges.map(dependencyGraphEdgeData));
+    const network = new vis.Network(
+      container,
+      { nodes: dependencyGraphNodes, edges: dependencyGraphEdges },
+      buildVisGraphOptions({ hierarchical: false })
+    );
+    // Double-click a task to focus on its neighbourhood, or the background to show the whole project
+    network.on("doubleClick", (event) => {
+      dependencyGraphFocus = event.nodes.length > 0
+        ? { taskId: event.nodes[0], depth: DEPENDENCY_GRAPH_FOCUS_DEPTH }
+        : null;
+      loadProjectDependencyGraph();
+    });
+  }
+
+  dependencyGraphCursor = page.next_cursor;
+  updateDependencyGraphToolbar(page);
+}
+
+function updateDependencyGraphToolbar(page) {
+  if (!dependencyGraphToolbar) return;
+  dependencyGraphToolbar.classList.remove("hidden");
+  if (dependencyGraphInfo) {
+    const shown = dependencyGraphNodes ? dependencyGraphNodes.length : 0;
+    const scope = dependencyGraphFocus
+      ? `Tasks within ${dependencyGraphFocus.depth} links of #${dependencyGraphFocus.taskId}`
+      : currentProject.name;
+    dependencyGraphInfo.textContent =
+      `${scope}: showing ${shown} of ${page.total_nodes} tasks in ${page.levels} levels. Double-click a task to focus on it.`;
+  }
+  if (btnDependencyGraphMore) btnDependencyGraphMore.classList.toggle("hidden", !dependencyGraphCursor);
+  if (btnDependencyGraphReset) btnDependencyGraphReset.classList.toggle("hidden", !dependencyGraphFocus);
+}
+
 
 async function handleAddDependency(event) {
   event.preventDefault();
@@ -3087,7 +3280,12 @@ async function loadNotifications(force = false) {
     return;
   }
   try {
-    notifications = await apiRequest("/notifications");
+    notifications = await apiRequestAllPages("/notifications", {
+      onPage: (items) => {
+        notifications = items;
+        renderNotifications();
+      },
+    });
     notificationsLoaded = true;
     renderNotifications();
   } catch (error) {
@@ -3098,6 +3296,67 @@ async function loadNotifications(force = false) {
   }
 }
 
+// Real-time notifications pushed over Server-Sent Events
+function openNotificationStream() {
+  if (!token || typeof EventSource === "undefined" || notificationStream) return;
+  notificationStream = new EventSource(`${API_BASE}/notifications/stream?access_token=${encodeURIComponent(token)}`);
+  notificationStream.addEventListener("open", () => {
+    notificationStreamConnected = true;
+  });
+  notificationStream.addEventListener("error", () => {
+    // The browser reconnects on its own; refetch once it does, since deltas may have been missed
+    notificationStreamConnected = false;
+    notificationsLoaded = false;
+  });
+  notificationStream.addEventListener("notification", (event) => {
+    const notification = JSON.parse(event.data);
+    setUnreadNotificationCount(unreadNotificationCount + 1);
+    if (!notificationsLoaded) return;
+    notifications = [notification, ...notifications.filter((n) => n.id !== notification.id)];
+    if (notificationsView && !notificationsView.classList.contains("hidden")) {
+      renderNotifications();
+    }
+  });
+}
+
+function setUnreadNotificationCount(count) {
+  unreadNotificationCount = Math.max(0, count);
+  if (!notificationsUnreadBadge) return;
+  notificationsUnreadBadge.textContent = String(unreadNotificationCount);
+  notificationsUnreadBadge.classList.toggle("hidden", unreadNotificationCount === 0);
+}
+
+async function loadUnreadNotificationCount() {
+  try {
+    const response = await apiRequest("/notifications/unread-count");
+    setUnreadNotificationCount(response.unread);
+  } catch (error) {
+    console.error("Failed to load unread notification count:", error);
+  }
+}
+
+async function markAllNotificationsRead() {
+  try {
+    await apiRequest("/notifications/read", {
+      method: "POST",
+      body: JSON.stringify({ all: true }),
+    });
+    notifications = notifications.map((n) => ({ ...n, read: true }));
+    setUnreadNotificationCount(0);
+    renderNotifications();
+  } catch (error) {
+    alert("Failed to update notifications: " + error.message);
+  }
+}
+
+function closeNotificationStream() {
+  if (notificationStream) {
+    notificationStream.close();
+    notificationStream = null;
+  }
+  notificationStreamConnected = false;
+}
+
 function renderNotifications() {
   if (!notificationsList) return;
   notificationsList.innerHTML = "";
@@ -3161,7 +3420,13 @@ async function markNotificationRead(notificationId) {
     const updated = await apiRequest(`/notifications/${notificationId}/read`, {
       method: "POST",
     });
+    // Checked after the request returns, so a second click that raced the
+    // first one finds the item already read and leaves the badge alone.
+    const wasUnread = notifications.some((n) => n.id === notificationId && !n.read);
     notifications = notifications.map((n) => (n.id === notificationId ? updated : n));
+    if (wasUnread) {
+      setUnreadNotificationCount(unreadNotificationCount - 1);
+    }
     renderNotifications();
   } catch (error) {
     alert("Failed to update notification: " + error.message);
@@ -3213,7 +3478,8 @@ function showTabView(tabName) {
     loadDependencyData(true); // Always refresh
   } else if (tabName === "notifications" && notificationsView) {
     notificationsView.classList.remove("hidden");
-    loadNotifications(true); // Always refresh
+    // The push stream keeps the list current; only refetch when it is not connected
+    loadNotifications(!notificationStreamConnected);
   }
   
   // Update active tab
@@ -3347,8 +3613,26 @@ if (formAddDependency) {
   formAddDependency.addEventListener("submit", handleAddDependency);
 }
 
+if (btnDependencyGraphMore) {
+  btnDependencyGraphMore.addEventListener("click", () => loadProjectDependencyGraph(true));
+}
+
+if (btnDependencyGraphReset) {
+  btnDependencyGraphReset.addEventListener("click", () => {
+    dependencyGraphFocus = null;
+    loadProjectDependencyGraph();
+  });
+}
+
 if (btnRefreshNotifications) {
-  btnRefreshNotifications.addEventListener("click", () => loadNotifications(true));
+  btnRefreshNotifications.addEventListener("click", () => {
+    loadNotifications(true);
+    loadUnreadNotificationCount();
+  });
+}
+
+if (btnMarkAllNotifications) {
+  btnMarkAllNotifications.addEventListener("click", markAllNotificationsRead);
 }
 
 const btnUserSelectorApply = document.getElementById("btn-user-selector-apply");
@@ -3442,6 +3726,89 @@ if (formAddComment) {
   });
 }
 
+// Full-text search across all accessible projects (GET /search)
+const SEARCH_DEBOUNCE_MS = 250;
+const SEARCH_PAGE_SIZE = 20;
+let searchTimer = null;
+let searchSequence = 0;
+
+function hideSearchResults() {
+  if (!searchResultsList) return;
+  searchResultsList.innerHTML = "";
+  searchResultsList.classList.add("hidden");
+}
+
+async function runSearch(query) {
+  const sequence = ++searchSequence;
+  const params = new URLSearchParams({ q: query, limit: String(SEARCH_PAGE_SIZE) });
+  try {
+    const page = await apiRequest(`/search?${params.toString()}`);
+    // A newer query was typed while this one was in flight
+    if (sequence !== searchSequence) return;
+    renderSearchResults(page.items);
+  } catch (error) {
+    if (sequence !== searchSequence) return;
+    console.error("Search failed:", error);
+    renderSearchResults([], "Search is unavailable");
+  }
+}
+
+function renderSearchResults(items, emptyMessage = "No matches") {
+  if (!searchResultsList) return;
+  searchResultsList.innerHTML = "";
+  searchResultsList.classList.remove("hidden");
+
+  if (items.length === 0) {
+    const empty = document.createElement("li");
+    empty.className = "search-result empty";
+    empty.textContent = emptyMessage;
+    searchResultsList.appendChild(empty);
+    return;
+  }
+
+  items.forEach((hit) => {
+    const item = document.createElement("li");
+    item.className = "search-result";
+    const kind = hit.kind === "comment" ? "Comment" : "Task";
+    // The server escapes the snippet text and only adds <mark> around matches
+    item.innerHTML = `
+      <div class="search-result-meta">${kind} • ${escapeHtml(hit.project_name)} → ${escapeHtml(hit.task_title)}</div>
+      <div class="search-result-snippet">${hit.snippet}</div>
+    `;
+    item.addEventListener("click", () => openSearchResult(hit));
+    searchResultsList.appendChild(item);
+  });
+}
+
+async function openSearchResult(hit) {
+  hideSearchResults();
+  if (projectSearchInput) projectSearchInput.value = "";
+  await selectProject(hit.project_id);
+  window.location.hash = "taskboard";
+  showTabView("taskboard");
+  await openTaskDetail(hit.task_id);
+}
+
+if (projectSearchInput) {
+  projectSearchInput.addEventListener("input", () => {
+    clearTimeout(searchTimer);
+    const query = projectSearchInput.value.trim();
+    if (!query) {
+      searchSequence++;
+      hideSearchResults();
+      return;
+    }
+    searchTimer = setTimeout(() => runSearch(query), SEARCH_DEBOUNCE_MS);
+  });
+  projectSearchInput.addEventListener("keydown", (event) => {
+    if (event.key === "Escape") {
+      projectSearchInput.value = "";
+      searchSequence++;
+      hideSearchResults();
+    }
+  });
+}
+
 // User Search in Modal
 const userSearchInput = document.getElementById("user-search");
 if (userSearchInput) {
@@ -0,0 +1,109 @@
+"""Maintenance commands for the DSBP backend.
+
+    python manage.py <command> [options]
+"""
+
+import argparse
+import sys
+
+import app.core  # noqa: F401  (import order matches main.py)
+from app.core import compression, migrations
+from app.core.database import Base, SessionLocal, engine
+from app.core.config import COMPRESSION_MINIMUM_SIZE, STATIC_FILES_DIR, TASK_ACTIVITY_RETENTION_DAYS
+from app.services import activity_history, dependency_graph, status_counts
+
+
+def migrate(args: argparse.Namespace) -> None:
+    """Apply pending schema migrations (also run on application start)."""
+    ran = migrations.upgrade(engine)
+    for name in ran:
+        print(f"Applied {name}")
+    print(f"Database is at version {max(migrations.applied_versions(engine))}")
+
+
+def rebuild_dependency_closure(args: argparse.Namespace) -> None:
+    """Recompute the task dependency closure table from task_dependencies."""
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        rows = dependency_graph.recreate(connection)
+    print(f"Rebuilt dependency closure with {rows} row(s)")
+
+
+def check_status_counts(args: argparse.Namespace) -> int:
+    """Verify the dashboard status counters against the tasks table (optionally rebuild them)."""
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        mismatches = status_counts.check(db)
+        for project_id, status, stored, actual in mismatches:
+            print(f"project {project_id} status {status!r}: stored {stored}, actual {actual}")
+        if not mismatches:
+            print("Status counters match the tasks table")
+            return 0
+        if not args.rebuild:
+            print(f"{len(mismatches)} mismatched counter(s); rerun with --rebuild to fix them")
+            return 1
+        rows = status_counts.rebuild(db)
+        db.commit()
+    print(f"Rebuilt status counters with {rows} row(s)")
+    return 0
+
+
+def compact_activities(args: argparse.Namespace) -> None:
+    """Roll task activities older than the retention period into daily counts and delete them."""
+    Base.metadata.create_all(bind=engine)
+    cutoff = activity_history.retention_cutoff(args.days)
+    with SessionLocal() as db:
+        purged, rolled = activity_history.compact(db, cutoff)
+        db.commit()
+    print(f"Compacted {purged} activity record(s) before {cutoff:%Y-%m-%d} into {rolled} daily row(s)")
+
+
+def compress_assets(args: argparse.Namespace) -> None:
+    """Write .gz (and .br with brotli installed) siblings of the frontend assets."""
+    written = compression.precompress(STATIC_FILES_DIR, args.minimum_size)
+    encodings = ".gz and .br" if compression.brotli is not None else ".gz"
+    print(f"Wrote {written} compressed file(s) ({encodings}) under {STATIC_FILES_DIR}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="DSBP maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("migrate", help=migrate.__doc__)
+    command.set_defaults(handler=migrate)
+
+    command = commands.add_parser("rebuild-dependency-closure", help=rebuild_dependency_closure.__doc__)
+    command.set_defaults(handler=rebuild_dependency_closure)
+
+    command = commands.add_parser("check-status-counts", help=check_status_counts.__doc__)
+    command.add_argument("--rebuild", action="store_true", help="recompute the counters when they disagree")
+    command.set_defaults(handler=check_status_counts)
+
+    command = commands.add_parser("compact-activities", help=compact_activities.__doc__)
+    command.add_argument(
+        "--days",
+        type=int,
+        default=TASK_ACTIVITY_RETENTION_DAYS,
+        help=f"days of raw history to keep (default {TASK_ACTIVITY_RETENTION_DAYS})",
+    )
+    command.set_defaults(handler=compact_activities)
+
+    command = commands.add_parser("compress-assets", help=compress_assets.__doc__)
+    command.add_argument(
+        "--minimum-size",
+        type=int,
+        default=COMPRESSION_MINIMUM_SIZE,
+        help=f"skip files smaller than this many bytes (default {COMPRESSION_MINIMUM_SIZE})",
+    )
+    command.set_defaults(handler=compress_assets)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
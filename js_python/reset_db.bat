@@ -21,6 +21,8 @@ REM Delete old database
 if exist "data\dsbp.db" (
     echo Found old database file. Deleting...
     del "data\dsbp.db"
+    if exist "data\dsbp.db-wal" del "data\dsbp.db-wal"
+    if exist "data\dsbp.db-shm" del "data\dsbp.db-shm"
     echo Old database deleted.
 ) else (
     echo No old database found.
@@ -20,7 +20,7 @@ echo ""
 # Delete old database
 if [ -f "data/dsbp.db" ]; then
     echo "Found old database file. Deleting..."
-    rm "data/dsbp.db"
+    rm -f "data/dsbp.db" "data/dsbp.db-wal" "data/dsbp.db-shm"
     echo "Old database deleted."
 else
     echo "No old database found."
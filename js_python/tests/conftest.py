@@ -0,0 +1,292 @@
+"""Shared pytest setup, fixtures and database helpers.
+
+The benchmark scripts reuse the helpers below, so the dataset and the query
+budgets they report on are the ones the tests enforce.
+"""
+
+import asyncio
+import inspect
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# The tests build their own databases; never touch the development one.
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{Path(tempfile.mkdtemp()) / 'tests.db'}")
+
+import app.core  # noqa: E402,F401  (import order matches main.py)
+
+from fastapi import Response  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+from starlette.requests import Request  # noqa: E402
+
+import app.models as models  # noqa: E402
+import app.schemas as schemas  # noqa: E402
+from app.api import routes  # noqa: E402
+from app.core.database import Base  # noqa: E402
+from app.services.dependency_map import dependency_map_cache  # noqa: E402
+from app.services.project_access import project_access_cache  # noqa: E402
+
+
+def make_session_factory(url: str = "sqlite://"):
+    """Create an isolated engine/sessionmaker pair with the full schema."""
+    kwargs = {"connect_args": {"check_same_thread": False}}
+    if url in ("sqlite://", "sqlite:///:memory:"):
+        kwargs["poolclass"] = StaticPool
+    engine = create_engine(url, **kwargs)
+    Base.metadata.create_all(bind=engine)
+    return engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def make_async_session_factory(url: str):
+    """Create an asyncio engine/sessionmaker pair for an existing database file."""
+    engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://", 1))
+    return engine, async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+
+def get_request(path: str) -> Request:
+    """A plain GET request without validators, for calling route handlers directly."""
+    return Request({"type": "http", "method": "GET", "path": path, "headers": []})
+
+
+class QueryCounter:
+    """Count the SQL statements an engine executes while the context is active."""
+
+    def __init__(self, engine):
+        self.engine = getattr(engine, "sync_engine", engine)
+        self.statements: List[str] = []
+        self.parameters: List[Any] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+        self.parameters.append(parameters[0] if executemany else parameters)
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+def serialize(schema, value):
+    """Validate ORM objects against a response schema like FastAPI does.
+
+    Handlers that return a ``Response`` (such as ``ModelResponse``) have
+    rendered their body already.
+    """
+    if isinstance(value, Response):
+        return value
+    return TypeAdapter(schema).validate_python(value, from_attributes=True)
+
+
+def seed(
+    db,
+    *,
+    users: int = 10,
+    projects: int = 3,
+    tasks_per_project: int = 50,
+    assignees_per_task: int = 2,
+    comments_per_task: int = 2,
+):
+    """Populate a session with a predictable dataset and return the users."""
+    user_rows = [
+        models.User(username=f"user{i}", email=f"user{i}@example.com", hashed_password="x")
+        for i in range(users)
+    ]
+    db.add_all(user_rows)
+    db.flush()
+
+    for p in range(projects):
+        owner = user_rows[p % users]
+        project = models.Project(
+            name=f"Project {p}",
+            owner_id=owner.id,
+            visibility="selected" if p % 2 else "all",
+        )
+        project.shared_users = [u for u in user_rows if u.id != owner.id][:3]
+        db.add(project)
+        db.flush()
+        for t in range(tasks_per_project):
+            task = models.Task(title=f"Task {p}-{t}", project_id=project.id, status="new_task")
+            task.assignees = [user_rows[(t + k) % users] for k in range(assignees_per_task)]
+            db.add(task)
+            db.flush()
+            parent = None
+            for c in range(comments_per_task):
+                comment = models.Comment(
+                    content=f"Comment {c} @{user_rows[c % users].username}",
+                    task_id=task.id,
+                    author_id=user_rows[(t + c) % users].id,
+                    parent_id=parent.id if parent else None,
+                )
+                db.add(comment)
+                db.flush()
+                db.add(
+                    models.Notification(
+                        recipient_id=user_rows[c % users].id,
+                        comment_id=comment.id,
+                        message="mentioned you",
+                    )
+                )
+                parent = comment
+    db.commit()
+    return user_rows
+
+
+# endpoint name -> maximum statements, including the access check, the scope
+# version lookup for the ETag and serialization. selectin loads batch 500
+# parent ids per IN clause, so /tasks may use one extra statement per 500
+# tasks on the large dataset. The accessible-project cache starts empty, so
+# list_projects (measured first) pays for loading it and the others hit it.
+QUERY_BUDGETS: Dict[str, int] = {
+    "list_projects": 4,
+    "list_tasks": 5,
+    "list_all_accessible_tasks": 5,
+    "list_comments": 5,
+    "list_notifications": 2,
+    "dependency_map": 4,
+    "project_dashboard_summary": 4,
+}
+
+
+def budget_endpoints(db, adb, user, project_id: int, task_id: int) -> Dict[str, Tuple[Callable, object]]:
+    """Map endpoint names to a zero-argument call and the response schema.
+
+    Async handlers receive the asyncio session ``adb``; sync ones receive ``db``.
+    """
+    return {
+        "list_projects": (
+            lambda: routes.list_projects(
+                request=get_request("/projects"), response=Response(), db=adb, current_user=user
+            ),
+            List[schemas.ProjectOut],
+        ),
+        "list_tasks": (
+            lambda: routes.list_tasks(
+                project_id=project_id,
+                request=get_request(f"/projects/{project_id}/tasks"),
+                response=Response(),
+                limit=None,
+                cursor=None,
+                db=adb,
+                current_user=user,
+            ),
+            List[schemas.TaskOut],
+        ),
+        "list_all_accessible_tasks": (
+            lambda: routes.list_all_accessible_tasks(
+                request=get_request("/tasks"), response=Response(), limit=None, cursor=None, db=adb, current_user=user
+            ),
+            List[schemas.TaskOut],
+        ),
+        "list_comments": (
+            lambda: routes.list_comments(
+                task_id=task_id,
+                request=get_request(f"/tasks/{task_id}/comments"),
+                response=Response(),
+                depth=None,
+                limit=None,
+                cursor=None,
+                db=db,
+                current_user=user,
+            ),
+            List[schemas.CommentOut],
+        ),
+        "list_notifications": (
+            lambda: routes.list_notifications(
+                request=get_request("/notifications"),
+                response=Response(),
+                limit=None,
+                cursor=None,
+                db=adb,
+                current_user=user,
+            ),
+            List[schemas.NotificationOut],
+        ),
+        "project_dashboard_summary": (
+            lambda: routes.project_dashboard_summary(
+                project_id=project_id,
+                request=get_request(f"/projects/{project_id}/dashboard"),
+                response=Response(),
+                db=db,
+                current_user=user,
+            ),
+            schemas.ProjectDashboardOut,
+        ),
+        # Measured cold: the process-wide map cache is emptied first.
+        "dependency_map": (
+            lambda: (
+                dependency_map_cache.clear(),
+                routes.dependency_map(
+                    request=get_request("/dependency-map"),
+                    response=Response(),
+                    db=db,
+                    current_user=user,
+                ),
+            )[1],
+            schemas.DependencyMapOut,
+        ),
+    }
+
+
+async def measure_statements(tasks_per_project: int) -> Dict[str, int]:
+    """Return the statement count of each endpoint for a seeded dataset."""
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{Path(tmp) / 'budget.db'}"
+        engine, SessionLocal = make_session_factory(url)
+        async_engine, AsyncSessionLocal = make_async_session_factory(url)
+        counts: Dict[str, int] = {}
+        project_access_cache.clear()
+        with SessionLocal() as db:
+            users = seed(db, tasks_per_project=tasks_per_project)
+            user = users[1]
+            project = user.shared_projects[0]
+            task = project.tasks[0]
+            async with AsyncSessionLocal() as adb:
+                for name, (call, schema) in budget_endpoints(db, adb, user, project.id, task.id).items():
+                    db.expire_all()
+                    user.id  # reload the principal, as get_current_user would
+                    with QueryCounter(engine) as counter, QueryCounter(async_engine) as async_counter:
+                        result = call()
+                        if inspect.iscoroutine(result):
+                            result = await result
+                        serialize(schema, result)
+                    counts[name] = counter.count + async_counter.count
+        await async_engine.dispose()
+        engine.dispose()
+    return counts
+
+
+@pytest.fixture
+def session_factory():
+    """A sessionmaker bound to a fresh in-memory database with the full schema."""
+    engine, SessionLocal = make_session_factory()
+    yield SessionLocal
+    engine.dispose()
+
+
+@pytest.fixture
+def query_budgets() -> Dict[str, int]:
+    return QUERY_BUDGETS
+
+
+@pytest.fixture(scope="module", params=[5, 200], ids=lambda size: f"{size}-tasks-per-project")
+def statement_counts(request) -> Dict[str, int]:
+    """Statement count of each budgeted endpoint on a small and a large dataset."""
+    return asyncio.run(measure_statements(request.param))
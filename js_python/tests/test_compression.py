@@ -0,0 +1,72 @@
+"""Response compression skips event streams; static files use precompressed siblings."""
+
+import os
+
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Mount, Route
+from starlette.testclient import TestClient
+
+from app.core import compression
+
+
+async def events(request):
+    async def stream():
+        for i in range(200):
+            yield f"data: {i}\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+
+def make_client(static_dir) -> TestClient:
+    app = Starlette(
+        routes=[
+            Route("/stream", events),
+            Route("/other-stream", events),
+            Route("/text", lambda request: PlainTextResponse("x" * 5000)),
+            Route("/small", lambda request: PlainTextResponse("x" * 10)),
+            Mount("/static", compression.PrecompressedStaticFiles(directory=str(static_dir))),
+        ]
+    )
+    app.add_middleware(compression.CompressionMiddleware, minimum_size=100, excluded_paths=["/stream"])
+    return TestClient(app)
+
+
+def test_large_responses_are_compressed(tmp_path):
+    client = make_client(tmp_path)
+    assert client.get("/text").headers.get("content-encoding") == "gzip"
+    assert client.get("/small").headers.get("content-encoding") is None
+
+
+def test_event_streams_are_not_compressed(tmp_path):
+    client = make_client(tmp_path)
+    response = client.get("/stream")
+    assert response.headers.get("content-encoding") is None
+    assert response.text.startswith("data: 0\n\n")
+    # Any path, when the client asks for an event stream as EventSource does.
+    response = client.get("/other-stream", headers={"Accept": "text/event-stream"})
+    assert response.headers.get("content-encoding") is None
+
+
+def test_static_files_served_from_fresh_siblings(tmp_path):
+    source = tmp_path / "app.js"
+    source.write_text("console.log('hello');\n" * 200)
+    assert compression.precompress(tmp_path) >= 1
+    assert compression.precompress(tmp_path) == 0  # already up to date
+    client = make_client(tmp_path)
+
+    response = client.get("/static/app.js")
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-type"].startswith("text/javascript")
+    assert "accept-encoding" in response.headers["vary"].lower()
+    assert int(response.headers["content-length"]) == (tmp_path / "app.js.gz").stat().st_size
+    assert client.get("/static/app.js", headers={"If-None-Match": response.headers["etag"]}).status_code == 304
+
+    plain = client.get("/static/app.js", headers={"Accept-Encoding": "identity"})
+    assert plain.headers.get("content-encoding") is None
+
+    # An edited source is newer than its sibling, which is then ignored.
+    source.write_text("console.log('edited');\n" * 200)
+    stat = source.stat()
+    os.utime(source, (stat.st_atime, stat.st_mtime + 10))
+    assert client.get("/static/app.js").text == source.read_text()
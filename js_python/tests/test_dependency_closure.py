@@ -0,0 +1,101 @@
+"""The incrementally maintained dependency closure matches a full recomputation."""
+
+import random
+
+import pytest
+from sqlalchemy import insert, select
+
+import app.models as models
+from app.services import dependency_graph
+
+
+@pytest.fixture
+def db(session_factory):
+    with session_factory() as session:
+        yield session
+
+
+def make_tasks(db, count: int):
+    owner = models.User(username="owner", email="owner@example.com", hashed_password="x")
+    db.add(owner)
+    db.flush()
+    project = models.Project(name="Graph", owner_id=owner.id)
+    db.add(project)
+    db.flush()
+    return list(
+        db.scalars(
+            insert(models.Task).returning(models.Task.id, sort_by_parameter_order=True),
+            [{"title": f"T{i}", "project_id": project.id} for i in range(count)],
+        )
+    )
+
+
+def add_edge(db, upstream: int, downstream: int) -> models.TaskDependency:
+    edge = models.TaskDependency(depends_on_task_id=upstream, dependent_task_id=downstream)
+    db.add(edge)
+    db.flush()
+    return edge
+
+
+def assert_closure_exact(db):
+    edges = db.execute(
+        select(models.TaskDependency.depends_on_task_id, models.TaskDependency.dependent_task_id)
+    ).all()
+    closure = dependency_graph.closure
+    stored = {
+        (row.ancestor_id, row.descendant_id): row.depth
+        for row in db.execute(select(closure.c.ancestor_id, closure.c.descendant_id, closure.c.depth))
+    }
+    assert stored == dependency_graph.closure_of_edges(edges)
+
+
+def test_random_edge_inserts_and_deletes(db):
+    rng = random.Random(7)
+    tasks = make_tasks(db, 30)
+    edges = {}
+    for _ in range(300):
+        if edges and rng.random() < 0.4:
+            db.delete(edges.pop(rng.choice(sorted(edges))))
+            db.flush()
+        else:
+            # Edges only point forward in creation order, so the graph stays acyclic.
+            a, b = sorted(rng.sample(range(len(tasks)), 2))
+            if (a, b) not in edges:
+                edges[(a, b)] = add_edge(db, tasks[a], tasks[b])
+        assert_closure_exact(db)
+
+
+def test_several_edges_deleted_in_one_flush(db):
+    rng = random.Random(11)
+    tasks = make_tasks(db, 25)
+    edges = {}
+    while len(edges) < 60:
+        a, b = sorted(rng.sample(range(len(tasks)), 2))
+        if (a, b) not in edges:
+            edges[(a, b)] = add_edge(db, tasks[a], tasks[b])
+    for _ in range(4):
+        for key in rng.sample(sorted(edges), 8):
+            db.delete(edges.pop(key))
+        db.flush()
+        assert_closure_exact(db)
+
+
+def test_deep_diamond_graph(db):
+    # Path counts double with every layer of this graph; depths stay small.
+    layers = 70
+    tasks = make_tasks(db, 3 * layers + 1)
+    joints = tasks[::3]
+    edges = []
+    for layer in range(layers):
+        top, left, right, bottom = joints[layer], tasks[3 * layer + 1], tasks[3 * layer + 2], joints[layer + 1]
+        edges += [add_edge(db, top, left), add_edge(db, top, right), add_edge(db, left, bottom), add_edge(db, right, bottom)]
+    assert dependency_graph.downstream_task_ids(db, joints[0]) >= set(joints[1:])
+
+    db.delete(edges[0])
+    db.flush()
+    assert_closure_exact(db)
+    db.delete(edges[1])
+    db.flush()
+    assert_closure_exact(db)
+    assert not dependency_graph.would_create_cycle(db, joints[-1], joints[0])
+    assert dependency_graph.upstream_task_ids(db, joints[1]) == {tasks[1], tasks[2]}
@@ -0,0 +1,15 @@
+"""Each application instance owns its password hashing pool."""
+
+from fastapi.testclient import TestClient
+
+from app.core.app import create_app
+
+
+def test_pool_survives_an_earlier_app_shutdown():
+    for attempt in range(2):
+        with TestClient(create_app()) as client:
+            response = client.post(
+                "/auth/register",
+                json={"username": f"pool{attempt}", "email": f"pool{attempt}@example.com", "password": "secret123"},
+            )
+            assert response.status_code == 201, response.text
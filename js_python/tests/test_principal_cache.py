@@ -0,0 +1,37 @@
+"""Cached principals are evicted when a change to their user commits, not before."""
+
+import time
+
+import pytest
+
+import app.models as models
+from app.services import auth
+
+
+@pytest.fixture
+def cached_user(session_factory):
+    auth.principal_cache.clear()
+    with session_factory() as db:
+        user = models.User(username="alice", email="alice@example.com", hashed_password="x")
+        db.add(user)
+        db.commit()
+        auth.principal_cache.put("token", user, time.time() + 3600)
+        yield db, user
+    auth.principal_cache.clear()
+
+
+def test_rolled_back_change_keeps_entry(cached_user):
+    db, user = cached_user
+    user.email = "changed@example.com"
+    db.flush()
+    db.rollback()
+    assert auth.principal_cache.get("token")["email"] == "alice@example.com"
+
+
+def test_committed_change_evicts_entry(cached_user):
+    db, user = cached_user
+    user.email = "changed@example.com"
+    db.flush()
+    assert auth.principal_cache.get("token") is not None
+    db.commit()
+    assert auth.principal_cache.get("token") is None
@@ -0,0 +1,87 @@
+"""Cached visible-project sets are reloaded only for the users a change affects."""
+
+import pytest
+
+import app.models as models
+from app.services.project_access import ProjectAccessCache, load_visible_project_ids
+
+
+@pytest.fixture
+def db(session_factory):
+    with session_factory() as session:
+        session.add_all(
+            models.User(username=name, email=f"{name}@example.com", hashed_password="x")
+            for name in ("owner", "guest", "other")
+        )
+        session.commit()
+        yield session
+
+
+def users(db):
+    return {user.username: user for user in db.query(models.User)}
+
+
+def assert_cache_exact(db, cache):
+    for user in users(db).values():
+        assert cache.visible_project_ids(db, user.id) == load_visible_project_ids(db, user.id)
+
+
+def test_edit_that_does_not_change_access_keeps_entries(db):
+    u = users(db)
+    project = models.Project(name="P", owner_id=u["owner"].id, visibility="all")
+    db.add(project)
+    db.commit()
+    cache = ProjectAccessCache(max_users=10)
+    assert_cache_exact(db, cache)
+    loads = cache.loads
+
+    project.description = "edited"
+    project.name = "Renamed"
+    db.commit()
+    assert_cache_exact(db, cache)
+    assert cache.loads == loads
+
+
+def test_sharing_reloads_only_the_affected_user(db):
+    u = users(db)
+    project = models.Project(name="P", owner_id=u["owner"].id, visibility="selected")
+    db.add(project)
+    db.commit()
+    cache = ProjectAccessCache(max_users=10)
+    assert_cache_exact(db, cache)
+    loads = cache.loads
+
+    project.shared_users.append(u["guest"])
+    db.commit()
+    assert project.id in cache.visible_project_ids(db, u["guest"].id)
+    assert cache.loads == loads + 1
+    assert_cache_exact(db, cache)
+    assert cache.loads == loads + 1
+
+    project.shared_users.clear()
+    db.commit()
+    assert_cache_exact(db, cache)
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda db, project, u: setattr(project, "visibility", "private"),
+        lambda db, project, u: setattr(project, "owner_id", u["other"].id),
+        lambda db, project, u: db.delete(project),
+    ],
+    ids=["visibility", "owner", "delete"],
+)
+def test_access_changes_reach_every_affected_user(db, change):
+    u = users(db)
+    public = models.Project(name="Public", owner_id=u["owner"].id, visibility="all")
+    shared = models.Project(name="Shared", owner_id=u["owner"].id, visibility="selected", shared_users=[u["guest"]])
+    db.add_all([public, shared])
+    db.commit()
+    cache = ProjectAccessCache(max_users=10)
+    assert_cache_exact(db, cache)
+
+    for project in (public, shared):
+        change(db, project, u)
+        db.commit()
+        assert_cache_exact(db, cache)
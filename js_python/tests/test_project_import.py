@@ -0,0 +1,66 @@
+"""Malformed NDJSON imports are rejected with a ValueError naming the line."""
+
+import json
+
+import pytest
+
+import app.models as models
+from app.services import project_transfer
+
+HEADER = {"type": "header", "format": project_transfer.FORMAT, "version": project_transfer.VERSION}
+PROJECT = {"type": "project", "name": "Imported"}
+TASK = {"type": "task", "id": 1, "title": "First"}
+COMMENT = {"type": "comment", "id": 1, "task_id": 1, "content": "hello"}
+
+
+@pytest.fixture
+def importer(session_factory):
+    with session_factory() as db:
+        owner = models.User(username="owner", email="owner@example.com", hashed_password="x")
+        db.add(owner)
+        db.flush()
+        yield project_transfer.ProjectImporter(db, owner)
+
+
+def run(importer, *records):
+    importer.feed_lines(json.dumps(record).encode() for record in records)
+    return importer.finish()
+
+
+def test_valid_export_imports(importer):
+    counts = run(
+        importer,
+        HEADER,
+        PROJECT,
+        TASK,
+        {"type": "task", "id": 2, "title": "Second", "created_at": "2024-05-01T10:00:00"},
+        {"type": "dependency", "depends_on_task_id": 1, "dependent_task_id": 2},
+        COMMENT,
+        {"type": "comment", "id": 2, "task_id": 1, "parent_id": 1, "content": "reply"},
+        {"type": "activity", "task_id": 1, "action": "created", "created_at": "2024-05-01T10:00:00"},
+        {"type": "activity_rollup", "day": "2024-01-01", "action": "status_changed", "count": 3},
+    )
+    assert counts == {"project": 1, "task": 2, "dependency": 1, "comment": 2, "activity": 1, "activity_rollup": 1}
+
+
+@pytest.mark.parametrize(
+    "records",
+    [
+        [{**PROJECT, "shared_users": "alice"}],
+        [TASK | {"created_at": [2024]}],
+        [TASK | {"id": "1"}],
+        [TASK | {"due_date": {"day": 1}}],
+        [TASK, {"type": "assignee", "task_id": [1], "username": "owner"}],
+        [TASK, {"type": "dependency", "depends_on_task_id": {"id": 1}, "dependent_task_id": 1}],
+        [TASK, COMMENT | {"parent_id": [1]}],
+        [TASK, COMMENT | {"content": 5}],
+        [TASK, {"type": "activity", "task_id": 1, "action": "renamed"}],
+        [{"type": "activity_rollup", "day": 20240101.5, "action": "created", "count": 1}],
+        [{"type": "activity_rollup", "day": "2024-01-01", "action": "created", "count": -1}],
+    ],
+)
+def test_malformed_records_raise_value_error(importer, records):
+    if records[0].get("type") != "project":
+        records = [PROJECT, *records]
+    with pytest.raises(ValueError, match=rf"^Line {len(records) + 1}: "):
+        run(importer, HEADER, *records)
@@ -0,0 +1,15 @@
+"""SQL statement budgets of the list endpoints.
+
+Each endpoint runs against a small and a large dataset; exceeding the budget on
+either one means a relationship is loaded per row again (N+1).
+"""
+
+
+def test_list_endpoints_within_query_budget(statement_counts, query_budgets):
+    over = {
+        name: f"{count} statements (budget {query_budgets[name]})"
+        for name, count in statement_counts.items()
+        if count > query_budgets[name]
+    }
+    assert not over
+    assert set(statement_counts) == set(query_budgets)
@@ -0,0 +1,25 @@
+"""Search snippets are safe to render as HTML."""
+
+import app.models as models
+from app.services import search
+
+
+def test_snippet_escapes_text_and_marks_matches(session_factory):
+    with session_factory() as db:
+        owner = models.User(username="owner", email="owner@example.com", hashed_password="x")
+        db.add(owner)
+        db.flush()
+        project = models.Project(name="P", owner_id=owner.id)
+        db.add(project)
+        db.flush()
+        task = models.Task(title="Rocket <img src=x onerror=alert(1)>", description="", project_id=project.id)
+        db.add(task)
+        db.flush()
+        db.add(models.Comment(task_id=task.id, author_id=owner.id, content="<script>alert('rocket')</script>"))
+        db.commit()
+
+        rows = db.execute(search.statement(search.match_expression("rocket"), models.Project.id == project.id)).all()
+        snippets = {row.kind: search.highlight(row.snippet) for row in rows}
+
+    assert snippets["task"] == "<mark>Rocket</mark> &lt;img src=x onerror=alert(1)&gt;"
+    assert snippets["comment"] == "&lt;script&gt;alert(&#x27;<mark>rocket</mark>&#x27;)&lt;/script&gt;"